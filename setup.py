@@ -19,6 +19,13 @@ setup(
         'attrs>=17.1.0',
         'xmltodict>=0.11.0'
     ],
+    extras_require={
+        'numpy': ['numpy'],
+        'zstd': ['zstandard'],
+    },
+    entry_points={
+        'console_scripts': ['vast = vast.cli:main'],
+    },
     setup_requires=["vcversioner"],
     vcversioner={"version_module_paths": ["vast/_version.py"]},
 )
@@ -0,0 +1,3 @@
+from vast.benchmarks.suite import main
+
+main()
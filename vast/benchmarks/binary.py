@@ -0,0 +1,65 @@
+"""
+Benchmark of the binary encoding of models against pickle
+
+    python -m vast.benchmarks.binary [--number N]
+
+Reports encoded bytes, and microseconds to encode and to decode, per document,
+for the synthetic document of check_and_convert and for the ad pod resource.
+"""
+import argparse
+import pickle
+import timeit
+
+from vast import resources
+from vast.benchmarks.check_and_convert import DOCUMENT_SHAPE
+from vast.benchmarks.documents import make_document
+from vast.parsers import xml_parser
+from vast.serializers import binary
+
+
+def _best(func, number, repeat):
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number
+
+
+def run(number=200, repeat=5):
+    """
+    :param number: documents encoded and decoded per timed run
+    :param repeat: timed runs, the best one counts
+    :return: list of (case, bytes, encode seconds, decode seconds)
+    """
+    with open(resources.AD_POD_XML, "rb") as fp:
+        ad_pod = fp.read()
+    documents = [("synthetic", make_document(DOCUMENT_SHAPE)), ("ad pod", ad_pod)]
+    codecs = [
+        ("binary", binary.encode, binary.decode),
+        ("pickle", lambda vast: pickle.dumps(vast, pickle.HIGHEST_PROTOCOL), pickle.loads),
+    ]
+
+    results = []
+    for document_name, document in documents:
+        vast = xml_parser.from_xml_string(document)
+        for codec_name, encode, decode in codecs:
+            data = encode(vast)
+            results.append((
+                "%s %s" % (document_name, codec_name),
+                len(data),
+                _best(lambda: encode(vast), number, repeat),
+                _best(lambda: decode(data), number, repeat),
+            ))
+    return results
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument("--number", type=int, default=200, help="documents per timed run")
+    arg_parser.add_argument("--repeat", type=int, default=5, help="timed runs, the best one counts")
+    args = arg_parser.parse_args(argv)
+
+    row = "{:<20} {:>8} {:>11} {:>11}"
+    print(row.format("case", "bytes", "encode us", "decode us"))
+    for name, size, encode, decode in run(args.number, args.repeat):
+        print(row.format(name, size, "%.1f" % (encode * 1e6), "%.1f" % (decode * 1e6)))
+
+
+if __name__ == "__main__":
+    main()
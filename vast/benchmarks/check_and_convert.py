@@ -0,0 +1,110 @@
+"""
+Benchmark of check_and_convert, by compiled plans against the reference implementation
+
+    python -m vast.benchmarks.check_and_convert [--number N]
+
+Times check_and_convert alone for MediaFile and TrackingEvent args,
+and parsing a document with many of them end to end.
+"""
+import argparse
+import timeit
+from contextlib import contextmanager
+
+from vast.benchmarks.documents import Shape, make_document
+from vast.models import shared
+from vast.models import vast_v2 as v2_models
+from vast.parsers import xml_parser
+
+MEDIA_FILE_ARGS = dict(
+    asset="https://mag.dom.com/video_720.mp4",
+    delivery="progressive",
+    type="video/mp4",
+    width="1280",
+    height="720",
+    codec=None,
+    id="mf_1",
+    bitrate="1500",
+    min_bitrate=None,
+    max_bitrate=None,
+    scalable="true",
+    maintain_aspect_ratio="true",
+    api_framework=None,
+)
+
+TRACKING_EVENT_ARGS = dict(
+    tracking_event_uri="https://mag.dom.com/vidtrk?evt=start",
+    tracking_event_type="start",
+)
+
+# a linear creative with many of both, so parsing time is dominated by check_and_convert
+DOCUMENT_SHAPE = Shape(media_files=50, tracking_events=60)
+
+
+@contextmanager
+def interpreted():
+    """
+    Make the models use the reference implementation of check_and_convert while in the context
+    """
+    def check_and_convert(cls, args_dict, validate=True):
+        # the reference implementation always validates, as the benchmarked parses do
+        return shared._check_and_convert_interpreted(cls, args_dict)
+
+    v2_models.check_and_convert = check_and_convert
+    try:
+        yield
+    finally:
+        v2_models.check_and_convert = shared.check_and_convert
+
+
+def _best(func, number, repeat):
+    """
+    :return: best seconds per call of func, over repeat runs of number calls
+    """
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number
+
+
+def run(number=2000, repeat=5):
+    """
+    :param number: calls per timed run, documents are parsed number // 100 times
+    :param repeat: timed runs, the best one counts
+    :return: list of (case, interpreted seconds per call, compiled seconds per call)
+    """
+    cases = [
+        ("MediaFile", v2_models.MediaFile, MEDIA_FILE_ARGS),
+        ("TrackingEvent", v2_models.TrackingEvent, TRACKING_EVENT_ARGS),
+    ]
+    results = []
+    for name, cls, args in cases:
+        results.append((
+            name,
+            _best(lambda: shared._check_and_convert_interpreted(cls, args), number, repeat),
+            _best(lambda: shared.check_and_convert(cls, args), number, repeat),
+        ))
+
+    document = make_document(DOCUMENT_SHAPE)
+    parse_number = max(1, number // 100)
+    for backend in (xml_parser.XMLTODICT, xml_parser.STREAMING):
+        def parse():
+            xml_parser.from_xml_string(document, backend=backend)
+
+        with interpreted():
+            before = _best(parse, parse_number, repeat)
+        results.append(("parse with %s" % backend, before, _best(parse, parse_number, repeat)))
+
+    return results
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument("--number", type=int, default=2000, help="calls per timed run")
+    arg_parser.add_argument("--repeat", type=int, default=5, help="timed runs, the best one counts")
+    args = arg_parser.parse_args(argv)
+
+    row = "{:<24} {:>14} {:>14} {:>8}"
+    print(row.format("case", "interpreted us", "compiled us", "speedup"))
+    for name, before, after in run(args.number, args.repeat):
+        print(row.format(name, "%.2f" % (before * 1e6), "%.2f" % (after * 1e6), "%.2fx" % (before / after)))
+
+
+if __name__ == "__main__":
+    main()
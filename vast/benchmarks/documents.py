@@ -0,0 +1,111 @@
+"""
+Synthetic VAST 2.0 documents of a controlled size and shape, for benchmarks
+
+A Shape gives the number of each repeated element, and make_document writes a valid document of that shape.
+Documents of the same shape are identical, so benchmark runs can be compared across commits.
+"""
+import attr
+
+_EVENTS = ("creativeView", "start", "firstQuartile", "midpoint", "thirdQuartile", "complete")
+
+_TRACKING_XML = '<Tracking event="{event}">https://mag.dom.com/vidtrk?evt={event}&amp;i={i}</Tracking>'
+
+_MEDIA_FILE_XML = (
+    '<MediaFile id="mf_{i}" delivery="progressive" type="video/mp4" width="{width}" height="{height}" '
+    'bitrate="{bitrate}" scalable="true" maintainAspectRatio="true">'
+    "https://mag.dom.com/video_{i}.mp4</MediaFile>"
+)
+
+_AD_PARAMETERS_ITEM = '{"key": "value", "url": "https://mag.dom.com/vpaid/asset.js"} '
+
+_COMPANION_XML = (
+    '<Companion id="companion_{i}" width="300" height="250">'
+    '<StaticResource creativeType="image/png">https://mag.dom.com/companion_{i}.png</StaticResource>'
+    '<TrackingEvents><Tracking event="creativeView">https://mag.dom.com/cmptrk?i={i}</Tracking></TrackingEvents>'
+    "<CompanionClickThrough>https://mag.dom.com/click?companion={i}</CompanionClickThrough>"
+    "</Companion>"
+)
+
+
+@attr.s(frozen=True)
+class Shape(object):
+    """
+    How many of each element a synthetic document holds
+    """
+    ads = attr.ib(default=1)
+    wrapper = attr.ib(default=False)
+    creatives = attr.ib(default=1)
+    media_files = attr.ib(default=4)
+    tracking_events = attr.ib(default=6)
+    companions = attr.ib(default=0)
+    ad_parameters_bytes = attr.ib(default=0)
+
+
+def _ad_parameters(size):
+    if not size:
+        return ""
+    data = (_AD_PARAMETERS_ITEM * (size // len(_AD_PARAMETERS_ITEM) + 1))[:size]
+    return "<AdParameters><![CDATA[%s]]></AdParameters>" % data
+
+
+def _tracking_events(count):
+    if not count:
+        return ""
+    return "<TrackingEvents>%s</TrackingEvents>" % "".join(
+        _TRACKING_XML.format(event=_EVENTS[i % len(_EVENTS)], i=i) for i in range(count)
+    )
+
+
+def _linear_creative(shape, ad_index, creative_index):
+    return (
+        '<Creative id="creative_{ad}_{creative}" sequence="{sequence}"><Linear><Duration>00:00:30</Duration>'
+        "{tracking}"
+        "{ad_parameters}"
+        "<VideoClicks><ClickThrough>https://mag.dom.com/click?ad={ad}</ClickThrough></VideoClicks>"
+        "<MediaFiles>{media_files}</MediaFiles>"
+        "</Linear></Creative>"
+    ).format(
+        ad=ad_index,
+        creative=creative_index,
+        sequence=creative_index + 1,
+        tracking=_tracking_events(shape.tracking_events),
+        ad_parameters=_ad_parameters(shape.ad_parameters_bytes),
+        media_files="".join(
+            _MEDIA_FILE_XML.format(i=i, width=320 + 160 * i, height=180 + 90 * i, bitrate=500 + 250 * i)
+            for i in range(shape.media_files)
+        ),
+    )
+
+
+def _ad(shape, ad_index):
+    creatives = [_linear_creative(shape, ad_index, i) for i in range(shape.creatives)]
+    if shape.companions:
+        creatives.append(
+            "<Creative><CompanionAds>%s</CompanionAds></Creative>"
+            % "".join(_COMPANION_XML.format(i=i) for i in range(shape.companions))
+        )
+    if shape.wrapper:
+        head = (
+            "<Wrapper><AdSystem>bench</AdSystem>"
+            "<VASTAdTagURI>https://mag.dom.com/vast?ad=%s</VASTAdTagURI>"
+            "<Impression>https://mag.dom.com/imp?ad=%s</Impression>" % (ad_index, ad_index)
+        )
+        tail = "</Wrapper>"
+    else:
+        head = (
+            "<InLine><AdSystem>bench</AdSystem><AdTitle>bench ad %s</AdTitle>"
+            "<Impression>https://mag.dom.com/imp?ad=%s</Impression>" % (ad_index, ad_index)
+        )
+        tail = "</InLine>"
+    sequence = ' sequence="%s"' % (ad_index + 1) if shape.ads > 1 else ""
+    return '<Ad id="ad_%s"%s>%s<Creatives>%s</Creatives>%s</Ad>' % (
+        ad_index, sequence, head, "".join(creatives), tail,
+    )
+
+
+def make_document(shape=Shape()):
+    """
+    :param shape: of the document
+    :return: VAST 2.0 document as str
+    """
+    return '<VAST version="2.0">%s</VAST>' % "".join(_ad(shape, i) for i in range(shape.ads))
@@ -0,0 +1,84 @@
+"""
+Benchmark of parsing a VPAID document with large AdParameters from a buffer
+
+    python -m vast.benchmarks.lazy_text [--kilobytes N]
+
+Reports milliseconds per parse, and the peak of memory allocated while parsing,
+of the streaming backend given a str, given bytes,
+and given a memoryview with lazy_text, whose AdParameters are sliced out of it and never read.
+"""
+import argparse
+import json
+import timeit
+import tracemalloc
+
+from vast.parsers import xml_parser
+
+_VPAID_XML = (
+    '<VAST version="2.0"><Ad id="bench"><InLine>'
+    "<AdSystem>bench</AdSystem><AdTitle>bench</AdTitle>"
+    "<Impression>https://mag.dom.com/imp</Impression>"
+    "<Creatives><Creative><Linear><Duration>00:00:30</Duration>"
+    "<AdParameters><![CDATA[{ad_parameters}]]></AdParameters>"
+    '<MediaFiles><MediaFile delivery="progressive" type="application/javascript" apiFramework="VPAID" '
+    'width="640" height="360">https://mag.dom.com/vpaid.js</MediaFile></MediaFiles>'
+    "</Linear></Creative></Creatives></InLine></Ad></VAST>"
+)
+
+
+def make_vpaid_document(kilobytes=300):
+    """
+    :return: VAST 2.0 document as str, whose AdParameters hold about kilobytes of JSON
+    """
+    items = {}
+    while len(json.dumps(items)) < kilobytes * 1024:
+        items["key_%d" % len(items)] = "https://mag.dom.com/assets/%d.js" % len(items)
+    return _VPAID_XML.format(ad_parameters=json.dumps(items))
+
+
+def _peak(func):
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run(kilobytes=300, number=50, repeat=5):
+    """
+    :param kilobytes: of the AdParameters
+    :param number: parses per timed run
+    :param repeat: timed runs, the best one counts
+    :return: list of (case, seconds per parse, peak bytes allocated)
+    """
+    xml_string = make_vpaid_document(kilobytes)
+    xml_bytes = xml_string.encode("utf-8")
+    cases = [
+        ("str", lambda: xml_parser.from_xml_string(xml_string, backend=xml_parser.STREAMING)),
+        ("bytes", lambda: xml_parser.from_xml_string(xml_bytes, backend=xml_parser.STREAMING)),
+        ("memoryview lazy_text", lambda: xml_parser.from_xml_string(
+            memoryview(xml_bytes), backend=xml_parser.STREAMING, lazy_text=True,
+        )),
+    ]
+    return [
+        (name, min(timeit.repeat(parse, number=number, repeat=repeat)) / number, _peak(parse))
+        for name, parse in cases
+    ]
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument("--kilobytes", type=int, default=300, help="size of the AdParameters")
+    arg_parser.add_argument("--number", type=int, default=50, help="parses per timed run")
+    arg_parser.add_argument("--repeat", type=int, default=5, help="timed runs, the best one counts")
+    args = arg_parser.parse_args(argv)
+
+    row = "{:<22} {:>10} {:>10}"
+    print(row.format("input", "ms", "peak KB"))
+    for name, seconds, peak in run(args.kilobytes, args.number, args.repeat):
+        print(row.format(name, "%.3f" % (seconds * 1e3), peak // 1024))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Benchmark of the memory held by parsed documents
+
+    python -m vast.benchmarks.memory [--documents N]
+
+Reports the bytes retained per parsed Vast by the slotted models,
+by the same documents held in dict backed models, as they were before models were slotted,
+and by slotted models parsed with an Interner, sharing the values repeated across documents.
+"""
+import argparse
+import gc
+import tracemalloc
+
+import attr
+
+from vast.benchmarks.documents import Shape, make_document
+from vast.cache import Interner
+from vast.parsers import xml_parser
+
+# model class -> the same class without slots
+_DICT_BACKED = {}
+
+
+def to_dict_backed(value):
+    """
+    :return: a copy of value where every model is replaced by an instance of a dict backed twin of its class
+    """
+    cls = type(value)
+    if attr.has(cls):
+        twin = _DICT_BACKED.get(cls)
+        if twin is None:
+            names = [a.name for a in attr.fields(cls) if a.init]
+            twin = _DICT_BACKED[cls] = attr.make_class(cls.__name__, names, frozen=True)
+        return twin(**{
+            a.name: to_dict_backed(getattr(value, a.name)) for a in attr.fields(cls) if a.init
+        })
+    if isinstance(value, list):
+        return [to_dict_backed(v) for v in value]
+    return value
+
+
+def _retained(documents, parse):
+    """
+    :return: bytes allocated by parse for all documents, and still held once they are all parsed
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        kept = [parse(document) for document in documents]
+        gc.collect()
+        retained = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    del kept
+    return retained
+
+
+def run(documents=1000, media_files=4, tracking_events=8):
+    """
+    :param documents: parsed and kept in memory
+    :param media_files: per document
+    :param tracking_events: per document
+    :return: list of (models, bytes retained per Vast)
+    """
+    # distinct bytes per document, so parsed strings are not shared between documents
+    document = make_document(Shape(media_files=media_files, tracking_events=tracking_events))
+    xmls = [document.replace('<Ad id="ad_0"', '<Ad id="bench_%d"' % i).encode("utf-8") for i in range(documents)]
+    slotted = _retained(xmls, xml_parser.from_xml_string)
+    dict_backed = _retained(xmls, lambda xml: to_dict_backed(xml_parser.from_xml_string(xml)))
+    interner = Interner()
+    interned = _retained(xmls, lambda xml: xml_parser.from_xml_string(xml, interner=interner))
+    return [
+        ("dict backed", dict_backed / float(documents)),
+        ("slotted", slotted / float(documents)),
+        ("interned", interned / float(documents)),
+    ]
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument("--documents", type=int, default=1000, help="documents kept in memory")
+    arg_parser.add_argument("--media-files", type=int, default=4, help="media files per document")
+    arg_parser.add_argument("--tracking-events", type=int, default=8, help="tracking events per document")
+    args = arg_parser.parse_args(argv)
+
+    row = "{:<12} {:>14}"
+    print(row.format("models", "bytes per Vast"))
+    for name, per_vast in run(args.documents, args.media_files, args.tracking_events):
+        print(row.format(name, "%.0f" % per_vast))
+
+
+if __name__ == "__main__":
+    main()
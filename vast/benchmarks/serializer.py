@@ -0,0 +1,53 @@
+"""
+Benchmark of serializing models back to XML
+
+    python -m vast.benchmarks.serializer [--number N]
+
+Reports documents per second written by xml_serializer.to_xml_string,
+against xmltodict.unparse of the dict the same document was parsed into,
+which leaves out the cost of building that dict from the models.
+"""
+import argparse
+import timeit
+
+import xmltodict
+
+from vast.benchmarks.check_and_convert import DOCUMENT_SHAPE
+from vast.benchmarks.documents import make_document
+from vast.parsers import xml_parser
+from vast.serializers import xml_serializer
+
+
+def _docs_per_second(func, number, repeat):
+    return number / min(timeit.repeat(func, number=number, repeat=repeat))
+
+
+def run(number=200, repeat=5):
+    """
+    :param number: documents serialized per timed run
+    :param repeat: timed runs, the best one counts
+    :return: list of (case, documents per second)
+    """
+    document = make_document(DOCUMENT_SHAPE)
+    vast = xml_parser.from_xml_string(document)
+    xml_dict = xmltodict.parse(document)
+    return [
+        ("to_xml_string", _docs_per_second(lambda: xml_serializer.to_xml_string(vast), number, repeat)),
+        ("xmltodict.unparse", _docs_per_second(lambda: xmltodict.unparse(xml_dict), number, repeat)),
+    ]
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument("--number", type=int, default=200, help="documents per timed run")
+    arg_parser.add_argument("--repeat", type=int, default=5, help="timed runs, the best one counts")
+    args = arg_parser.parse_args(argv)
+
+    row = "{:<20} {:>12}"
+    print(row.format("case", "docs/s"))
+    for name, docs_per_second in run(args.number, args.repeat):
+        print(row.format(name, "%.0f" % docs_per_second))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,264 @@
+"""
+Benchmark suite of from_xml_string over synthetic documents of controlled shapes
+
+    python -m vast.benchmarks [--backend NAME] [--axis NAME] [--modules] [--output FILE] [--compare FILE]
+
+Each case parses a document of the baseline Shape with one axis changed, e.g. 32 media files per Linear,
+and measures, per backend:
+seconds per parse, the best and the median of the timed runs, documents per second by the best run,
+the peak of memory allocated while parsing, and the bytes and memory blocks still held by the parsed model.
+
+With --modules, the benchmarks of the other modules of this package are run too.
+Results are written as JSON with --output, so runs can be compared across commits with --compare,
+which adds the ratio of documents per second against an earlier output.
+No network is used.
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import timeit
+import tracemalloc
+
+import attr
+
+from vast.benchmarks import binary, check_and_convert, lazy_text, memory, serializer
+from vast.benchmarks.documents import Shape, make_document
+from vast.parsers import xml_parser
+
+BASELINE = Shape()
+
+# (axis, values), an axis is an attribute of Shape
+AXES = (
+    ("creatives", (1, 4, 16)),
+    ("media_files", (1, 8, 32)),
+    ("tracking_events", (0, 12, 48)),
+    ("companions", (0, 2, 8)),
+    ("ad_parameters_bytes", (0, 4 * 1024, 64 * 1024)),
+    ("wrapper", (False, True)),
+    ("ads", (1, 5)),
+)
+
+BACKENDS = (xml_parser.XMLTODICT, xml_parser.STREAMING)
+
+
+def _timed_runs(func, min_seconds, repeat):
+    """
+    :return: calls per run, at least one, so a run takes min_seconds, and the seconds per call of each run
+    """
+    number = 1
+    while True:
+        seconds = timeit.timeit(func, number=number)
+        if seconds >= min_seconds or number >= 1 << 20:
+            break
+        number *= 2
+    runs = [seconds] + timeit.repeat(func, number=number, repeat=repeat - 1)
+    return number, [run / number for run in runs]
+
+
+def _median(values):
+    values = sorted(values)
+    middle = len(values) // 2
+    if len(values) % 2:
+        return values[middle]
+    return (values[middle - 1] + values[middle]) / 2
+
+
+def _memory(func):
+    """
+    :return: peak bytes allocated by func, and bytes and blocks still held by its result
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = func()
+        gc.collect()
+        held, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+
+    gc.collect()
+    blocks = sys.getallocatedblocks()
+    result = func()
+    gc.collect()
+    held_blocks = sys.getallocatedblocks() - blocks
+    del result
+    return peak, held, held_blocks
+
+
+def measure(document, backend, min_seconds=0.1, repeat=5):
+    """
+    :param document: VAST XML as str
+    :param backend: parser backend, see xml_parser.from_xml_string
+    :param min_seconds: of a timed run
+    :param repeat: timed runs
+    :return: dict of the measures of parsing document
+    """
+    def parse():
+        return xml_parser.from_xml_string(document, backend=backend)
+
+    number, seconds = _timed_runs(parse, min_seconds, repeat)
+    peak, held, held_blocks = _memory(parse)
+    return {
+        "document_bytes": len(document.encode("utf-8")),
+        "number": number,
+        "repeat": repeat,
+        "best_seconds": min(seconds),
+        "median_seconds": _median(seconds),
+        "docs_per_second": 1 / min(seconds),
+        "peak_bytes": peak,
+        "retained_bytes": held,
+        "retained_blocks": held_blocks,
+    }
+
+
+def run_shapes(backends=BACKENDS, axes=AXES, min_seconds=0.1, repeat=5):
+    """
+    :param backends: parser backends to measure
+    :param axes: (axis, values) to vary from BASELINE, one at a time
+    :param min_seconds: of a timed run
+    :param repeat: timed runs
+    :return: list of result dicts, one per backend and case
+    """
+    results = []
+    for axis, values in axes:
+        for value in values:
+            shape = attr.evolve(BASELINE, **{axis: value})
+            document = make_document(shape)
+            for backend in backends:
+                result = {
+                    "benchmark": "parse",
+                    "case": "%s=%s" % (axis, value),
+                    "backend": backend,
+                    "shape": attr.asdict(shape),
+                }
+                result.update(measure(document, backend, min_seconds, repeat))
+                results.append(result)
+    return results
+
+
+# module name -> (run function, names of the values of each row after its case)
+_MODULES = (
+    ("check_and_convert", check_and_convert.run, ("interpreted_seconds", "compiled_seconds")),
+    ("memory", memory.run, ("bytes_per_vast", )),
+    ("serializer", serializer.run, ("docs_per_second", )),
+    ("binary", binary.run, ("bytes", "encode_seconds", "decode_seconds")),
+    ("lazy_text", lazy_text.run, ("seconds", "peak_bytes")),
+)
+
+
+def run_modules():
+    """
+    :return: list of result dicts of the benchmarks of the other modules, with their default arguments
+    """
+    results = []
+    for name, run, columns in _MODULES:
+        for row in run():
+            result = {"benchmark": name, "case": row[0]}
+            result.update(zip(columns, row[1:]))
+            results.append(result)
+    return results
+
+
+def _commit():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "HEAD"], cwd=os.path.dirname(os.path.abspath(__file__)),
+            stderr=subprocess.DEVNULL, universal_newlines=True,
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def environment():
+    """
+    :return: dict describing where the benchmarks ran
+    """
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "commit": _commit(),
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+
+
+def _key(result):
+    return result["benchmark"], result["case"], result.get("backend")
+
+
+def compare(results, baseline):
+    """
+    :param results: list of result dicts
+    :param baseline: list of result dicts of an earlier run
+    :return: dict from the key of each result found in both to its docs_per_second ratio against the baseline
+    """
+    before = {_key(result): result for result in baseline}
+    ratios = {}
+    for result in results:
+        earlier = before.get(_key(result))
+        if earlier and result.get("docs_per_second") and earlier.get("docs_per_second"):
+            ratios[_key(result)] = result["docs_per_second"] / earlier["docs_per_second"]
+    return ratios
+
+
+def _print_table(results, ratios):
+    row = "{:<32} {:<10} {:>10} {:>12} {:>12} {:>12} {:>10}"
+    print(row.format("case", "backend", "docs/s", "median us", "peak KB", "retained KB", "vs before"))
+    for result in results:
+        if result["benchmark"] != "parse":
+            continue
+        ratio = ratios.get(_key(result))
+        print(row.format(
+            result["case"],
+            result["backend"],
+            "%.0f" % result["docs_per_second"],
+            "%.1f" % (result["median_seconds"] * 1e6),
+            "%.1f" % (result["peak_bytes"] / 1024.0),
+            "%.1f" % (result["retained_bytes"] / 1024.0),
+            "" if ratio is None else "%.2fx" % ratio,
+        ))
+    for result in results:
+        if result["benchmark"] != "parse":
+            values = ", ".join("%s=%.4g" % (k, v) for k, v in sorted(result.items()) if k not in ("benchmark", "case"))
+            print("%s %s: %s" % (result["benchmark"], result["case"], values))
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument("--backend", action="append", choices=BACKENDS, help="backend to measure, default all")
+    arg_parser.add_argument("--axis", action="append", choices=[axis for axis, _ in AXES], help="default all")
+    arg_parser.add_argument("--modules", action="store_true", help="run the benchmarks of the other modules too")
+    arg_parser.add_argument("--min-seconds", type=float, default=0.1, help="of a timed run")
+    arg_parser.add_argument("--repeat", type=int, default=5, help="timed runs")
+    arg_parser.add_argument("--output", help="file to write the results to as JSON, - for stdout")
+    arg_parser.add_argument("--compare", help="JSON output of an earlier run to compare to")
+    args = arg_parser.parse_args(argv)
+
+    axes = [(axis, values) for axis, values in AXES if not args.axis or axis in args.axis]
+    results = run_shapes(args.backend or BACKENDS, axes, args.min_seconds, args.repeat)
+    if args.modules:
+        results.extend(run_modules())
+
+    ratios = {}
+    if args.compare:
+        with open(args.compare) as fp:
+            ratios = compare(results, json.load(fp)["results"])
+
+    output = {"environment": environment(), "results": results}
+    if args.output == "-":
+        json.dump(output, sys.stdout, indent=2, sort_keys=True)
+        return
+    _print_table(results, ratios)
+    if args.output:
+        with open(args.output, "w") as fp:
+            json.dump(output, fp, indent=2, sort_keys=True)
+
+
+if __name__ == "__main__":
+    main()
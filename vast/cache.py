@@ -0,0 +1,168 @@
+"""
+Bounded in-memory caches
+
+Parsed models are immutable, so a cached model can safely be handed to many users.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+import attr
+
+# Eviction policies
+LRU = "lru"
+FIFO = "fifo"
+
+
+@attr.s()
+class CacheStats(object):
+    """
+    Counters of a cache, to size it by
+    """
+    hits = attr.ib(default=0)
+    misses = attr.ib(default=0)
+    evictions = attr.ib(default=0)
+    expirations = attr.ib(default=0)
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / float(lookups) if lookups else 0.0
+
+
+class BoundedCache(object):
+    """
+    Maps keys to values, bounded by number of entries and optionally by their total size.
+    When full, entries are evicted by the eviction policy:
+    LRU evicts the least recently used entry, FIFO the oldest one.
+    Entries older than ttl seconds are treated as missing.
+    """
+
+    def __init__(self, max_entries, max_bytes=None, ttl=None, eviction=LRU, clock=time.monotonic):
+        """
+        :param max_entries: entries kept at most
+        :param max_bytes: total size of entries kept at most, None for no limit.
+        Sizes are whatever the caller passes to put
+        :param ttl: seconds an entry stays valid, None to never expire
+        :param eviction: LRU or FIFO
+        :param clock: function returning the current time in seconds
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be positive but was %s" % max_entries)
+        if eviction not in (LRU, FIFO):
+            raise ValueError("unknown eviction policy '%s'" % eviction)
+
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.eviction = eviction
+        self.stats = CacheStats()
+        self.size = 0
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        """
+        :return: the value cached for key, or default if there is none or it expired
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats.misses += 1
+                return default
+
+            expires_at, size, value = entry
+            if expires_at is not None and expires_at <= self._clock():
+                self._remove(key)
+                self.stats.expirations += 1
+                self.stats.misses += 1
+                return default
+
+            if self.eviction == LRU:
+                self._entries.move_to_end(key)
+            self.stats.hits += 1
+            return value
+
+    def put(self, key, value, size=0):
+        """
+        :param key: hashable
+        :param value: to cache
+        :param size: of the value, counted against max_bytes
+        """
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+
+        expires_at = None if self.ttl is None else self._clock() + self.ttl
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (expires_at, size, value)
+            self.size += size
+            while len(self._entries) > self.max_entries or (
+                    self.max_bytes is not None and self.size > self.max_bytes):
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.stats.evictions += 1
+
+    def discard(self, key):
+        with self._lock:
+            self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size -= entry[1]
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and (entry[0] is None or entry[0] > self._clock())
+
+
+class Interner(object):
+    """
+    De-duplicates equal strings, so values repeated across parsed documents,
+    e.g. ad systems, CDN hosts and tracking urls, are held in memory once.
+    Bounded by a BoundedCache of the interned strings themselves.
+    Strings longer than max_length are returned as they are, they rarely repeat.
+    """
+
+    def __init__(self, max_entries=65536, max_length=512, eviction=LRU):
+        """
+        :param max_entries: distinct strings kept at most
+        :param max_length: of strings which are interned
+        :param eviction: LRU or FIFO
+        """
+        self.max_length = max_length
+        self.strings = BoundedCache(max_entries, eviction=eviction)
+
+    @property
+    def stats(self):
+        """
+        :return: CacheStats, hits are strings which were de-duplicated
+        """
+        return self.strings.stats
+
+    def __call__(self, value):
+        """
+        :param value: str
+        :return: a str equal to value, the same object for every equal value while it is kept
+        """
+        if len(value) > self.max_length:
+            return value
+        interned = self.strings.get(value)
+        if interned is None:
+            self.strings.put(value, value)
+            return value
+        return interned
+
+    def clear(self):
+        self.strings.clear()
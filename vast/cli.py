@@ -0,0 +1,341 @@
+"""
+Command line tool for parsing VAST documents in bulk
+
+    vast parse [INPUT ...] [--output FILE] [--workers N] [--backend streaming|xmltodict]
+    vast validate [INPUT ...]
+    vast generate [--count N] [--seed N] [--invalid-fraction F] [--format xml|jsonl] [--output FILE]
+
+Inputs are files, directories, which are walked for .xml and .jsonl files, or glob patterns,
+and stdin when none is given, or for '-'. Files may be compressed, see parsers.compressed.
+A file holds XML documents one after another, or JSON lines,
+each line being a document as a JSON string, or an object with the document under "xml".
+
+Documents are parsed in parallel by parse_many. 'parse' writes a JSON line for each document,
+{"source": ..., "vast": ...} with the model as written by json_serializer,
+or {"source": ..., "error": ...} if it failed, 'validate' only writes the lines of the failed documents.
+The source of a document is its file followed by @offset of an XML document or :line of a JSON line.
+Bytes of an XML file which are not a document, e.g. a document missing its VAST end tag,
+are reported as a failed document at their offset, see parsers.archive.
+
+A report is written to stderr at the end: documents per second, the p50 and p99 time to parse a document,
+and failed documents counted by error class, their error type and message without the values in it.
+'validate' exits with status 1 if any document failed.
+
+'generate' writes synthetic documents, a fraction of them invalid, see vast.corpus.
+"""
+import argparse
+import glob
+import json
+import math
+import os
+import re
+import sys
+import time
+from collections import Counter
+from contextlib import nullcontext
+from functools import partial
+
+from vast import corpus
+from vast.errors import InputError, ParseError
+from vast.parsers import archive, compressed, xml_parser
+from vast.serializers import json_serializer
+
+_DOCUMENT_EXTENSIONS = (".xml", ".jsonl")
+_JSON_LINES = re.compile(rb'\s*[{"]')
+_STDIN = "-"
+_CHUNK_SIZE = 1 << 20
+
+
+def _is_document_file(name):
+    name = name.lower()
+    for fmt in compressed._FORMATS.values():
+        for extension in fmt.extensions:
+            if name.endswith(extension):
+                name = name[:-len(extension)]
+    return name.endswith(_DOCUMENT_EXTENSIONS)
+
+
+def iter_paths(inputs):
+    """
+    :param inputs: files, directories or glob patterns, '-' for stdin
+    :return: generator of file paths, and '-' for stdin
+    :raises: InputError for an input which matches no file
+    """
+    for name in inputs or (_STDIN, ):
+        if name == _STDIN or os.path.isfile(name):
+            yield name
+        elif os.path.isdir(name):
+            for directory, sub_directories, files in os.walk(name):
+                sub_directories.sort()
+                for file_name in sorted(files):
+                    if _is_document_file(file_name):
+                        yield os.path.join(directory, file_name)
+        else:
+            paths = sorted(glob.glob(name, recursive=True))
+            if not paths:
+                raise InputError("no file matches '%s'" % name)
+            for path in paths:
+                if os.path.isfile(path):
+                    yield path
+
+
+def _open(path):
+    if path == _STDIN:
+        # stdin is left open
+        return nullcontext(sys.stdin.buffer)
+    return compressed.open_xml(path)
+
+
+def _chunks(fp, head):
+    yield head
+    for chunk in iter(partial(fp.read, _CHUNK_SIZE), b""):
+        yield chunk
+
+
+def _lines(chunks):
+    pending = b""
+    for chunk in chunks:
+        lines = (pending + chunk).split(b"\n")
+        pending = lines.pop()
+        for line in lines:
+            yield line
+    if pending:
+        yield pending
+
+
+def _is_mapped(path):
+    return path != _STDIN and compressed.format_of(path) is None
+
+
+def iter_documents(path):
+    """
+    Read the documents of a file as they are needed, without reading the whole file first.
+    An uncompressed XML file is memory mapped, see parsers.archive, other files are read in chunks.
+
+    :param path: of a file, '-' for stdin
+    :return: generator of (source, document) for the documents in the file, in order,
+    where document is the ParseError of a span of an XML file which is not a document, see archive.find_documents
+    :raises: InputError for a JSON line which is not a document
+    """
+    name = "<stdin>" if path == _STDIN else path
+    with _open(path) as fp:
+        head = fp.read(_CHUNK_SIZE)
+        if not _JSON_LINES.match(head):
+            if _is_mapped(path):
+                fp.close()
+                spans = archive.iter_spans(path)
+            else:
+                spans = archive.split_documents(_chunks(fp, head))
+            for start, kind, document in spans:
+                if kind is not archive.DOCUMENT:
+                    document = archive.span_error(start, start + len(document), kind)
+                yield "%s@%s" % (name, start), document
+            return
+
+        for number, line in enumerate(_lines(_chunks(fp, head)), 1):
+            if not line.strip():
+                continue
+            yield _json_line_document("%s:%s" % (name, number), line)
+
+
+def _json_line_document(source, line):
+    """
+    :return: (source, document) of a JSON line
+    """
+    try:
+        document = json.loads(line)
+        if isinstance(document, dict):
+            document = document["xml"]
+    except (ValueError, KeyError):
+        raise InputError("%s is not a JSON string nor an object with an 'xml' key" % source)
+    if not isinstance(document, str):
+        raise InputError("%s is not a JSON string nor an object with an 'xml' key" % source)
+    return source, document
+
+
+# Values within error messages, replaced to tell the class of an error
+_ERROR_VALUES = (
+    (re.compile(r"\{[^{}]*\}"), "{...}"),
+    (re.compile(r"=[^'\s]*'"), "=...'"),
+    (re.compile(r"\d+"), "N"),
+)
+
+
+def error_class(error):
+    """
+    :param error: raised by parsing a document
+    :return: the type of error and its message with the values in it replaced,
+    e.g. 'ExpatError: mismatched tag: line N, column N'
+    """
+    message = str(error)
+    for pattern, replacement in _ERROR_VALUES:
+        message = pattern.sub(replacement, message)
+    return "%s: %s" % (type(error).__name__, message)
+
+
+def percentile(sorted_values, fraction):
+    """
+    :param sorted_values: non empty sorted list
+    :param fraction: between 0 and 1, e.g. 0.99
+    :return: the value at that fraction, by nearest rank
+    """
+    rank = max(int(math.ceil(fraction * len(sorted_values))), 1)
+    return sorted_values[rank - 1]
+
+
+class Report(object):
+    """
+    Counts of the parsed documents, and how long they took
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.documents = 0
+        self.seconds = []
+        self.errors = Counter()
+
+    def add(self, result):
+        """
+        :param result: ParseResult, without seconds for a span of a file which is not a document
+        """
+        self.documents += 1
+        if result.seconds is not None:
+            self.seconds.append(result.seconds)
+        if result.error is not None:
+            self.errors[error_class(result.error)] += 1
+
+    def write(self, out):
+        elapsed = time.perf_counter() - self.started
+        count = self.documents
+        row = "{:<12} {:>12}\n"
+        out.write(row.format("documents", count))
+        out.write(row.format("failed", sum(self.errors.values())))
+        out.write(row.format("docs/s", "%.0f" % (count / elapsed if elapsed else 0)))
+        if self.seconds:
+            seconds = sorted(self.seconds)
+            out.write(row.format("p50 ms", "%.3f" % (percentile(seconds, 0.5) * 1000)))
+            out.write(row.format("p99 ms", "%.3f" % (percentile(seconds, 0.99) * 1000)))
+        for name, errors in self.errors.most_common():
+            out.write("{:>12} {}\n".format(errors, name))
+
+
+def _output_line(source, result, validate_only):
+    if result.error is not None:
+        error = {"type": type(result.error).__name__, "message": str(result.error)}
+        return json.dumps({"source": source, "error": error}, sort_keys=True)
+    if validate_only:
+        return None
+    return '{"source":%s,"vast":%s}' % (json.dumps(source), json_serializer.to_json_string(result.vast))
+
+
+def _documents(inputs, sources, span_errors):
+    """
+    :param sources: dict filled with the source of each document, by its index
+    :param span_errors: dict filled with the (source, ParseResult) of the spans which are not documents,
+    by the index of the document following them, so they are written in file order with the results.
+    Both are filled by the thread feeding the workers
+    :return: generator of the documents of the inputs
+    """
+    index = 0
+    for path in iter_paths(inputs):
+        for source, document in iter_documents(path):
+            if isinstance(document, ParseError):
+                span_errors.setdefault(index, []).append(
+                    (source, xml_parser.ParseResult(index=None, vast=None, error=document)),
+                )
+                continue
+            sources[index] = source
+            index += 1
+            yield document
+
+
+def run(inputs, out, validate_only=False, workers=None, chunksize=64, backend=xml_parser.STREAMING):
+    """
+    :param inputs: files, directories or glob patterns, '-' for stdin
+    :param out: text file object receiving the JSON lines
+    :param validate_only: if True, only the lines of failed documents are written
+    :param workers: number of worker processes, defaults to the number of CPUs
+    :param chunksize: documents sent to a worker at a time
+    :param backend: parser backend, see xml_parser.from_xml_string
+    :return: Report of the run
+    """
+    report = Report()
+    sources = {}
+    span_errors = {}
+
+    def write(source, result):
+        report.add(result)
+        line = _output_line(source, result, validate_only)
+        if line is not None:
+            out.write(line)
+            out.write("\n")
+
+    documents = _documents(inputs, sources, span_errors)
+    for result in xml_parser.parse_many(documents, workers=workers, chunksize=chunksize, backend=backend):
+        for source, span_result in span_errors.pop(result.index, ()):
+            write(source, span_result)
+        write(sources.pop(result.index), result)
+    # the spans after the last document
+    for index in sorted(span_errors):
+        for source, span_result in span_errors[index]:
+            write(source, span_result)
+    return report
+
+
+def _generate(args):
+    documents = corpus.Corpus(seed=args.seed, invalid_fraction=args.invalid_fraction).documents(args.count)
+    if args.output == _STDIN:
+        corpus.write(documents, sys.stdout.buffer, args.format)
+    else:
+        with open(args.output, "wb") as out:
+            corpus.write(documents, out, args.format)
+    return 0
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(prog="vast", description=__doc__.strip().splitlines()[0])
+    commands = arg_parser.add_subparsers(dest="command")
+    commands.required = True
+    for command, help_text in (
+            ("parse", "write every document as a JSON line of its model or error"),
+            ("validate", "write the JSON lines of the documents which fail to parse"),
+    ):
+        command_parser = commands.add_parser(command, help=help_text)
+        command_parser.add_argument("inputs", nargs="*", help="files, directories or globs, - or nothing for stdin")
+        command_parser.add_argument("--output", "-o", default=_STDIN, help="file of the JSON lines, default stdout")
+        command_parser.add_argument("--workers", type=int, help="worker processes, default one per CPU")
+        command_parser.add_argument("--chunksize", type=int, default=64, help="documents sent to a worker at a time")
+        command_parser.add_argument(
+            "--backend", choices=(xml_parser.STREAMING, xml_parser.XMLTODICT), default=xml_parser.STREAMING,
+        )
+    generate_parser = commands.add_parser("generate", help="write synthetic documents, see vast.corpus")
+    generate_parser.add_argument("--count", type=int, help="of documents, default no end")
+    generate_parser.add_argument("--seed", type=int, default=0, help="the same seed gives the same documents")
+    generate_parser.add_argument("--invalid-fraction", type=float, default=0.0, help="of invalid documents")
+    generate_parser.add_argument("--format", choices=("xml", "jsonl"), default="xml", help="a document per line")
+    generate_parser.add_argument("--output", "-o", default=_STDIN, help="file of the documents, default stdout")
+    args = arg_parser.parse_args(argv)
+
+    if args.command == "generate":
+        return _generate(args)
+
+    out = sys.stdout if args.output == _STDIN else open(args.output, "w")
+    try:
+        report = run(
+            args.inputs, out, validate_only=args.command == "validate",
+            workers=args.workers, chunksize=args.chunksize, backend=args.backend,
+        )
+    except (OSError, InputError) as e:
+        arg_parser.exit(2, "vast: error: %s\n" % e)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    report.write(sys.stderr)
+    if args.command == "validate" and report.errors:
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
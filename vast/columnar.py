@@ -0,0 +1,151 @@
+"""
+Columnar export of parsed media files, for selecting renditions in bulk
+
+The media files of one or many Vast objects are laid out as NumPy arrays, one per attribute,
+so filtering and ranking thousands of renditions is a vectorized operation.
+NumPy is an optional dependency, install it with the 'numpy' extra.
+"""
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+from vast.models.vast_v2 import Delivery, MimeType
+
+# Value of integer columns for missing attributes
+MISSING = -1
+
+# Codes of the mime_type and delivery columns are indexes in these
+MIME_TYPES = tuple(MimeType)
+DELIVERIES = tuple(Delivery)
+
+MIME_TYPE_CODES = {mime_type: code for code, mime_type in enumerate(MIME_TYPES)}
+DELIVERY_CODES = {delivery: code for code, delivery in enumerate(DELIVERIES)}
+
+
+def _or_missing(value):
+    return MISSING if value is None else value
+
+
+class MediaFileTable(object):
+    """
+    The media files of linear creatives, one row per media file
+
+    Columns are NumPy arrays:
+    width, height, bitrate, min_bitrate and max_bitrate, MISSING where not given,
+    mime_type and delivery, as codes into MIME_TYPES and DELIVERIES,
+    and ad_index, the index in 'ads' of the ad holding the media file.
+    'media_files' holds the MediaFile object of every row.
+    """
+
+    def __init__(self, ads, media_files, ad_indexes):
+        """
+        Use from_vast or from_vasts instead
+
+        :param ads: list of Ad objects
+        :param media_files: list of MediaFile objects
+        :param ad_indexes: index in ads of the ad of each media file
+        """
+        if numpy is None:
+            raise ImportError("MediaFileTable requires numpy, install vast with the 'numpy' extra")
+
+        self.ads = ads
+        self.media_files = media_files
+        self.ad_index = numpy.array(ad_indexes, dtype=numpy.int32)
+        self.width = self._int_column("width")
+        self.height = self._int_column("height")
+        self.bitrate = self._int_column("bitrate")
+        self.min_bitrate = self._int_column("min_bitrate")
+        self.max_bitrate = self._int_column("max_bitrate")
+        self.mime_type = numpy.array(
+            [MIME_TYPE_CODES[mf.type] for mf in media_files], dtype=numpy.int8,
+        )
+        self.delivery = numpy.array(
+            [DELIVERY_CODES[mf.delivery] for mf in media_files], dtype=numpy.int8,
+        )
+
+    def _int_column(self, attr_name):
+        return numpy.array(
+            [_or_missing(getattr(mf, attr_name)) for mf in self.media_files], dtype=numpy.int32,
+        )
+
+    @classmethod
+    def from_vast(cls, vast):
+        """
+        :param vast: Vast object
+        :return: MediaFileTable of the media files of all its ads
+        """
+        return cls.from_vasts([vast])
+
+    @classmethod
+    def from_vasts(cls, vasts):
+        """
+        :param vasts: iterable of Vast objects
+        :return: MediaFileTable of the media files of all their ads, in document order
+        """
+        ads = []
+        media_files = []
+        ad_indexes = []
+        for vast in vasts:
+            for ad in vast.ads or ():
+                ad_index = len(ads)
+                ads.append(ad)
+                for media_file in _iter_media_files(ad):
+                    media_files.append(media_file)
+                    ad_indexes.append(ad_index)
+        return cls(ads, media_files, ad_indexes)
+
+    def __len__(self):
+        return len(self.media_files)
+
+    def is_mime_type(self, *mime_types):
+        """
+        :param mime_types: MimeType members
+        :return: boolean mask of the rows of one of the mime types
+        """
+        return numpy.isin(self.mime_type, [MIME_TYPE_CODES[m] for m in mime_types])
+
+    def is_delivery(self, delivery):
+        """
+        :param delivery: Delivery member
+        :return: boolean mask of the rows of the delivery
+        """
+        return self.delivery == DELIVERY_CODES[delivery]
+
+    def select(self, mask):
+        """
+        :param mask: boolean mask, or indexes, of rows
+        :return: list of the MediaFile objects of the rows
+        """
+        return [self.media_files[i] for i in numpy.arange(len(self))[mask]]
+
+    def best_per_ad(self, mask=None, column="bitrate"):
+        """
+        The row with the highest value of a column for each ad, among the rows of mask
+
+        :param mask: boolean mask of candidate rows, all rows if None
+        :param column: name of the column to rank by
+        :return: dict from ad index to the row of its best media file, for ads with a candidate row
+        """
+        rows = numpy.arange(len(self))
+        if mask is not None:
+            rows = rows[mask]
+        if not len(rows):
+            return {}
+
+        ad_index = self.ad_index[rows]
+        # sorted by ad, and by value within an ad, the last row of each ad is its best
+        order = numpy.lexsort((getattr(self, column)[rows], ad_index))
+        ad_index = ad_index[order]
+        last = numpy.append(ad_index[1:] != ad_index[:-1], True)
+        return dict(zip(ad_index[last].tolist(), rows[order][last].tolist()))
+
+
+def _iter_media_files(ad):
+    body = ad.inline if ad.inline is not None else ad.wrapper
+    if body is None:
+        return
+    for creative in body.creatives or ():
+        if creative.linear is not None:
+            for media_file in creative.linear.media_files:
+                yield media_file
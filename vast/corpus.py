@@ -0,0 +1,351 @@
+"""
+Seeded generator of synthetic VAST 2.0 documents, for load and soak testing
+
+Documents are drawn from the distributions of a Profile, over every element the vast_v2 parsers read:
+ad pods, wrappers and inlines, linear creatives with media files of every MimeType and Delivery,
+tracking events of every TrackingEventType, video clicks and ad parameters, non-linear ads and companions.
+A fraction of the documents is deliberately invalid, each one a valid document with a single defect, see DEFECTS.
+
+The same seed always gives the same documents.
+Elements are rendered once into pools of XML fragments, which documents are assembled from,
+so drawing a document is a handful of random choices and joins, fast enough to never be the bottleneck of a load test.
+
+    vast generate --count 1000000 --seed 7 --invalid-fraction 0.01 > corpus.xml
+"""
+import json
+import random
+import re
+
+import attr
+
+from vast.models.vast_v2 import ApiFramework, Delivery, MimeType, TrackingEventType
+
+
+@attr.s(frozen=True)
+class Profile(object):
+    """
+    Distributions of the generated documents.
+    Fractions are the probability of an element being there, or of a creative being of a kind,
+    numbers of elements are drawn uniformly, from 1 up to their max, or from 0 for tracking events.
+    """
+    pod_fraction = attr.ib(default=0.1)
+    max_pod_ads = attr.ib(default=5)
+    wrapper_fraction = attr.ib(default=0.3)
+    max_creatives = attr.ib(default=3)
+    non_linear_fraction = attr.ib(default=0.1)
+    companion_fraction = attr.ib(default=0.15)
+    max_media_files = attr.ib(default=8)
+    max_tracking_events = attr.ib(default=12)
+    max_non_linear_ads = attr.ib(default=3)
+    max_companion_ads = attr.ib(default=3)
+    video_clicks_fraction = attr.ib(default=0.8)
+    ad_parameters_fraction = attr.ib(default=0.1)
+    max_ad_parameters_bytes = attr.ib(default=4096)
+
+
+# weights of the mime types of media files, the common video containers first
+_MIME_TYPE_WEIGHTS = {
+    MimeType.MP4: 50, MimeType.WEBM: 12, MimeType.HLS: 10, MimeType.JS: 8, MimeType.GPP: 5,
+    MimeType.FLV: 4, MimeType.FLASH: 3, MimeType.MPG: 3, MimeType.MP3: 3, MimeType.OGG: 2,
+}
+_SIZES = ((320, 180), (480, 270), (640, 360), (854, 480), (1280, 720), (1920, 1080), (300, 250), (728, 90))
+_DOMAINS = ("mag.dom.com", "ads.example.com", "cdn.example.net", "track.example.org")
+_IMAGE_TYPES = ("image/png", "image/jpeg", "image/gif")
+
+
+class _Pools(object):
+    """
+    XML fragments of each repeated element, drawn at random
+    """
+
+    def __init__(self, rng, profile, size):
+        mime_types = list(_MIME_TYPE_WEIGHTS)
+        weights = [_MIME_TYPE_WEIGHTS[mime_type] for mime_type in mime_types]
+        self.media_files = [
+            self._media_file(rng, i, rng.choices(mime_types, weights)[0]) for i in range(size)
+        ]
+        # every mime type is drawn at least once
+        self.media_files[:len(mime_types)] = [
+            self._media_file(rng, i, mime_type) for i, mime_type in enumerate(mime_types)
+        ]
+        self.tracking_events = [self._tracking_event(rng, event, i) for i, event in enumerate(TrackingEventType)]
+        self.tracking_events += [
+            self._tracking_event(rng, rng.choice(list(TrackingEventType)), i)
+            for i in range(len(self.tracking_events), size)
+        ]
+        self.ad_parameters = [self._ad_parameters(rng, profile.max_ad_parameters_bytes) for _ in range(size // 8 + 1)]
+        self.video_clicks = [self._video_clicks(rng, i) for i in range(size)]
+        self.non_linear_ads = [self._non_linear_ad(rng, i) for i in range(size)]
+        self.companion_ads = [self._companion_ad(rng, i) for i in range(size)]
+
+    @staticmethod
+    def _url(rng, path, i):
+        return "https://%s/%s?id=%s&amp;cb=%s" % (rng.choice(_DOMAINS), path, i, rng.randrange(1 << 30))
+
+    def _media_file(self, rng, i, mime_type):
+        width, height = rng.choice(_SIZES)
+        attributes = [
+            ("id", "mf_%s" % i),
+            ("delivery", rng.choice(list(Delivery)).value),
+            ("type", mime_type.value),
+            ("width", width),
+            ("height", height),
+        ]
+        if attributes[1][1] == Delivery.PROGRESSIVE.value:
+            attributes.append(("bitrate", rng.randrange(200, 8000, 50)))
+        else:
+            min_bitrate = rng.randrange(200, 2000, 50)
+            attributes += [("minBitrate", min_bitrate), ("maxBitrate", min_bitrate + rng.randrange(0, 6000, 50))]
+        if rng.random() < 0.5:
+            attributes += [("scalable", rng.choice(("true", "false"))), ("maintainAspectRatio", "true")]
+        if mime_type in (MimeType.JS, MimeType.FLASH):
+            attributes.append(("apiFramework", ApiFramework.VPAID.value))
+        return "<MediaFile%s>%s</MediaFile>" % (_attributes(attributes), self._url(rng, "media/%s" % i, i))
+
+    def _tracking_event(self, rng, event, i):
+        return '<Tracking event="%s">%s</Tracking>' % (event.value, self._url(rng, "track/%s" % event.value, i))
+
+    @staticmethod
+    def _ad_parameters(rng, max_bytes):
+        items = []
+        size = rng.randint(16, max_bytes)
+        while sum(len(item) for item in items) < size:
+            items.append('"k%s": "%s"' % (len(items), rng.randrange(1 << 40)))
+        xml_encoded = rng.choice(("", ' xmlEncoded="false"'))
+        return "<AdParameters%s><![CDATA[{%s}]]></AdParameters>" % (xml_encoded, ", ".join(items))
+
+    def _video_clicks(self, rng, i):
+        parts = ["<ClickThrough>%s</ClickThrough>" % self._url(rng, "click", i)]
+        if rng.random() < 0.5:
+            parts.append("<ClickTracking>%s</ClickTracking>" % self._url(rng, "click/track", i))
+        if rng.random() < 0.2:
+            parts.append("<CustomClick>%s</CustomClick>" % self._url(rng, "click/custom", i))
+        return "<VideoClicks>%s</VideoClicks>" % "".join(parts)
+
+    def _resources(self, rng, i):
+        """
+        :return: at least one of the static, iframe and html resources
+        """
+        parts = []
+        while not parts:
+            if rng.random() < 0.6:
+                parts.append('<StaticResource creativeType="%s">%s</StaticResource>' % (
+                    rng.choice(_IMAGE_TYPES), self._url(rng, "static/%s.png" % i, i),
+                ))
+            if rng.random() < 0.3:
+                parts.append("<IFrameResource>%s</IFrameResource>" % self._url(rng, "iframe", i))
+            if rng.random() < 0.3:
+                parts.append("<HTMLResource><![CDATA[<div>ad %s</div>]]></HTMLResource>" % i)
+        return parts
+
+    def _sized(self, rng, i, prefix):
+        width, height = rng.choice(_SIZES)
+        attributes = [("id", "%s_%s" % (prefix, i)), ("width", width), ("height", height)]
+        if rng.random() < 0.3:
+            attributes += [("expandedWidth", width * 2), ("expandedHeight", height * 2)]
+        if rng.random() < 0.2:
+            attributes.append(("apiFramework", ApiFramework.VPAID.value))
+        return attributes
+
+    def _non_linear_ad(self, rng, i):
+        attributes = self._sized(rng, i, "nl")
+        if rng.random() < 0.5:
+            attributes += [
+                ("scalable", rng.choice(("true", "false"))),
+                ("maintainAspectRatio", "true"),
+                ("minSuggestedDuration", "00:00:%02d" % rng.randint(5, 30)),
+            ]
+        parts = self._resources(rng, i)
+        parts.append('<NonLinearClickThrough id="nlct_%s">%s</NonLinearClickThrough>' % (
+            i, self._url(rng, "nl/click", i),
+        ))
+        return "<NonLinear%s>%s</NonLinear>" % (_attributes(attributes), "".join(parts))
+
+    def _companion_ad(self, rng, i):
+        parts = self._resources(rng, i)
+        parts.append(
+            '<TrackingEvents><Tracking event="creativeView">%s</Tracking></TrackingEvents>'
+            % self._url(rng, "companion/view", i)
+        )
+        parts.append("<CompanionClickThrough>%s</CompanionClickThrough>" % self._url(rng, "companion/click", i))
+        if rng.random() < 0.5:
+            parts.append("<AltText>Companion %s</AltText>" % i)
+        return "<Companion%s>%s</Companion>" % (_attributes(self._sized(rng, i, "companion")), "".join(parts))
+
+
+def _attributes(pairs):
+    return "".join(' %s="%s"' % pair for pair in pairs)
+
+
+def _remove_first(pattern):
+    pattern = re.compile(pattern)
+
+    def remove(xml, rng):
+        return pattern.sub("", xml, count=1) if pattern.search(xml) else None
+
+    return remove
+
+
+def _truncate(xml, rng):
+    return xml[:rng.randrange(1, len(xml) - len("</VAST>"))]
+
+
+def _replace_first(old, new):
+    def replace(xml, rng):
+        return xml.replace(old, new, 1) if old in xml else None
+
+    return replace
+
+
+def _bad_number(xml, rng):
+    xml, replaced = re.subn(r' width="\d+"', ' width="wide"', xml, count=1)
+    return xml if replaced else None
+
+
+def _wrong_root(xml, rng):
+    return xml.replace("<VAST ", "<Vast ", 1).replace("</VAST>", "</Vast>")
+
+
+# name -> function from a valid document and the random generator to an invalid one, None if it does not apply
+DEFECTS = {
+    "truncated": _truncate,
+    "wrong_root": _wrong_root,
+    "unsupported_version": _replace_first('<VAST version="2.0">', '<VAST version="9.9">'),
+    "missing_ad_system": _remove_first(r"<AdSystem>[^<]*</AdSystem>"),
+    "missing_media_files": _remove_first(r"<MediaFiles>.*?</MediaFiles>"),
+    "bad_number": _bad_number,
+    "bad_delivery": _replace_first(' delivery="', ' delivery="carrier-pigeon'),
+    "bad_tracking_event": _replace_first('<Tracking event="', '<Tracking event="teleport'),
+}
+
+
+class Corpus(object):
+    """
+    Endless, reproducible, stream of synthetic documents
+    """
+
+    def __init__(self, seed=0, invalid_fraction=0.0, profile=Profile(), pool_size=512):
+        """
+        :param seed: of the random generator, the same seed gives the same documents
+        :param invalid_fraction: of the documents which are deliberately invalid
+        :param profile: Profile the documents are drawn from
+        :param pool_size: number of distinct fragments of each repeated element
+        """
+        self.invalid_fraction = invalid_fraction
+        self.profile = profile
+        self._rng = random.Random(seed)
+        self._pools = _Pools(self._rng, profile, pool_size)
+        self._defects = sorted(DEFECTS)
+        self._count = 0
+
+    def _linear(self, rng, profile, pools):
+        parts = ["<Linear><Duration>00:%02d:%02d</Duration>" % divmod(rng.choice((15, 30, 30, 60, 90, 120)), 60)]
+        tracking_events = rng.randint(0, profile.max_tracking_events)
+        if tracking_events:
+            parts.append("<TrackingEvents>%s</TrackingEvents>" % "".join(
+                rng.choices(pools.tracking_events, k=tracking_events)
+            ))
+        if rng.random() < profile.ad_parameters_fraction:
+            parts.append(rng.choice(pools.ad_parameters))
+        if rng.random() < profile.video_clicks_fraction:
+            parts.append(rng.choice(pools.video_clicks))
+        parts.append("<MediaFiles>%s</MediaFiles></Linear>" % "".join(
+            rng.choices(pools.media_files, k=rng.randint(1, profile.max_media_files))
+        ))
+        return "".join(parts)
+
+    def _creative(self, rng, profile, pools, sequence):
+        attributes = ' id="creative_%s" sequence="%s"' % (rng.randrange(1 << 30), sequence)
+        kind = rng.random()
+        if kind < profile.non_linear_fraction:
+            tracking = ""
+            if rng.random() < 0.5:
+                tracking = "<TrackingEvents>%s</TrackingEvents>" % rng.choice(pools.tracking_events)
+            body = "<NonLinearAds>%s%s</NonLinearAds>" % (tracking, "".join(
+                rng.choices(pools.non_linear_ads, k=rng.randint(1, profile.max_non_linear_ads))
+            ))
+        elif kind < profile.non_linear_fraction + profile.companion_fraction:
+            body = "<CompanionAds>%s</CompanionAds>" % "".join(
+                rng.choices(pools.companion_ads, k=rng.randint(1, profile.max_companion_ads))
+            )
+        else:
+            body = self._linear(rng, profile, pools)
+        return "<Creative%s>%s</Creative>" % (attributes, body)
+
+    def _ad(self, rng, profile, pools, ad_id, sequence):
+        creatives = "<Creatives>%s</Creatives>" % "".join(
+            self._creative(rng, profile, pools, i + 1) for i in range(rng.randint(1, profile.max_creatives))
+        )
+        impression = "<Impression>https://%s/imp?ad=%s</Impression>" % (rng.choice(_DOMAINS), ad_id)
+        if rng.random() < profile.wrapper_fraction:
+            body = (
+                "<Wrapper><AdSystem>corpus</AdSystem><VASTAdTagURI>https://%s/vast?ad=%s</VASTAdTagURI>%s%s</Wrapper>"
+                % (rng.choice(_DOMAINS), ad_id, impression, creatives if rng.random() < 0.5 else "")
+            )
+        else:
+            body = "<InLine><AdSystem>corpus</AdSystem><AdTitle>Ad %s</AdTitle>%s%s</InLine>" % (
+                ad_id, impression, creatives,
+            )
+        sequence = ' sequence="%s"' % sequence if sequence is not None else ""
+        return '<Ad id="%s"%s>%s</Ad>' % (ad_id, sequence, body)
+
+    def _valid(self):
+        rng = self._rng
+        profile = self.profile
+        index = self._count
+        if rng.random() < profile.pod_fraction:
+            ads = [
+                self._ad(rng, profile, self._pools, "ad_%s_%s" % (index, i), i + 1)
+                for i in range(rng.randint(2, profile.max_pod_ads))
+            ]
+        else:
+            ads = [self._ad(rng, profile, self._pools, "ad_%s" % index, None)]
+        return '<VAST version="2.0">%s</VAST>' % "".join(ads)
+
+    def next_document(self):
+        """
+        :return: (defect, document as str), defect is the name of its defect in DEFECTS, None for a valid document
+        """
+        xml = self._valid()
+        self._count += 1
+        if self.invalid_fraction and self._rng.random() < self.invalid_fraction:
+            for defect in self._rng.sample(self._defects, len(self._defects)):
+                invalid = DEFECTS[defect](xml, self._rng)
+                if invalid is not None:
+                    return defect, invalid
+        return None, xml
+
+    def documents(self, count=None):
+        """
+        :param count: of documents, None for no end
+        :return: generator of (defect, document), see next_document
+        """
+        produced = 0
+        while count is None or produced < count:
+            yield self.next_document()
+            produced += 1
+
+
+def write(documents, out, fmt="xml", batch=1000):
+    """
+    :param documents: iterable of (defect, document), e.g. Corpus.documents
+    :param out: binary file object
+    :param fmt: "xml" for a document per line, or "jsonl" for a JSON object per line,
+    with the document under "xml" and its defect under "defect"
+    :param batch: documents written at a time
+    :return: number of documents written
+    """
+    lines = []
+    written = 0
+    for defect, document in documents:
+        if fmt == "jsonl":
+            document = json.dumps({"xml": document, "defect": defect})
+        lines.append(document)
+        if len(lines) >= batch:
+            out.write(("\n".join(lines) + "\n").encode("utf-8"))
+            written += len(lines)
+            lines = []
+    if lines:
+        out.write(("\n".join(lines) + "\n").encode("utf-8"))
+        written += len(lines)
+    return written
@@ -13,4 +13,46 @@ class ParseError(Exception):
     """
     Raise when encountering a parsing error
     """
-    pass
\ No newline at end of file
+    pass
+
+
+class ResolveError(Exception):
+    """
+    Raise when a wrapper chain cannot be resolved to an inline ad
+    """
+    pass
+
+
+class FetchError(ResolveError):
+    """
+    Raise when a transport fails to fetch a VAST document
+    """
+    pass
+
+
+class DeadlineExceededError(ResolveError):
+    """
+    Raise when a wrapper chain cannot be resolved within its deadline
+    """
+    pass
+
+
+class SerializeError(Exception):
+    """
+    Raise when a model cannot be serialized
+    """
+    pass
+
+
+class DecodeError(ValueError):
+    """
+    Raise when binary encoded data cannot be decoded to a model
+    """
+    pass
+
+
+class InputError(ValueError):
+    """
+    Raise when an input of the command line tool cannot be found, or read as documents
+    """
+    pass
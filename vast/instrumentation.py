@@ -0,0 +1,192 @@
+"""
+Time spent in each stage of parsing, to tell where the time of a slow parse went
+
+    with instrument() as timings:
+        xml_parser.from_xml_string(xml)
+    timings.as_dict()
+    {"xmltodict.parse": {"calls": 1, "seconds": ..., "self_seconds": ...}, "MediaFile.make": {...}, ...}
+
+Stages are:
+"xmltodict.parse", building the dict tree of the xmltodict backend,
+"walk", walking that tree into models,
+"streaming.parse", the whole parse of the streaming backend, from parser events to models,
+"streaming.iter_ads", parsing the ads consumed from iter_ads, or from the lazy ads of parse_lazily,
+"streaming.push", the feed and close calls of a PushParser,
+"streaming.extract", the whole of extract,
+"check_and_convert" and "validators.validate", run by the make of every model,
+and "<Model>.make", e.g. "MediaFile.make", for every model class.
+
+The seconds of a stage include the stages it calls, e.g. the seconds of "MediaFile.make" include its
+check_and_convert, self_seconds leave them out.
+
+The parsers and models time their stages with the hooks of this module, stage, timed and timed_make,
+or by checking open_blocks inline.
+While no thread is instrumented, a hook costs a check of a global, and times nothing.
+Only the parses of the thread which entered instrument are recorded,
+not those of other threads, nor those of parse_many, which run in worker processes.
+Instrumenting can be nested, each Timings then records the parses run within its own block.
+"""
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from functools import wraps
+
+import attr
+
+XMLTODICT_PARSE = "xmltodict.parse"
+WALK = "walk"
+STREAMING_PARSE = "streaming.parse"
+STREAMING_ITER_ADS = "streaming.iter_ads"
+STREAMING_PUSH = "streaming.push"
+STREAMING_EXTRACT = "streaming.extract"
+CHECK_AND_CONVERT = "check_and_convert"
+VALIDATE = "validators.validate"
+
+
+@attr.s()
+class StageTimings(object):
+    """
+    Calls of a stage, and the seconds they took
+    """
+    calls = attr.ib(default=0)
+    seconds = attr.ib(default=0.0)
+    self_seconds = attr.ib(default=0.0)
+
+
+class Timings(object):
+    """
+    Timings of each stage, recorded while instrumented
+    """
+
+    def __init__(self):
+        self.stages = {}
+        self._lock = threading.Lock()
+        # seconds of the stages called by each stage being timed
+        self._stack = []
+
+    def _enter(self):
+        self._stack.append(0.0)
+
+    def _exit(self, stage, seconds):
+        stack = self._stack
+        nested = stack.pop()
+        if stack:
+            stack[-1] += seconds
+        with self._lock:
+            timings = self.stages.get(stage)
+            if timings is None:
+                timings = self.stages[stage] = StageTimings()
+            timings.calls += 1
+            timings.seconds += seconds
+            timings.self_seconds += seconds - nested
+
+    def as_dict(self):
+        """
+        :return: dict from each stage to a dict of its calls, seconds and self_seconds, e.g. to send as metrics
+        """
+        with self._lock:
+            return {stage: attr.asdict(timings) for stage, timings in self.stages.items()}
+
+
+class _TimedBlock(object):
+    """
+    Context manager recording the time its block took under a stage, in every Timings of this thread
+    """
+
+    def __init__(self, stage, recording):
+        self._stage = stage
+        self._recording = tuple(recording)
+        self._started = None
+
+    def __enter__(self):
+        for timings in self._recording:
+            timings._enter()
+        self._started = time.perf_counter()
+
+    def __exit__(self, *exc_info):
+        seconds = time.perf_counter() - self._started
+        for timings in self._recording:
+            timings._exit(self._stage, seconds)
+
+
+_NOT_TIMED = nullcontext()
+
+# instrument blocks open in any thread, hooks check it before anything else,
+# the hooks of the hottest paths inline, to not even cost a call while it is 0
+open_blocks = 0
+open_blocks_lock = threading.Lock()
+_local = threading.local()
+
+
+def stage(name):
+    """
+    :param name: of the stage
+    :return: context manager timing its block under name if this thread is instrumented,
+    and doing nothing otherwise
+    """
+    if not open_blocks:
+        return _NOT_TIMED
+    recording = getattr(_local, "recording", None)
+    if not recording:
+        return _NOT_TIMED
+    return _TimedBlock(name, recording)
+
+
+def timed(name):
+    """
+    :param name: of the stage
+    :return: decorator of the function of the stage, timing its calls while this thread is instrumented
+    """
+    def decorate(func):
+        @wraps(func)
+        def timed_func(*args, **kwargs):
+            if not open_blocks:
+                return func(*args, **kwargs)
+            with stage(name):
+                return func(*args, **kwargs)
+
+        return timed_func
+
+    return decorate
+
+
+def timed_make(make):
+    """
+    Decorator of the make of a model, applied under classmethod,
+    timing its calls under "<Model>.make" while this thread is instrumented
+    """
+    @wraps(make)
+    def timed_make_func(cls, *args, **kwargs):
+        if not open_blocks:
+            return make(cls, *args, **kwargs)
+        with stage("%s.make" % cls.__name__):
+            return make(cls, *args, **kwargs)
+
+    return timed_make_func
+
+
+@contextmanager
+def instrument(callback=None):
+    """
+    Record the time spent in each stage of the parses run by this thread within the block
+
+    :param callback: optional function called with the Timings when the block exits, even by an error,
+    e.g. to send them as metrics
+    :return: context manager of the Timings being recorded
+    """
+    global open_blocks
+    timings = Timings()
+    recording = getattr(_local, "recording", None)
+    if recording is None:
+        recording = _local.recording = []
+    recording.append(timings)
+    with open_blocks_lock:
+        open_blocks += 1
+    try:
+        yield timings
+    finally:
+        with open_blocks_lock:
+            open_blocks -= 1
+        recording.remove(timings)
+        if callback is not None:
+            callback(timings)
@@ -0,0 +1,109 @@
+"""
+Index of the media files of a linear creative, for picking the best rendition
+
+Media files are grouped by mime type and delivery, and sorted by bitrate within a group.
+The widths and heights of a group are sorted too, so the limits of a query are bisected
+into a cell of the group, and every query falling into the same cell has the same answer.
+The answer of a cell is found once, by walking down the group from its bitrate limit,
+which is linear in the size of the group at worst, and is then looked up by bisection only.
+"""
+from bisect import bisect_right
+
+
+def _bitrate(media_file):
+    """
+    :return: bitrate of media_file, its max_bitrate for streaming media, 0 if neither is known
+    """
+    if media_file.bitrate is not None:
+        return media_file.bitrate
+    if media_file.max_bitrate is not None:
+        return media_file.max_bitrate
+    return 0
+
+
+class _Group(object):
+    """
+    Media files of one mime type and delivery, sorted by rank,
+    with the answers of the cells queried so far
+    """
+    __slots__ = ("ranks", "bitrates", "widths", "heights", "media_files", "answers")
+
+    def __init__(self, ranked):
+        ranked.sort(key=lambda entry: entry[0])
+        self.ranks = [rank for rank, _ in ranked]
+        self.bitrates = [rank[0] for rank in self.ranks]
+        self.media_files = [media_file for _, media_file in ranked]
+        self.widths = sorted(media_file.width or 0 for media_file in self.media_files)
+        self.heights = sorted(media_file.height or 0 for media_file in self.media_files)
+        # (bitrate end, width end, height end) -> (rank, media_file) or None,
+        # at most (n + 1) ** 3 cells for a group of n media files
+        self.answers = {}
+
+    def best(self, max_bitrate, max_width, max_height):
+        """
+        :return: (rank, media_file) of the best fitting media file, None if none fits
+        """
+        cell = (
+            len(self.bitrates) if max_bitrate is None else bisect_right(self.bitrates, max_bitrate),
+            len(self.widths) if max_width is None else bisect_right(self.widths, max_width),
+            len(self.heights) if max_height is None else bisect_right(self.heights, max_height),
+        )
+        try:
+            return self.answers[cell]
+        except KeyError:
+            answer = self.answers[cell] = self._find(*cell)
+            return answer
+
+    def _find(self, end, width_end, height_end):
+        # a media file fits the cell when its width and height are among the first ends of the sorted ones
+        max_width = self.widths[width_end - 1] if width_end else -1
+        max_height = self.heights[height_end - 1] if height_end else -1
+        for i in range(end - 1, -1, -1):
+            media_file = self.media_files[i]
+            if (media_file.width or 0) <= max_width and (media_file.height or 0) <= max_height:
+                return self.ranks[i], media_file
+        return None
+
+
+class RenditionIndex(object):
+    """
+    Answers which media file is best within the limits of a player.
+
+    The best media file has the highest bitrate,
+    ties are broken by the larger area, and then by the earlier position in the document.
+    Media files without a bitrate rank lowest, and are never excluded by a bitrate limit.
+    """
+
+    def __init__(self, media_files):
+        """
+        :param media_files: iterable of MediaFile objects
+        """
+        grouped = {}
+        for position, media_file in enumerate(media_files or ()):
+            rank = (_bitrate(media_file), (media_file.width or 0) * (media_file.height or 0), -position)
+            grouped.setdefault((media_file.type, media_file.delivery), []).append((rank, media_file))
+        self._groups = {key: _Group(ranked) for key, ranked in grouped.items()}
+
+    def best(self, mime_types=None, delivery=None, max_bitrate=None, max_width=None, max_height=None):
+        """
+        :param mime_types: iterable of acceptable MimeType members, None for any
+        :param delivery: Delivery member, None for any
+        :param max_bitrate: in kbps, None for no limit
+        :param max_width: of the viewport in pixels, None for no limit
+        :param max_height: of the viewport in pixels, None for no limit
+        :return: the best fitting MediaFile, None if none fits
+        """
+        if mime_types is not None:
+            mime_types = frozenset(mime_types)
+
+        best = None
+        for (mime_type, group_delivery), group in self._groups.items():
+            if mime_types is not None and mime_type not in mime_types:
+                continue
+            if delivery is not None and group_delivery != delivery:
+                continue
+            candidate = group.best(max_bitrate, max_width, max_height)
+            if candidate is not None and (best is None or candidate[0] > best[0]):
+                best = candidate
+
+        return None if best is None else best[1]
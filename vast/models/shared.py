@@ -5,6 +5,7 @@ from itertools import chain
 
 import attr
 
+from vast import instrumentation
 from vast.errors import IllegalModelStateError
 
 
@@ -62,6 +63,8 @@ class Converter(object):
     def __attrs_post_init__(self):
         if self.type == bool:
             self._convert = _to_bool
+        elif self.type == str:
+            self._convert = _to_str
         else:
             self._convert = self.type
 
@@ -130,6 +133,9 @@ class ClassChecker(object):
         )
 
     def _check(self, errors, v):
+        if isinstance(v, LazySequence):
+            # items of a lazy sequence are made, and so checked, only when pulled
+            return
         if self.is_container:
             vs = (_v for _v in v)
         else:
@@ -157,6 +163,228 @@ class ClassChecker(object):
         return errors
 
 
+class LazySequence(object):
+    """
+    A read only sequence whose items are pulled from an iterable only when first needed.
+
+    Pulled items are kept, so every item is made at most once.
+    Comparing, measuring or slicing a lazy sequence pulls all of its items.
+    If the iterable raises, the error is kept and raised again by every later pull
+    reaching past the items pulled before it, so the sequence is never cut short.
+    """
+
+    def __init__(self, iterable):
+        self._iterator = iter(iterable)
+        self._items = []
+        self._error = None
+
+    def _fail(self, error):
+        self._iterator = None
+        self._error = error
+
+    def _raise_error(self):
+        if self._error is not None:
+            raise self._error
+
+    def _pull_all(self):
+        self._raise_error()
+        if self._iterator is not None:
+            try:
+                self._items.extend(self._iterator)
+            except Exception as e:
+                self._fail(e)
+                raise
+            self._iterator = None
+        return self._items
+
+    def _pull_up_to(self, index):
+        while self._iterator is not None and len(self._items) <= index:
+            try:
+                self._items.append(next(self._iterator))
+            except StopIteration:
+                self._iterator = None
+            except Exception as e:
+                self._fail(e)
+                raise
+        if len(self._items) <= index:
+            self._raise_error()
+
+    @property
+    def pulled(self):
+        """
+        :return: number of items pulled so far
+        """
+        return len(self._items)
+
+    def __iter__(self):
+        index = 0
+        while True:
+            self._pull_up_to(index)
+            if index >= len(self._items):
+                return
+            yield self._items[index]
+            index += 1
+
+    def __getitem__(self, index):
+        if isinstance(index, slice) or index < 0:
+            return self._pull_all()[index]
+        self._pull_up_to(index)
+        return self._items[index]
+
+    def __len__(self):
+        return len(self._pull_all())
+
+    def __bool__(self):
+        self._pull_up_to(0)
+        return bool(self._items)
+
+    __nonzero__ = __bool__
+
+    def __eq__(self, other):
+        if isinstance(other, LazySequence):
+            other = other._pull_all()
+        if not isinstance(other, (list, tuple)):
+            return NotImplemented
+        return self._pull_all() == list(other)
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        if result is NotImplemented:
+            return result
+        return not result
+
+    __hash__ = None
+
+    def __repr__(self):
+        if self._error is not None:
+            return "LazySequence(%r + <failed: %r>)" % (self._items, self._error)
+        if self._iterator is None:
+            return "LazySequence(%r)" % (self._items, )
+        return "LazySequence(%r + <not pulled>)" % (self._items, )
+
+
+class LazyText(object):
+    """
+    Text which is only decoded when first read, e.g. a large AdParameters payload
+    kept as a slice of the document it was parsed from.
+
+    str() reads the text. Comparing, hashing or measuring a lazy text reads it too,
+    and it compares equal to the str it reads as.
+    Models keep it in attributes declared by lazy_text_attributes, which read as the str,
+    and stored_value returns the lazy text itself.
+    """
+    __slots__ = ("_decode", "_text")
+
+    def __init__(self, decode):
+        """
+        :param decode: function without arguments returning the text, called once
+        """
+        self._decode = decode
+        self._text = None
+
+    @property
+    def decoded(self):
+        """
+        :return: True if the text was read already
+        """
+        return self._decode is None
+
+    def __str__(self):
+        if self._decode is not None:
+            self._text = self._decode()
+            self._decode = None
+        return self._text
+
+    def __eq__(self, other):
+        if isinstance(other, LazyText):
+            other = str(other)
+        if not isinstance(other, str):
+            return NotImplemented
+        return str(self) == other
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        if result is NotImplemented:
+            return result
+        return not result
+
+    def __hash__(self):
+        return hash(str(self))
+
+    def __len__(self):
+        return len(str(self))
+
+    def __reduce__(self):
+        # pickled as the text it reads as, the document it is sliced from is not kept
+        return str, (str(self), )
+
+    def __repr__(self):
+        if self._decode is None:
+            return "LazyText(%r)" % (self._text, )
+        return "LazyText(<not decoded>)"
+
+
+class LazyTextAttribute(object):
+    """
+    Descriptor of a model attribute which may hold a LazyText, read as the str it decodes to,
+    so callers of the model only ever see a str
+    """
+    __slots__ = ("_slot", )
+
+    def __init__(self, slot):
+        """
+        :param slot: descriptor of the slot holding the attribute, as made by attrs
+        """
+        self._slot = slot
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        value = self._slot.__get__(instance, owner)
+        if type(value) is LazyText:
+            return str(value)
+        return value
+
+    def __set__(self, instance, value):
+        self._slot.__set__(instance, value)
+
+    def stored_value(self, instance):
+        return self._slot.__get__(instance, type(instance))
+
+
+def lazy_text_attributes(*attr_names):
+    """
+    Class decorator, to be applied over attr.s(slots=True), letting the attributes attr_names hold a LazyText
+    while they read as a str
+
+    :param attr_names: names of the attributes
+    """
+    def decorate(cls):
+        for attr_name in attr_names:
+            setattr(cls, attr_name, LazyTextAttribute(cls.__dict__[attr_name]))
+        return cls
+
+    return decorate
+
+
+def stored_value(model, attr_name):
+    """
+    :return: value of the attribute attr_name of model as it is stored,
+    a LazyText which may not be decoded yet for an attribute declared by lazy_text_attributes
+    """
+    descriptor = type(model).__dict__.get(attr_name)
+    if isinstance(descriptor, LazyTextAttribute):
+        return descriptor.stored_value(model)
+    return getattr(model, attr_name)
+
+
+def _to_str(value):
+    if type(value) is str or type(value) is LazyText:
+        # a lazy text is kept lazy, its attribute reads it as a str, see LazyTextAttribute
+        return value
+    return str(value)
+
+
 def _check_required(args_dict, required):
     """
 
@@ -215,8 +443,11 @@ def _check_classes(args_dict, required, class_checkers):
         )
     )
 
-def check_and_convert(cls, args_dict):
+
+def _check_and_convert_interpreted(cls, args_dict):
     """
+    Reference implementation of check_and_convert, reading the declarations of cls on every call.
+    Compiled plans must behave exactly like it, it is kept to test and benchmark them against.
 
     :param cls: the class to be checked and converted
     :param args_dict: dict of att names to att values
@@ -240,7 +471,209 @@ def check_and_convert(cls, args_dict):
         )
     )
     if errors:
-        msg = "cannot instantiate class : {name}. Got Errors : {errors}"
-        raise IllegalModelStateError(msg.format(name=cls.__name__, errors=errors))
+        _raise_illegal(cls, errors)
+
+    return cls(**args)
+
+
+def _raise_illegal(cls, errors):
+    msg = "cannot instantiate class : {name}. Got Errors : {errors}"
+    raise IllegalModelStateError(msg.format(name=cls.__name__, errors=errors))
+
+
+# validate -> class -> its compiled plan, see _compile_plan
+_PLANS = {True: {}, False: {}}
+
+
+def _compile_required(required):
+    """
+    :param required: frozenset of required attribute names
+    :return: check(args, errors) reporting missing required attributes, None if there are none
+    """
+    if not required:
+        return None
+    missing_msg = "Missing required attribute :'{attr_name}'"
+
+    def check(args, errors):
+        for attr_name in required:
+            if attr_name not in args:
+                errors.append(missing_msg.format(attr_name=attr_name))
 
+    return check
+
+
+def _compile_some_ofs(some_ofs):
+    """
+    :param some_ofs: tuple of SomeOf instances
+    :return: check(args, errors) running them, None if there are none
+    """
+    if not some_ofs:
+        return None
+
+    def check(args, errors):
+        for some_of in some_ofs:
+            errors.extend(some_of.check(args))
+
+    return check
+
+
+def _compile_conversions(converters, required):
+    """
+    :param converters: iterable of Converter instances, type and enum converters alike
+    :param required: frozenset of required attribute names
+    :return: check(args, errors) converting args in place, None if there is nothing to convert
+    """
+    # (attr_name, convert, converter) in the order converters apply
+    conversions = tuple(
+        (attr_name, converter._convert, converter)
+        for converter in converters
+        for attr_name in converter.attr_names
+    )
+    if not conversions:
+        return None
+
+    def check(args, errors):
+        for attr_name, convert, converter in conversions:
+            v = args.get(attr_name)
+            if v is None:
+                if attr_name in required:
+                    converter._add_error(errors, attr_name, v)
+                continue
+            try:
+                args[attr_name] = convert(v)
+            except (TypeError, ValueError):
+                converter._add_error(errors, attr_name, v)
+
+    return check
+
+
+def _compile_instance_check(checker):
+    clazz = checker.clazz
+
+    def check_value(v, errors):
+        if not isinstance(v, clazz):
+            checker._add_error(errors, v)
+
+    return check_value
+
+
+def _compile_list_check(checker):
+    clazz = checker.clazz
+
+    def check_value(v, errors):
+        # items of a lazy sequence are checked by their own plans when pulled
+        if isinstance(v, LazySequence):
+            return
+        for value in v:
+            if not isinstance(value, clazz):
+                checker._add_error(errors, value)
+
+    return check_value
+
+
+def _compile_class_checks(class_checkers, required):
+    """
+    :param class_checkers: iterable of ClassChecker instances
+    :param required: frozenset of required attribute names
+    :return: check(args, errors) running them, None if there are none
+    """
+    # (attr_name, required, checker, check_value) in declaration order
+    class_checks = tuple(
+        (
+            checker.attr_name,
+            checker.attr_name in required,
+            checker,
+            _compile_list_check(checker) if checker.is_container else _compile_instance_check(checker),
+        )
+        for checker in class_checkers
+    )
+    if not class_checks:
+        return None
+
+    def check(args, errors):
+        for attr_name, is_required, checker, check_value in class_checks:
+            v = args.get(attr_name)
+            if v is not None:
+                check_value(v, errors)
+            elif is_required:
+                checker._add_error(errors, v)
+
+    return check
+
+
+def _compile_plan(cls, validate=True):
+    """
+    Compile the REQUIRED, SOME_OFS, CONVERTERS and CLASSES declarations of a model class
+    into a function from an args dict to a checked and converted instance.
+
+    The declarations are read once, here, and each kind of check is compiled by its own builder,
+    so a call does no reflection and creates no intermediate lists while args are legal.
+    Checks run, and errors are reported, in the same order and words as by the declarations themselves.
+
+    :param cls: the class to compile a plan for
+    :param validate: if False, the plan only converts, and only conversion errors are raised
+    :return: function from an args dict, which it converts in place, to a legal instance of cls
+    """
+    required = frozenset(getattr(cls, "REQUIRED", []) if validate else ())
+    checks = (
+        _compile_required(required),
+        _compile_some_ofs(tuple(getattr(cls, "SOME_OFS", []) if validate else ())),
+        _compile_conversions(getattr(cls, "CONVERTERS", []), required),
+        _compile_class_checks(getattr(cls, "CLASSES", []) if validate else (), required),
+    )
+    checks = tuple(check for check in checks if check is not None)
+
+    def plan(args):
+        errors = []
+        for check in checks:
+            check(args, errors)
+
+        if errors:
+            _raise_illegal(cls, errors)
+
+        return cls(**args)
+
+    return plan
+
+
+def check_and_convert(cls, args_dict, validate=True):
+    """
+
+    :param cls: the class to be checked and converted
+    :param args_dict: dict of att names to att values
+    :param validate: if False, only convert, for values known to be legal
+    :return: A checked and converted legal instance
+    :raises: IllegalModelStateError if checks or conversions failed
+    """
+    plans = _PLANS[bool(validate)]
+    try:
+        plan = plans[cls]
+    except KeyError:
+        plan = plans[cls] = _compile_plan(cls, validate)
+    if instrumentation.open_blocks:
+        with instrumentation.stage(instrumentation.CHECK_AND_CONVERT):
+            return plan(args_dict.copy())
+    return plan(args_dict.copy())
+
+
+# class -> dict of all its init attribute names to None
+_ALL_NONE = {}
+
+
+def make_trusted(cls, args_dict):
+    """
+    Make an instance straight from values which already have their types and passed all checks,
+    e.g. when rebuilding models kept in a cache or database.
+    Nothing is checked nor converted.
+
+    :param cls: the class to be made
+    :param args_dict: dict of att names to att values, missing attributes are None
+    :return: instance of cls
+    """
+    try:
+        args = _ALL_NONE[cls].copy()
+    except KeyError:
+        _ALL_NONE[cls] = dict.fromkeys(a.name for a in attr.fields(cls) if a.init)
+        args = _ALL_NONE[cls].copy()
+    args.update(args_dict)
     return cls(**args)
@@ -0,0 +1,87 @@
+from unittest import TestCase
+
+from vast.models.renditions import RenditionIndex
+from vast.models.tests.vast_v2_model_mixin import VastModelMixin
+from vast.models.vast_v2 import Delivery, MimeType
+
+
+class TestRenditionIndex(VastModelMixin, TestCase):
+    def setUp(self):
+        self.media_files = [
+            self.make_media_file(id="mp4_low", width=640, height=360, bitrate=500),
+            self.make_media_file(id="mp4_hd", width=1280, height=720, bitrate=1500),
+            self.make_media_file(id="mp4_full_hd", width=1920, height=1080, bitrate=3000),
+            self.make_media_file(id="mp4_hd_twin", width=1280, height=720, bitrate=1500),
+            self.make_media_file(id="mp4_hd_small", width=960, height=540, bitrate=1500),
+            self.make_media_file(id="webm_hd", type="video/webm", width=1280, height=720, bitrate=1400),
+            self.make_media_file(id="mp4_stream", delivery="streaming", width=1280, height=720, bitrate=2000),
+        ]
+        self.index = RenditionIndex(self.media_files)
+
+    def _best_id(self, **kwargs):
+        best = self.index.best(**kwargs)
+        return None if best is None else best.id
+
+    def test_highest_bitrate_within_limits(self):
+        self.assertEqual(
+            self._best_id(
+                mime_types=[MimeType.MP4], delivery=Delivery.PROGRESSIVE,
+                max_bitrate=1500, max_width=1280, max_height=720,
+            ),
+            "mp4_hd",
+        )
+        self.assertEqual(self._best_id(max_bitrate=1499), "webm_hd")
+        self.assertEqual(self._best_id(), "mp4_full_hd")
+
+    def test_viewport(self):
+        self.assertEqual(self._best_id(delivery=Delivery.PROGRESSIVE, max_width=1000), "mp4_hd_small")
+        self.assertIsNone(self._best_id(max_width=100))
+
+    def test_ties_are_broken_by_area_then_position(self):
+        shuffled = RenditionIndex(list(reversed(self.media_files)))
+        self.assertEqual(self._best_id(max_bitrate=1500, mime_types=[MimeType.MP4]), "mp4_hd")
+        self.assertEqual(
+            shuffled.best(max_bitrate=1500, mime_types=[MimeType.MP4]).id, "mp4_hd_twin",
+        )
+
+    def test_same_as_linear_scan(self):
+        for max_bitrate in (None, 400, 500, 1450, 1500, 2500, 5000):
+            for max_width in (None, 700, 1280, 1920):
+                for max_height in (None, 300, 540, 719, 720):
+                    for delivery in (None, Delivery.PROGRESSIVE, Delivery.STREAMING):
+                        fitting = [
+                            (mf.bitrate, mf.width * mf.height, -i, mf)
+                            for i, mf in enumerate(self.media_files)
+                            if all((
+                                max_bitrate is None or mf.bitrate <= max_bitrate,
+                                max_width is None or mf.width <= max_width,
+                                max_height is None or mf.height <= max_height,
+                                delivery is None or mf.delivery == delivery,
+                            ))
+                        ]
+                        expected = max(fitting, key=lambda f: f[:3])[3] if fitting else None
+                        actual = self.index.best(
+                            delivery=delivery, max_bitrate=max_bitrate, max_width=max_width, max_height=max_height,
+                        )
+                        self.assertIs(actual, expected)
+
+    def test_queries_in_the_same_cell_share_their_answer(self):
+        first = self._best_id(max_bitrate=1600, max_width=1300, max_height=800)
+        self.assertEqual(first, "mp4_hd")
+        self.assertEqual(self._best_id(max_bitrate=1900, max_width=1900, max_height=1000), first)
+
+
+class TestLinearBestMediaFile(VastModelMixin, TestCase):
+    def test_index_is_memoized(self):
+        linear = self.make_linear_creative()
+        self.assertIs(linear.rendition_index(), linear.rendition_index())
+        self.assertEqual(linear.best_media_file(max_bitrate=150), linear.media_files[0])
+        self.assertIsNone(linear.best_media_file(max_bitrate=100))
+
+    def test_index_is_not_part_of_the_model(self):
+        linear = self.make_linear_creative()
+        other = self.make_linear_creative()
+        linear.rendition_index()
+        self.assertEqual(linear, other)
+        self.assertNotIn("_rendition_index", linear.as_dict())
+        self.assertNotIn("rendition_index", repr(linear))
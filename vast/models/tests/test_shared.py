@@ -0,0 +1,97 @@
+from unittest import TestCase
+
+import attr
+
+from vast.errors import IllegalModelStateError
+from vast.models import shared
+from vast.models import vast_v2
+from vast.models.tests.vast_v2_model_mixin import VastModelMixin
+
+
+def _outcome(check_and_convert, cls, args):
+    try:
+        return check_and_convert(cls, args)
+    except IllegalModelStateError as e:
+        return str(e)
+
+
+class TestCompiledPlans(VastModelMixin, TestCase):
+    def _assert_same_as_interpreted(self, cls, args):
+        given = dict(args)
+        expected = _outcome(shared._check_and_convert_interpreted, cls, args)
+        self.assertEqual(_outcome(shared.check_and_convert, cls, args), expected)
+        self.assertEqual(args, given)
+
+    def test_legal_args(self):
+        media_file = dict(
+            asset="https://mag.dom.com/a.mp4", delivery="progressive", type="video/mp4",
+            width="720", height="420", codec=None, id=None, bitrate="600",
+            min_bitrate=None, max_bitrate=None, scalable="true",
+            maintain_aspect_ratio="0", api_framework="VPAID",
+        )
+        self._assert_same_as_interpreted(vast_v2.MediaFile, media_file)
+        self._assert_same_as_interpreted(
+            vast_v2.Linear,
+            dict(duration=15, media_files=self.make_media_files(), video_clicks=None,
+                 ad_parameters=None, tracking_events=[self.make_tracking_event()]),
+        )
+
+    def test_illegal_args(self):
+        cases = [
+            (vast_v2.MediaFile, dict(asset=None, delivery="nope", type="video/mp4", width="a", height=None)),
+            (vast_v2.TrackingEvent, dict(tracking_event_uri="https://mag.dom.com", tracking_event_type="bogus")),
+            (vast_v2.Linear, dict(duration=15, media_files=[object()], tracking_events=None)),
+            (vast_v2.Ad, dict(id=None, wrapper=self.make_wrapper(), inline=self.make_inline())),
+            (vast_v2.Ad, dict(id="1")),
+            (vast_v2.Vast, dict(version="2.0", ad="not an ad", ads=None)),
+        ]
+        for cls, args in cases:
+            self._assert_same_as_interpreted(cls, args)
+            with self.assertRaises(IllegalModelStateError):
+                shared.check_and_convert(cls, args)
+
+
+class TestTrustedConstruction(VastModelMixin, TestCase):
+    def test_validate_false_only_converts(self):
+        media_file = vast_v2.MediaFile.make(
+            asset="https://mag.dom.com/a.mp4", delivery="progressive", type="video/mp4",
+            width="0", height=None, validate=False,
+        )
+        self.assertEqual(media_file.width, 0)
+        self.assertIsNone(media_file.height)
+        self.assertEqual(media_file.delivery, vast_v2.Delivery.PROGRESSIVE)
+
+    def test_validate_false_raises_conversion_errors(self):
+        with self.assertRaises(IllegalModelStateError):
+            vast_v2.TrackingEvent.make("https://mag.dom.com", "bogus", validate=False)
+
+    def test_make_trusted(self):
+        media_file = self.make_media_file()
+        self.assertEqual(shared.make_trusted(vast_v2.MediaFile, attr.asdict(media_file)), media_file)
+
+        linear = shared.make_trusted(vast_v2.Linear, dict(duration=15, media_files=[media_file]))
+        self.assertEqual(linear.media_files, [media_file])
+        self.assertIsNone(linear.tracking_events)
+
+
+class TestLazySequence(TestCase):
+    def _items(self):
+        yield "first"
+        raise ValueError("invalid second item")
+
+    def test_error_is_raised_by_every_later_pull(self):
+        items = shared.LazySequence(self._items())
+        self.assertEqual(items[0], "first")
+
+        for _ in range(2):
+            with self.assertRaises(ValueError):
+                items[1]
+        with self.assertRaises(ValueError):
+            len(items)
+        with self.assertRaises(ValueError):
+            items == ["first"]
+        with self.assertRaises(ValueError):
+            list(items)
+
+        self.assertEqual(items[0], "first")
+        self.assertEqual(items.pulled, 1)
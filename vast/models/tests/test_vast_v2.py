@@ -1,3 +1,5 @@
+import pickle
+
 from testscenarios import TestWithScenarios
 
 from vast.errors import IllegalModelStateError
@@ -41,3 +43,29 @@ class TestVastIllegals(VastModelMixin, TestWithScenarios):
             # since we want to test the model make method,
             # not our mixin
             vast_v2.Vast.make(**kw)
+
+
+class TestSlottedModels(VastModelMixin, TestWithScenarios):
+    scenarios = [
+        ("make_vast", dict(make_func="make_vast")),
+        ("make_inline_ad", dict(make_func="make_inline_ad")),
+        ("make_wrapper", dict(make_func="make_wrapper")),
+        ("make_creative", dict(make_func="make_creative")),
+        ("make_linear_creative", dict(make_func="make_linear_creative")),
+        ("make_media_file", dict(make_func="make_media_file")),
+        ("make_tracking_event", dict(make_func="make_tracking_event")),
+    ]
+
+    def test_no_instance_dict(self):
+        instance = getattr(self, self.make_func)()
+        self.assertFalse(hasattr(instance, "__dict__"))
+
+    def test_equality_and_hashing(self):
+        make = getattr(self, self.make_func)
+        self.assertEqual(make(), make())
+        if self.make_func in ("make_media_file", "make_tracking_event"):
+            self.assertEqual(hash(make()), hash(make()))
+
+    def test_pickle_round_trip(self):
+        instance = getattr(self, self.make_func)()
+        self.assertEqual(pickle.loads(pickle.dumps(instance)), instance)
@@ -4,17 +4,25 @@
 Models for the VAST 2.0 Version 
 
 Models are intentionally simple containers with very little logic. 
+They are frozen and slotted, so an instance holds no __dict__,
+which keeps large numbers of parsed documents compact in memory.
 
 Models are not meant to be created directly via __init__ method.
 Instead use the 'make' class method provided.
 This to make sure that created models adhere to vast spec. 
+
+make(..., validate=False) only converts the given values to their types,
+without checking the model adheres to the spec,
+for data which is known to be valid, e.g. documents served by ourselves.
+shared.make_trusted builds models from values which already have their types.
 """
 import attr
 from enum import Enum
 
-from vast import validators
+from vast import instrumentation, validators
 from vast.models.shared import ClassChecker, Converter, SomeOf
-from vast.models.shared import check_and_convert
+from vast.models.shared import check_and_convert, lazy_text_attributes
+from vast.models.renditions import RenditionIndex
 
 
 class Delivery(Enum):
@@ -75,7 +83,7 @@ class TrackingEventType(Enum):
     CLOSE = "close"
 
 
-@attr.s(frozen=True)
+@attr.s(frozen=True, slots=True)
 class TrackingEvent(object):
     """
     Event for user interaction with the Creative
@@ -91,18 +99,20 @@ class TrackingEvent(object):
     tracking_event_type = attr.ib()
 
     @classmethod
-    def make(cls, tracking_event_uri, tracking_event_type):
+    @instrumentation.timed_make
+    def make(cls, tracking_event_uri, tracking_event_type, validate=True):
         instance = check_and_convert(
             cls,
             args_dict=dict(
                 tracking_event_uri=tracking_event_uri,
                 tracking_event_type=tracking_event_type,
             ),
+            validate=validate,
         )
         return instance
 
 
-@attr.s(frozen=True)
+@attr.s(frozen=True, slots=True)
 class MediaFile(object):
     """
     2.3.1.4 Media File Attributes
@@ -140,11 +150,13 @@ class MediaFile(object):
     api_framework = attr.ib()
 
     @classmethod
+    @instrumentation.timed_make
     def make(
             cls,
             asset, delivery, type, width, height,
             codec=None, id=None, bitrate=None, min_bitrate=None, max_bitrate=None,
             scalable=None, maintain_aspect_ratio=None, api_framework=None,
+            validate=True,
     ):
         """
             Entry point for making MediaFile instances.
@@ -165,6 +177,7 @@ class MediaFile(object):
             :param scalable: identifies whether the media file is meant to scale to larger dimensions
             :param maintain_aspect_ratio: identifies whether aspect ratio for media file is maintained
             :param api_framework: identifies the API needed to execute an interactive media file
+            :param validate: if False, values are only converted, not checked
             :return:
         """
         instance = check_and_convert(
@@ -184,6 +197,7 @@ class MediaFile(object):
                 maintain_aspect_ratio=maintain_aspect_ratio,
                 api_framework=api_framework,
             ),
+            validate=validate,
         )
 
         vs = list(cls.VALIDATORS)
@@ -198,7 +212,8 @@ class MediaFile(object):
         # else:
         #     vs = list(cls.VALIDATORS) + [cls._validate_min_max_bitrate]
 
-        validators.validate(instance, vs)
+        if validate:
+            validators.validate(instance, vs)
 
         return instance
 
@@ -222,7 +237,7 @@ class MediaFile(object):
         return ",".join(errors) or None
 
 
-@attr.s(frozen=True)
+@attr.s(frozen=True, slots=True)
 class VideoClicks(object):
     """
     A container for URI elements, for when a user interacts with the video
@@ -236,7 +251,8 @@ class VideoClicks(object):
     custom_click = attr.ib()
 
     @classmethod
-    def make(cls, click_through=None, click_tracking=None, custom_click=None):
+    @instrumentation.timed_make
+    def make(cls, click_through=None, click_tracking=None, custom_click=None, validate=True):
         instance = check_and_convert(
             cls,
             args_dict=dict(
@@ -244,12 +260,14 @@ class VideoClicks(object):
                 click_tracking=click_tracking,
                 custom_click=custom_click,
             ),
+            validate=validate,
         )
 
         return instance
 
 
-@attr.s(frozen=True)
+@lazy_text_attributes("data")
+@attr.s(frozen=True, slots=True)
 class AdParameters(object):
     """
     Some ad serving systems may want to send data to the media file when first initialized.
@@ -271,18 +289,20 @@ class AdParameters(object):
     xml_encoded = attr.ib()
 
     @classmethod
-    def make(cls, data, xml_encoded=None):
+    @instrumentation.timed_make
+    def make(cls, data, xml_encoded=None, validate=True):
         instance = check_and_convert(
             cls,
             args_dict=dict(
                 data=data,
                 xml_encoded=xml_encoded,
             ),
+            validate=validate,
         )
         return instance
 
 
-@attr.s(frozen=True)
+@attr.s(frozen=True, slots=True)
 class Linear(object):
     """
     The most common type of video advertisement trafficked in the industry is a “linear ad”,
@@ -314,8 +334,12 @@ class Linear(object):
     ad_parameters = attr.ib()
     tracking_events = attr.ib()
 
+    # memoized by rendition_index, not part of the model
+    _rendition_index = attr.ib(init=False, default=None, cmp=False, repr=False)
+
     @classmethod
-    def make(cls, duration, media_files, video_clicks=None, ad_parameters=None, tracking_events=None):
+    @instrumentation.timed_make
+    def make(cls, duration, media_files, video_clicks=None, ad_parameters=None, tracking_events=None, validate=True):
         instance = check_and_convert(
             cls,
             args_dict=dict(
@@ -325,17 +349,46 @@ class Linear(object):
                 ad_parameters=ad_parameters,
                 tracking_events=tracking_events,
             ),
+            validate=validate,
         )
-        validators.validate(instance)
+        if validate:
+            validators.validate(instance)
 
         return instance
 
+    def rendition_index(self):
+        """
+        :return: RenditionIndex of the media files, built on first use and kept with the instance
+        """
+        index = self._rendition_index
+        if index is None:
+            index = RenditionIndex(self.media_files)
+            object.__setattr__(self, "_rendition_index", index)
+        return index
+
+    def best_media_file(self, mime_types=None, delivery=None, max_bitrate=None, max_width=None, max_height=None):
+        """
+        The media file of the highest bitrate within the given limits,
+        see RenditionIndex.best for how ties are broken
+
+        :param mime_types: iterable of acceptable MimeType members, None for any
+        :param delivery: Delivery member, None for any
+        :param max_bitrate: in kbps, None for no limit
+        :param max_width: of the viewport in pixels, None for no limit
+        :param max_height: of the viewport in pixels, None for no limit
+        :return: MediaFile, None if none fits
+        """
+        return self.rendition_index().best(mime_types, delivery, max_bitrate, max_width, max_height)
+
     def as_dict(self):
         from collections import OrderedDict
-        return attr.asdict(self, dict_factory=OrderedDict, retain_collection_types=True)
+        return attr.asdict(
+            self, dict_factory=OrderedDict, retain_collection_types=True,
+            filter=lambda attribute, value: attribute.init,
+        )
 
 
-@attr.s(frozen=True)
+@attr.s(frozen=True, slots=True)
 class StaticResource(object):
     REQUIRED = ("resource", "mime_type")
     CONVERTERS = (
@@ -345,18 +398,20 @@ class StaticResource(object):
     mime_type = attr.ib()
 
     @classmethod
-    def make(cls, resource, mime_type):
+    @instrumentation.timed_make
+    def make(cls, resource, mime_type, validate=True):
         instance = check_and_convert(
             cls,
             args_dict=dict(
                 resource=resource,
                 mime_type=mime_type,
             ),
+            validate=validate,
         )
         return instance
 
 
-@attr.s(frozen=True)
+@attr.s(frozen=True, slots=True)
 class UriWithId(object):
     REQUIRED = ("resource", )
     CONVERTERS = (
@@ -366,19 +421,22 @@ class UriWithId(object):
     id = attr.ib()
 
     @classmethod
-    def make(cls, resource, id=None):
+    @instrumentation.timed_make
+    def make(cls, resource, id=None, validate=True):
         instance = check_and_convert(
             cls,
             args_dict=dict(
                 resource=resource,
                 id=id,
             ),
+            validate=validate,
         )
 
         return instance
 
 
-@attr.s(frozen=True)
+@lazy_text_attributes("html_resource")
+@attr.s(frozen=True, slots=True)
 class NonLinearAd(object):
     REQUIRED = ("width", "height")
     CONVERTERS = (
@@ -414,12 +472,14 @@ class NonLinearAd(object):
     ad_parameters = attr.ib()
 
     @classmethod
+    @instrumentation.timed_make
     def make(
             cls, width, height, expanded_width=None, expanded_height=None,
             scalable=None, maintain_aspect_ratio=None, min_suggested_duration=None,
             api_framework=None, id=None,
             static_resource=None, iframe_resource=None, html_resource=None,
             non_linear_click_through=None, ad_parameters=None,
+            validate=True,
     ):
         instance = check_and_convert(
             cls,
@@ -439,12 +499,13 @@ class NonLinearAd(object):
                 non_linear_click_through=non_linear_click_through,
                 ad_parameters=ad_parameters,
             ),
+            validate=validate,
         )
 
         return instance
 
 
-@attr.s(frozen=True)
+@attr.s(frozen=True, slots=True)
 class NonLinear(object):
     """
     The ad runs concurrently with the video content so the users see the ad while viewing the content.
@@ -460,19 +521,22 @@ class NonLinear(object):
     tracking_events = attr.ib()
 
     @classmethod
-    def make(cls, non_linear_ads, tracking_events=None):
+    @instrumentation.timed_make
+    def make(cls, non_linear_ads, tracking_events=None, validate=True):
         instance = check_and_convert(
             cls,
             args_dict=dict(
                 non_linear_ads=non_linear_ads,
                 tracking_events=tracking_events,
             ),
+            validate=validate,
         )
 
         return instance
 
 
-@attr.s(frozen=True)
+@lazy_text_attributes("html_resource")
+@attr.s(frozen=True, slots=True)
 class CompanionAd(object):
     """
     Commonly text, display ads, rich media, or skins that wrap around the video experience.
@@ -510,12 +574,14 @@ class CompanionAd(object):
     tracking_events = attr.ib()
 
     @classmethod
+    @instrumentation.timed_make
     def make(
             cls, width, height, expanded_width=None, expanded_height=None,
             api_framework=None, id=None,
             static_resource=None, iframe_resource=None, html_resource=None,
             companion_click_through=None, ad_parameters=None, alt_text=None,
             tracking_events=None,
+            validate=True,
     ):
         instance = check_and_convert(
             cls,
@@ -534,12 +600,13 @@ class CompanionAd(object):
                 alt_text=alt_text,
                 tracking_events=tracking_events,
             ),
+            validate=validate,
         )
 
         return instance
 
 
-@attr.s(frozen=True)
+@attr.s(frozen=True, slots=True)
 class Companion(object):
     """
     Companion Ads - Container for Companion Ads
@@ -553,18 +620,20 @@ class Companion(object):
     companion_ads = attr.ib()
 
     @classmethod
-    def make(cls, companion_ads=None):
+    @instrumentation.timed_make
+    def make(cls, companion_ads=None, validate=True):
         instance = check_and_convert(
             cls,
             args_dict=dict(
                 companion_ads=companion_ads,
             ),
+            validate=validate,
         )
 
         return instance
 
 
-@attr.s(frozen=True)
+@attr.s(frozen=True, slots=True)
 class Creative(object):
     """
     A creative in VAST is a file that is part of a VAST ad.
@@ -616,8 +685,10 @@ class Creative(object):
     api_framework = attr.ib()
 
     @classmethod
+    @instrumentation.timed_make
     def make(cls, linear=None, non_linear=None, companion=None,
              id=None, sequence=None, ad_id=None, api_framework=None,
+             validate=True,
              ):
         instance = check_and_convert(
             cls,
@@ -630,13 +701,15 @@ class Creative(object):
                 ad_id=ad_id,
                 api_framework=api_framework,
             ),
+            validate=validate,
         )
-        validators.validate(instance, cls.VALIDATORS)
+        if validate:
+            validators.validate(instance, cls.VALIDATORS)
 
         return instance
 
 
-@attr.s(frozen=True)
+@attr.s(frozen=True, slots=True)
 class Inline(object):
     """
     2.2.4 The <InLine> Element
@@ -660,7 +733,8 @@ class Inline(object):
     creatives = attr.ib()
 
     @classmethod
-    def make(cls, ad_system, ad_title, impression, creatives):
+    @instrumentation.timed_make
+    def make(cls, ad_system, ad_title, impression, creatives, validate=True):
         instance = check_and_convert(
             cls,
             args_dict=dict(
@@ -669,12 +743,13 @@ class Inline(object):
                 impression=impression,
                 creatives=creatives,
             ),
+            validate=validate,
         )
         return instance
 
 
 
-@attr.s(frozen=True)
+@attr.s(frozen=True, slots=True)
 class Wrapper(object):
     """
     
@@ -693,7 +768,8 @@ class Wrapper(object):
     creatives = attr.ib()
 
     @classmethod
-    def make(cls, ad_system, vast_ad_tag_uri, ad_title=None, impression=None, error=None, creatives=None):
+    @instrumentation.timed_make
+    def make(cls, ad_system, vast_ad_tag_uri, ad_title=None, impression=None, error=None, creatives=None, validate=True):
         instance = check_and_convert(
             cls,
             args_dict=dict(
@@ -704,18 +780,22 @@ class Wrapper(object):
                 error=error,
                 creatives=creatives,
             ),
+            validate=validate,
         )
         return instance
 
 
-@attr.s(frozen=True)
+@attr.s(frozen=True, slots=True)
 class Ad(object):
     """
     
     """
     REQUIRED = ("id", )
     SOME_OFS = (SomeOf(attr_names=("wrapper", "inline")), )
-    CONVERTERS = (Converter(str, ("id", )), )
+    CONVERTERS = (
+        Converter(str, ("id", )),
+        Converter(int, ("sequence", )),
+    )
     CLASSES = (
         ClassChecker("wrapper", Wrapper),
         ClassChecker("inline", Inline),
@@ -724,52 +804,98 @@ class Ad(object):
     id = attr.ib()
     wrapper = attr.ib()
     inline = attr.ib()
+    sequence = attr.ib()
 
     @classmethod
-    def make(cls, id, wrapper=None, inline=None):
+    @instrumentation.timed_make
+    def make(cls, id, wrapper=None, inline=None, sequence=None, validate=True):
+        """
+        :param id: an ad server-defined identifier for the ad
+        :param wrapper: Wrapper instance, when the ad points to another VAST document
+        :param inline: Inline instance, when the ad holds the creatives itself
+        :param sequence: position of the ad within an ad pod, if the ad is part of one
+        :param validate: if False, values are only converted, not checked
+        :return:
+        """
         instance = check_and_convert(
             cls,
             args_dict=dict(
                 id=id,
                 wrapper=wrapper,
                 inline=inline,
+                sequence=sequence,
             ),
+            validate=validate,
         )
         return instance
 
     @classmethod
-    def make_wrapper(cls, id, wrapper):
-        return cls.make(id=id, wrapper=wrapper)
+    def make_wrapper(cls, id, wrapper, sequence=None):
+        return cls.make(id=id, wrapper=wrapper, sequence=sequence)
 
     @classmethod
-    def make_inline(cls, id, inline):
-        return cls.make(id=id, inline=inline)
+    def make_inline(cls, id, inline, sequence=None):
+        return cls.make(id=id, inline=inline, sequence=sequence)
 
 
-@attr.s(frozen=True)
+@attr.s(frozen=True, slots=True)
 class Vast(object):
     """
     The Document Root Element
+
+    A document may hold several ads, e.g. an ad pod or fallback ads.
+    'ads' holds all of them in document order, and 'ad' is the first one.
+    'ads' may be a LazySequence, in which case ads are only parsed once consumed.
     """
     REQUIRED = ("version", "ad")
-    CLASSES = (ClassChecker("ad", Ad, False), )
+    CLASSES = (
+        ClassChecker("ad", Ad, False),
+        ClassChecker("ads", Ad, True),
+    )
 
     version = attr.ib()
     ad = attr.ib()
+    ads = attr.ib()
 
     @classmethod
-    def make(cls, version, ad):
+    @instrumentation.timed_make
+    def make(cls, version, ad=None, ads=None, validate=True):
+        """
+        :param version: of the vast document, must be 2.0
+        :param ad: the first ad of the document, taken from ads if not given
+        :param ads: all ads of the document, defaults to [ad]
+        :param validate: if False, values are only converted, not checked
+        :return:
+        """
+        if ad is None and ads:
+            ad = ads[0]
+        if ads is None and ad is not None:
+            ads = [ad]
+
         instance = check_and_convert(
             cls,
             args_dict=dict(
                 version=version,
                 ad=ad,
+                ads=ads,
             ),
+            validate=validate,
         )
-        validators.validate(instance, [cls._validate_version])
+        if validate:
+            validators.validate(instance, [cls._validate_version])
 
         return instance
 
+    def ads_by_sequence(self):
+        """
+        Ads of the pod, meaning ads with a sequence attribute, in the order they should play.
+        Pulls all ads of a lazily parsed document.
+
+        :return: list of Ad instances
+        """
+        sequenced = (ad for ad in self.ads if ad.sequence is not None)
+        return sorted(sequenced, key=lambda ad: ad.sequence)
+
     @staticmethod
     def _validate_version(instance):
         if instance.version != "2.0":
@@ -0,0 +1,238 @@
+"""
+Reader of archives of VAST documents, files holding many documents one after another
+
+The archive is memory mapped, and each document is found by its VAST element, searched in the map,
+and handed to the parser as a memoryview of the map, so no document is copied nor read in text mode.
+A document starts at its XML declaration, if any, or else at its VAST start tag,
+and ends with its VAST end tag. A document missing its end tag ends where the next one starts,
+so it does not swallow the documents after it. CDATA sections and comments, e.g. the XML embedded in
+VPAID AdParameters, are skipped while searching for either. Whitespace between documents is ignored,
+anything else between them, e.g. a document of another root element, is reported as not VAST.
+"""
+import mmap
+import os
+import re
+from contextlib import contextmanager
+
+from vast.errors import ParseError
+from vast.parsers import compressed, xml_parser
+
+_VAST_START = re.compile(rb"<VAST[\s>/]")
+# the end of a document, the opening of a CDATA section or comment to skip,
+# or the start of the next document when this one is not terminated,
+# which may be a document of a VAST root in other case, never found within a VAST document
+_VAST_END_OR_NEXT = re.compile(rb"(</VAST\s*>)|(<!\[CDATA\[|<!--)|<(?i:vast)[\s>/]|<\?xml")
+_SECTION_CLOSINGS = {b"<![CDATA[": b"]]>", b"<!--": b"-->"}
+_NOT_WHITESPACE = re.compile(rb"\S")
+_ROOT_START = re.compile(rb"<([A-Za-z_][\w.:-]*)")
+_DECLARATION = b"<?xml"
+
+# Kinds of the spans found by find_documents
+DOCUMENT = "document"
+UNTERMINATED = "unterminated"
+NOT_VAST = "not VAST"
+
+
+def find_documents(buffer, offset=0):
+    """
+    :param buffer: bytes or mmap holding VAST documents one after another
+    :param offset: of the byte to start searching from
+    :return: generator of (start, end, kind) of each span found after offset, in order, where kind is
+    DOCUMENT, UNTERMINATED for a document without its VAST end tag, ending where the next one starts,
+    or NOT_VAST for bytes between documents which are not whitespace
+    """
+    return _find_documents(buffer, offset, True)
+
+
+def _find_documents(buffer, offset, complete):
+    """
+    :param complete: False if more bytes may follow the buffer, see _document_end
+    :return: see find_documents
+    """
+    search_from = offset
+    while True:
+        match = _VAST_START.search(buffer, search_from)
+        if match is None:
+            start = len(buffer)
+        else:
+            start = buffer.rfind(_DECLARATION, search_from, match.start())
+            if start < 0:
+                start = match.start()
+
+        for span in _not_vast_spans(buffer, search_from, start):
+            yield span
+        if match is None:
+            return
+
+        end, kind = _document_end(buffer, match, complete)
+        yield start, end, kind
+        search_from = end
+
+
+def _not_vast_spans(buffer, start, end):
+    """
+    :return: generator of (start, end, NOT_VAST) of the bytes between start and end which are not whitespace,
+    split after the end tag of each root element, so that documents of another root are told apart
+    """
+    while True:
+        junk = _NOT_WHITESPACE.search(buffer, start, end)
+        if junk is None:
+            return
+        start = end
+        root = _ROOT_START.match(buffer, junk.start(), end)
+        if root is not None:
+            root_end = re.compile(rb"</%s\s*>" % re.escape(root.group(1))).search(buffer, root.end(), end)
+            if root_end is not None:
+                start = root_end.end()
+        yield junk.start(), start, NOT_VAST
+
+
+def _section_end(buffer, opening):
+    """
+    :param opening: match of the opening of a CDATA section or comment
+    :return: end of the section, or None if it is not closed.
+    A section holding another opening of its kind is not closed either, it is the truncated section
+    of a document not terminated, and the closing found is that of a section of a later document
+    """
+    closing = buffer.find(_SECTION_CLOSINGS[opening.group(2)], opening.end())
+    if closing < 0 or buffer.find(opening.group(2), opening.end(), closing) >= 0:
+        return None
+    return closing + len(_SECTION_CLOSINGS[opening.group(2)])
+
+
+def _document_end(buffer, match, complete):
+    """
+    :param match: of the VAST start tag of a document
+    :param complete: False if more bytes may follow the buffer.
+    A CDATA section or comment not closed within the buffer then runs to its end, and the document with it,
+    otherwise only its opening is skipped
+    :return: (end, kind) of the document
+    """
+    tag_end = buffer.find(b">", match.start())
+    if tag_end > 0 and buffer[tag_end - 1:tag_end] == b"/":
+        # an empty VAST element
+        return tag_end + 1, DOCUMENT
+
+    search_from = match.end()
+    while True:
+        boundary = _VAST_END_OR_NEXT.search(buffer, search_from)
+        if boundary is None:
+            return len(buffer), UNTERMINATED
+        if boundary.group(1) is not None:
+            return boundary.end(), DOCUMENT
+        if boundary.group(2) is None:
+            return boundary.start(), UNTERMINATED
+
+        search_from = _section_end(buffer, boundary)
+        if search_from is None:
+            if not complete and buffer.find(_SECTION_CLOSINGS[boundary.group(2)], boundary.end()) < 0:
+                # the section may be closed by the next bytes
+                return len(buffer), UNTERMINATED
+            search_from = boundary.end()
+
+
+@contextmanager
+def _mapped(path):
+    """
+    :return: context of the read only memory map of the archive at path, None if it is empty
+    :raises: ValueError if the archive is compressed
+    """
+    if compressed.format_of(path) is not None:
+        raise ValueError("compressed archives cannot be memory mapped, decompress '%s' first" % path)
+
+    with open(path, "rb") as fp:
+        if not os.fstat(fp.fileno()).st_size:
+            yield None
+            return
+        mapped = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        yield mapped
+    finally:
+        mapped.close()
+
+
+def span_error(start, end, kind):
+    """
+    :param kind: of a span which is not a DOCUMENT, see find_documents
+    :return: ParseError telling what the span at start to end is
+    """
+    if kind is UNTERMINATED:
+        return ParseError("VAST document at offset %s is not terminated" % start)
+    return ParseError("bytes at offset %s to %s are not a VAST document" % (start, end))
+
+
+def iter_documents(path, offset=0, **kwargs):
+    """
+    Parse the VAST documents of an archive one at a time.
+    A document which fails to parse does not stop the iteration, its error is yielded instead,
+    as is a ParseError for a document which is not terminated, and for bytes which are not a VAST document.
+    To resume after a crash, pass the offset of the last document handled, it is parsed again.
+
+    :param path: of the archive, which must not be compressed, nor modified while it is read
+    :param offset: to start reading from, e.g. the offset of a document yielded before
+    :param kwargs: pass on to xml_parser.from_xml_string, lazy models are not allowed
+    :return: generator of (offset, result) for each document, in file order,
+    where result is the Vast object, or the error raised by parsing the document
+    :raises: ValueError if lazy models are asked for, or the archive is compressed
+    """
+    if xml_parser._is_lazy(kwargs):
+        raise ValueError("lazy models cannot be read from an archive, they would hold its memory map")
+
+    with _mapped(path) as mapped:
+        if mapped is None:
+            return
+        with memoryview(mapped) as view:
+            for start, end, kind in find_documents(mapped, offset):
+                if kind is not DOCUMENT:
+                    yield start, span_error(start, end, kind)
+                    continue
+                with view[start:end] as document:
+                    try:
+                        result = xml_parser.from_xml_string(document, **kwargs)
+                    except xml_parser._DOCUMENT_ERRORS as e:
+                        result = e
+                yield start, result
+
+
+def iter_spans(path, offset=0):
+    """
+    Find the VAST documents of an archive without parsing them, e.g. to parse them in other processes
+
+    :param path: of the archive, which must not be compressed, nor modified while it is read
+    :param offset: to start reading from
+    :return: generator of (offset, kind, data) for each span, see find_documents,
+    where data is the bytes of the span, copied out of the memory map
+    :raises: ValueError if the archive is compressed
+    """
+    with _mapped(path) as mapped:
+        if mapped is None:
+            return
+        for start, end, kind in find_documents(mapped, offset):
+            yield start, kind, mapped[start:end]
+
+
+def split_documents(chunks):
+    """
+    Find the VAST documents of a stream as it is read, e.g. a decompressed archive,
+    without holding more than the pending document and the last chunk in memory
+
+    :param chunks: iterable of bytes, read one after another
+    :return: generator of (offset, kind, data) for each span, as iter_spans
+    """
+    buffer = bytearray()
+    buffer_offset = 0
+    chunks = iter(chunks)
+    done = False
+    while not done:
+        chunk = next(chunks, None)
+        done = chunk is None
+        buffer += chunk or b""
+        consumed = 0
+        for start, end, kind in _find_documents(buffer, 0, done):
+            if not done and end == len(buffer) and kind is not DOCUMENT:
+                # the span may go on in the next chunk
+                break
+            yield buffer_offset + start, kind, bytes(buffer[start:end])
+            consumed = end
+        del buffer[:consumed]
+        buffer_offset += consumed
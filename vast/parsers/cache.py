@@ -0,0 +1,53 @@
+"""
+Cache of parsed documents, keyed by a hash of the document content
+
+Many served documents are byte for byte identical,
+and since models are immutable, parsing such a document once is enough.
+"""
+import hashlib
+
+from vast.cache import LRU, BoundedCache
+
+
+class ParseCache(object):
+    """
+    Keeps Vast models parsed from documents, by the blake2b digest of the document.
+    Bounded by entries and by approximate size,
+    where the size of a model is taken as the size of the document it was parsed from.
+    """
+
+    def __init__(self, max_entries=4096, max_bytes=64 * 1024 * 1024, eviction=LRU):
+        """
+        :param max_entries: models kept at most
+        :param max_bytes: total size of the documents whose models are kept, None for no limit
+        :param eviction: vast.cache.LRU or vast.cache.FIFO
+        """
+        self.models = BoundedCache(max_entries, max_bytes=max_bytes, eviction=eviction)
+
+    @property
+    def stats(self):
+        """
+        :return: CacheStats with hits, misses and evictions
+        """
+        return self.models.stats
+
+    def get_or_parse(self, xml_input, parse, options=()):
+        """
+        :param xml_input: document as str or bytes like object
+        :param parse: function from xml_input to a Vast object, called on a miss
+        :param options: hashable parse options the model depends on, part of the key
+        :return: Vast object
+        """
+        data = xml_input
+        if not isinstance(data, (bytes, bytearray, memoryview)):
+            data = data.encode("utf-8")
+
+        key = (hashlib.blake2b(data, digest_size=16).digest(), options)
+        vast = self.models.get(key)
+        if vast is None:
+            vast = parse(xml_input)
+            self.models.put(key, vast, size=len(data))
+        return vast
+
+    def clear(self):
+        self.models.clear()
@@ -0,0 +1,94 @@
+"""
+Transparent decompression of VAST XML files
+
+A compressed file is decompressed as it is read, so the parser is fed the decompressed stream
+without the whole file being inflated in memory first.
+Its format is chosen by the extension of the file, or else by its leading magic bytes.
+gzip, bz2 and xz are read with the standard library, zstd with the optional zstandard package,
+install it with the 'zstd' extra. Other formats are added with register.
+"""
+import bz2
+import gzip
+import lzma
+import os
+
+import attr
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+
+@attr.s(frozen=True)
+class Format(object):
+    """
+    A compression format, and how to read files compressed with it
+    """
+    name = attr.ib()
+    extensions = attr.ib()
+    magic = attr.ib()
+    open = attr.ib()
+
+
+def _open_zstd(path):
+    if zstandard is None:
+        raise ImportError("reading zstd files requires zstandard, install vast with the 'zstd' extra")
+    return zstandard.open(path, "rb")
+
+
+# name -> Format, in the order their magic bytes are tried
+_FORMATS = {}
+
+
+def register(name, extensions, magic, open_decompressed):
+    """
+    Add a compression format, or replace the one of the same name
+
+    :param name: of the format, e.g. "gzip"
+    :param extensions: iterable of file extensions, with their leading dot, e.g. [".gz"]
+    :param magic: bytes every file of the format starts with
+    :param open_decompressed: function from a path to a binary file object reading its decompressed content
+    """
+    _FORMATS[name] = Format(
+        name=name,
+        extensions=frozenset(extension.lower() for extension in extensions),
+        magic=bytes(magic),
+        open=open_decompressed,
+    )
+
+
+register("gzip", [".gz", ".gzip"], b"\x1f\x8b", gzip.open)
+register("bz2", [".bz2"], b"BZh", bz2.open)
+register("xz", [".xz", ".lzma"], b"\xfd7zXZ\x00", lzma.open)
+register("zstd", [".zst", ".zstd"], b"\x28\xb5\x2f\xfd", _open_zstd)
+
+
+def format_of(path):
+    """
+    :param path: of a file, compressed or not
+    :return: Format of the file, by its extension or else by its magic bytes, None if it is not compressed
+    """
+    extension = os.path.splitext(path)[1].lower()
+    for fmt in _FORMATS.values():
+        if extension in fmt.extensions:
+            return fmt
+
+    with open(path, "rb") as fp:
+        head = fp.read(max(len(fmt.magic) for fmt in _FORMATS.values()))
+    for fmt in _FORMATS.values():
+        if head.startswith(fmt.magic):
+            return fmt
+    return None
+
+
+def open_xml(path):
+    """
+    :param path: of a VAST XML file, compressed or not
+    :return: binary file object reading the decompressed XML, to be closed by the caller
+    :raises: ImportError if the file is compressed with a format whose optional package is not installed
+    """
+    fmt = format_of(path)
+    if fmt is None:
+        return open(path, "rb")
+    return fmt.open(path)
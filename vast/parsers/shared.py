@@ -1,30 +1,58 @@
+import attr
+
+from vast.errors import ParseError
+
+
+@attr.s(frozen=True)
+class ParseOptions(object):
+    """
+    Options threaded through the parsing of a document
+    """
+    lazy_creatives = attr.ib(default=False)
+    validate = attr.ib(default=True)
+
+
 def accept_none(parse_func):
-    def parse(xml_dict):
+    def parse(xml_dict, *args):
         if xml_dict is None:
             return None
-        return parse_func(xml_dict)
+        return parse_func(xml_dict, *args)
 
     return parse
 
 
 def unicode_to_dict(parse_func):
-    def parse(xml_dict):
+    def parse(xml_dict, *args):
         try:
             from __builtin__ import basestring
         except ModuleNotFoundError:
             basestring = str
         if isinstance(xml_dict, basestring):
             xml_dict = {"#text": xml_dict}
-        return parse_func(xml_dict)
+        return parse_func(xml_dict, *args)
 
     return parse
 
 
 def accept_falsy(parse_func):
-    def parse(xml_dict):
+    def parse(xml_dict, *args):
         if not xml_dict:
             return None
-        return parse_func(xml_dict)
+        return parse_func(xml_dict, *args)
+
+    return parse
+
+
+def structure_errors_as_parse_error(parse_func):
+    """
+    Decorator of a walk of xml dicts, raising ParseError where an element does not hold what its model expects,
+    e.g. text or nothing where children are expected
+    """
+    def parse(xml_dict, *args, **kwargs):
+        try:
+            return parse_func(xml_dict, *args, **kwargs)
+        except (AttributeError, TypeError) as e:
+            raise ParseError("unexpected content of an element, %s" % e)
 
     return parse
 
@@ -35,11 +63,16 @@ def parse_duration(duration_str):
 
     :param duration_str: format of HH:MM:SS 
     :return: duration in seconds int
+    :raises: ParseError if duration_str is not formatted as HH:MM:SS
     """
-    h, m, s = list(map(int, duration_str.split(":")))
-    return h * 3600 + m * m * 60 + s
+    try:
+        h, m, s = list(map(int, duration_str.split(":")))
+    except (AttributeError, ValueError):
+        raise ParseError("duration must be formatted as HH:MM:SS but was '%s'" % duration_str)
+    return h * 3600 + m * 60 + s
 
 
+@accept_none
 def unparse_duration(duration_int):
     """
 
@@ -47,6 +80,6 @@ def unparse_duration(duration_int):
     :return: in format HH:MM:SS
     """
     d = duration_int
-    h, m, s = d / 3600, (d % 3600) / 60, (d % 3600) % 60
+    h, m, s = d // 3600, (d % 3600) // 60, (d % 3600) % 60
     return "%02d:%02d:%02d" % (h, m, s)
 
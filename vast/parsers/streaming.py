@@ -0,0 +1,1046 @@
+"""
+Streaming parser for VAST XML documents
+
+Drives expat events straight into the vast_v2 models.
+Each element is turned into its model as soon as it closes,
+so no intermediate dict tree of the whole document is ever built.
+Elements the models do not care about are skipped along with their subtree.
+
+With lazy_creatives, the events within a Creatives element are only recorded,
+and replayed into models once the creatives are accessed.
+
+extract goes further, and builds only the requested elements,
+skipping every subtree which cannot contain one of them.
+
+With lazy_text, the text of elements which may hold large payloads, such as AdParameters,
+is not collected from expat, but kept as a LazyText slice of the document, decoded when first read.
+
+PushParser is fed the document in chunks as they arrive, instead of reading it.
+"""
+import codecs
+import re
+from collections import deque
+from functools import lru_cache, partial
+from xml.parsers import expat
+
+from vast import instrumentation
+from vast.errors import ParseError
+from vast.models import vast_v2 as v2_models
+from vast.models.shared import LazySequence, LazyText
+from vast.parsers.shared import parse_duration
+
+DEFAULT_CHUNK_SIZE = 16 * 1024
+
+
+class _Frame(object):
+    """
+    An open element, collecting its text and already built children
+
+    If intern is given, the text is passed through it.
+    If the text was sliced out of the document, it is 'sliced_text' instead.
+    """
+    __slots__ = ("tag", "attrs", "text", "children", "intern", "is_sliced", "sliced_text")
+
+    def __init__(self, tag, attrs, intern=None):
+        self.tag = tag
+        self.attrs = attrs
+        self.text = []
+        self.children = {}
+        self.intern = intern
+        self.is_sliced = False
+        self.sliced_text = None
+
+    def set_sliced_text(self, text):
+        self.is_sliced = True
+        self.sliced_text = text
+
+    def get_text(self):
+        if self.is_sliced:
+            return self.sliced_text
+        text = "".join(self.text).strip() or None
+        if text is not None and self.intern is not None:
+            return self.intern(text)
+        return text
+
+    def add_child(self, tag, value):
+        if tag in _REPEATED:
+            self.children.setdefault(tag, []).append(value)
+        else:
+            self.children.setdefault(tag, value)
+
+
+# Elements that may appear more than once within their parent
+_REPEATED = frozenset((
+    "Ad", "Creative", "MediaFile", "Tracking", "Companion", "NonLinear",
+))
+
+
+def _build_text(frame, validate):
+    return frame.get_text()
+
+
+def _build_list_of(tag):
+    def build(frame, validate):
+        return frame.children.get(tag) or None
+
+    return build
+
+
+def _build_vast(frame, validate):
+    return v2_models.Vast.make(
+        version=frame.attrs.get("version"),
+        ads=frame.children.get("Ad"),
+        validate=validate,
+    )
+
+
+def _build_ad(frame, validate):
+    return v2_models.Ad.make(
+        id=frame.attrs.get("id"),
+        inline=frame.children.get("InLine"),
+        wrapper=frame.children.get("Wrapper"),
+        sequence=frame.attrs.get("sequence"),
+        validate=validate,
+    )
+
+
+def _build_wrapper(frame, validate):
+    children = frame.children
+    return v2_models.Wrapper.make(
+        ad_system=children.get("AdSystem"),
+        vast_ad_tag_uri=children.get("VASTAdTagURI"),
+        ad_title=children.get("AdTitle"),
+        impression=children.get("Impression"),
+        error=children.get("Error"),
+        creatives=children.get("Creatives"),
+        validate=validate,
+    )
+
+
+def _build_inline(frame, validate):
+    children = frame.children
+    return v2_models.Inline.make(
+        ad_system=children.get("AdSystem"),
+        ad_title=children.get("AdTitle"),
+        impression=children.get("Impression"),
+        creatives=children.get("Creatives"),
+        validate=validate,
+    )
+
+
+def _build_creative(frame, validate):
+    attrs = frame.attrs
+    children = frame.children
+    return v2_models.Creative.make(
+        linear=children.get("Linear"),
+        non_linear=children.get("NonLinearAds"),
+        companion=children.get("CompanionAds"),
+        id=attrs.get("id"),
+        sequence=attrs.get("sequence"),
+        ad_id=attrs.get("adId"),
+        api_framework=attrs.get("apiFramework"),
+        validate=validate,
+    )
+
+
+def _build_linear(frame, validate):
+    children = frame.children
+    return v2_models.Linear.make(
+        duration=parse_duration(children.get("Duration")),
+        media_files=children.get("MediaFiles"),
+        video_clicks=children.get("VideoClicks"),
+        ad_parameters=children.get("AdParameters"),
+        tracking_events=children.get("TrackingEvents"),
+        validate=validate,
+    )
+
+
+def _build_non_linear(frame, validate):
+    return v2_models.NonLinear.make(
+        non_linear_ads=frame.children.get("NonLinear"),
+        tracking_events=frame.children.get("TrackingEvents"),
+        validate=validate,
+    )
+
+
+def _build_non_linear_ad(frame, validate):
+    attrs = frame.attrs
+    children = frame.children
+    return v2_models.NonLinearAd.make(
+        width=attrs.get("width"),
+        height=attrs.get("height"),
+        expanded_width=attrs.get("expandedWidth"),
+        expanded_height=attrs.get("expandedHeight"),
+        scalable=attrs.get("scalable"),
+        maintain_aspect_ratio=attrs.get("maintainAspectRatio"),
+        min_suggested_duration=parse_duration(attrs.get("minSuggestedDuration")),
+        api_framework=attrs.get("apiFramework"),
+        id=attrs.get("id"),
+        static_resource=children.get("StaticResource"),
+        iframe_resource=children.get("IFrameResource"),
+        html_resource=children.get("HTMLResource"),
+        non_linear_click_through=children.get("NonLinearClickThrough"),
+        ad_parameters=children.get("AdParameters"),
+        validate=validate,
+    )
+
+
+def _build_static_resource(frame, validate):
+    return v2_models.StaticResource.make(
+        resource=frame.get_text(),
+        mime_type=frame.attrs.get("creativeType"),
+        validate=validate,
+    )
+
+
+def _build_uri_with_id(frame, validate):
+    return v2_models.UriWithId.make(
+        resource=frame.get_text(),
+        id=frame.attrs.get("id"),
+        validate=validate,
+    )
+
+
+def _build_companion(frame, validate):
+    return v2_models.Companion.make(frame.children.get("Companion"), validate=validate)
+
+
+def _build_companion_ad(frame, validate):
+    attrs = frame.attrs
+    children = frame.children
+    return v2_models.CompanionAd.make(
+        width=attrs.get("width"),
+        height=attrs.get("height"),
+        expanded_width=attrs.get("expandedWidth"),
+        expanded_height=attrs.get("expandedHeight"),
+        api_framework=attrs.get("apiFramework"),
+        id=attrs.get("id"),
+        static_resource=children.get("StaticResource"),
+        iframe_resource=children.get("IFrameResource"),
+        html_resource=children.get("HTMLResource"),
+        companion_click_through=children.get("CompanionClickThrough"),
+        ad_parameters=children.get("AdParameters"),
+        alt_text=children.get("AltText"),
+        tracking_events=children.get("TrackingEvents"),
+        validate=validate,
+    )
+
+
+def _build_video_clicks(frame, validate):
+    children = frame.children
+    return v2_models.VideoClicks.make(
+        click_through=children.get("ClickThrough"),
+        click_tracking=children.get("ClickTracking"),
+        custom_click=children.get("CustomClick"),
+        validate=validate,
+    )
+
+
+def _build_ad_parameters(frame, validate):
+    return v2_models.AdParameters.make(
+        data=frame.get_text(),
+        xml_encoded=frame.attrs.get("xmlEncoded"),
+        validate=validate,
+    )
+
+
+def _build_media_file(frame, validate):
+    attrs = frame.attrs
+    return v2_models.MediaFile.make(
+        asset=frame.get_text(),
+        delivery=attrs.get("delivery"),
+        type=attrs.get("type"),
+        width=attrs.get("width"),
+        height=attrs.get("height"),
+        codec=attrs.get("codec"),
+        id=attrs.get("id"),
+        bitrate=attrs.get("bitrate"),
+        min_bitrate=attrs.get("minBitrate"),
+        max_bitrate=attrs.get("maxBitrate"),
+        scalable=attrs.get("scalable"),
+        maintain_aspect_ratio=attrs.get("maintainAspectRatio"),
+        api_framework=attrs.get("apiFramework"),
+        validate=validate,
+    )
+
+
+def _build_tracking_event(frame, validate):
+    return v2_models.TrackingEvent.make(
+        tracking_event_uri=frame.get_text(),
+        tracking_event_type=frame.attrs.get("event"),
+        validate=validate,
+    )
+
+
+_TEXT = (_build_text, ())
+
+# tag -> (builder, child tags the builder reads)
+# Children which are not listed are skipped together with their subtree.
+_V2_ELEMENTS = {
+    "VAST": (_build_vast, ("Ad", )),
+    "Ad": (_build_ad, ("InLine", "Wrapper")),
+    "Wrapper": (
+        _build_wrapper,
+        ("AdSystem", "VASTAdTagURI", "AdTitle", "Impression", "Error", "Creatives"),
+    ),
+    "InLine": (_build_inline, ("AdSystem", "AdTitle", "Impression", "Creatives")),
+    "AdSystem": _TEXT,
+    "VASTAdTagURI": _TEXT,
+    "AdTitle": _TEXT,
+    "Impression": _TEXT,
+    "Error": _TEXT,
+    "Creatives": (_build_list_of("Creative"), ("Creative", )),
+    "Creative": (_build_creative, ("Linear", "NonLinearAds", "CompanionAds")),
+    "Linear": (
+        _build_linear,
+        ("Duration", "MediaFiles", "VideoClicks", "AdParameters", "TrackingEvents"),
+    ),
+    "Duration": _TEXT,
+    "MediaFiles": (_build_list_of("MediaFile"), ("MediaFile", )),
+    "MediaFile": (_build_media_file, ()),
+    "TrackingEvents": (_build_list_of("Tracking"), ("Tracking", )),
+    "Tracking": (_build_tracking_event, ()),
+    "VideoClicks": (_build_video_clicks, ("ClickThrough", "ClickTracking", "CustomClick")),
+    "ClickThrough": _TEXT,
+    "ClickTracking": _TEXT,
+    "CustomClick": _TEXT,
+    "AdParameters": (_build_ad_parameters, ()),
+    "NonLinearAds": (_build_non_linear, ("NonLinear", "TrackingEvents")),
+    "NonLinear": (
+        _build_non_linear_ad,
+        (
+            "StaticResource", "IFrameResource", "HTMLResource",
+            "NonLinearClickThrough", "AdParameters",
+        ),
+    ),
+    "StaticResource": (_build_static_resource, ()),
+    "IFrameResource": _TEXT,
+    "HTMLResource": _TEXT,
+    "NonLinearClickThrough": (_build_uri_with_id, ()),
+    "CompanionAds": (_build_companion, ("Companion", )),
+    "Companion": (
+        _build_companion_ad,
+        (
+            "StaticResource", "IFrameResource", "HTMLResource", "CompanionClickThrough",
+            "AdParameters", "AltText", "TrackingEvents",
+        ),
+    ),
+    "CompanionClickThrough": _TEXT,
+    "AltText": _TEXT,
+}
+
+_ELEMENTS = {
+    "2.0": _V2_ELEMENTS,
+}
+
+# field -> tag of the elements extract collects for it
+FIELDS = {
+    "impressions": "Impression",
+    "vast_ad_tag_uris": "VASTAdTagURI",
+    "creatives": "Creative",
+    "media_files": "MediaFile",
+    "tracking_events": "Tracking",
+    "video_clicks": "VideoClicks",
+    "ad_parameters": "AdParameters",
+    "non_linear_ads": "NonLinear",
+    "companion_ads": "Companion",
+}
+
+
+def _build_nothing(frame, validate):
+    return None
+
+
+@lru_cache(maxsize=None)
+def _projection(version, targets):
+    """
+    :param version: of the document
+    :param targets: frozenset of tags to build
+    :return: element table which builds the targets, along with their subtrees,
+    and only walks the elements on the way to them
+    """
+    elements = _ELEMENTS[version]
+
+    projection = {}
+    pending = list(targets)
+    while pending:
+        tag = pending.pop()
+        if tag not in projection:
+            projection[tag] = elements[tag]
+            pending.extend(elements[tag][1])
+
+    leading = set(targets)
+    grown = True
+    while grown:
+        grown = False
+        for tag, (_, children) in elements.items():
+            if tag not in leading and leading.intersection(children):
+                leading.add(tag)
+                grown = True
+
+    for tag, (_, children) in elements.items():
+        if tag not in projection and tag in leading:
+            projection[tag] = (_build_nothing, tuple(c for c in children if c in leading))
+
+    return projection
+
+
+# Elements whose text is sliced out of the document with lazy_text
+_SLICED_ELEMENTS = frozenset(("AdParameters", "HTMLResource"))
+
+# Sliced texts shorter than this are decoded right away, as keeping them lazy saves nothing
+LAZY_TEXT_MIN_BYTES = 1024
+
+_XML_WHITESPACE = frozenset(b" \t\r\n")
+_START_TAG = re.compile(rb"""[^>"']*(?:(?:"[^"]*"|'[^']*')[^>"']*)*>""")
+
+
+def _is_ascii_compatible(encoding):
+    try:
+        return codecs.lookup(encoding).encode("<>\"'")[0] == b"<>\"'"
+    except LookupError:
+        return False
+
+
+def _decode_text(content, encoding):
+    """
+    :param content: bytes like content of an element
+    :return: its stripped text, as it would be collected from expat
+    """
+    text = str(content, encoding)
+    if text.startswith("<![CDATA[") and text.endswith("]]>") and text.find("]]>", 9, len(text) - 3) < 0:
+        # a single CDATA section, as most large payloads are
+        text = text[9:-3]
+    elif "<" in text or "&" in text:
+        return _decode_markup(content, encoding)
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text.strip()
+
+
+def _decode_markup(content, encoding):
+    """
+    :param content: bytes like content of an element, which may hold markup and references
+    :return: the text directly within the element, as it would be collected from expat
+    """
+    texts = []
+    depth = []
+
+    def start(tag, attrs):
+        depth.append(tag)
+
+    def end(tag):
+        depth.pop()
+
+    def data(text):
+        if len(depth) == 1:
+            texts.append(text)
+
+    parser = expat.ParserCreate(encoding)
+    parser.buffer_text = True
+    parser.StartElementHandler = start
+    parser.EndElementHandler = end
+    parser.CharacterDataHandler = data
+    parser.EntityDeclHandler = _forbid_entities
+    parser.Parse(b"<text>", False)
+    parser.Parse(content, False)
+    parser.Parse(b"</text>", True)
+    return "".join(texts).strip()
+
+
+class _TextSlicer(object):
+    """
+    Cuts the text of elements out of the document they are parsed from, instead of collecting it from expat.
+
+    While an element is sliced, expat has no character data handler,
+    so it neither decodes nor copies the text of the element.
+    The document must not be modified while lazy texts sliced from it are not read yet.
+    """
+
+    def __init__(self, parser, document, encoding=None):
+        """
+        :param parser: expat parser of document
+        :param document: the whole document, as bytes like object
+        :param encoding: overriding the encoding declared by the document
+        """
+        self._parser = parser
+        self._document = memoryview(document)
+        self._encoding = encoding
+        self._sliceable = None
+        self._content_start = None
+        self._data = None
+        parser.XmlDeclHandler = self._xml_decl
+
+    def _xml_decl(self, version, encoding, standalone):
+        if self._encoding is None:
+            self._encoding = encoding
+
+    def close(self):
+        """
+        Drop the parser, which refers back to the slicer, once the document is parsed
+        """
+        self._parser = None
+
+    def start(self):
+        """
+        Start slicing the element whose start tag was just parsed
+
+        :return: False if the document cannot be sliced, the text is then collected as usual
+        """
+        if self._sliceable is None:
+            self._encoding = self._encoding or "utf-8"
+            utf_16 = self._document[:2] in (codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)
+            self._sliceable = not utf_16 and _is_ascii_compatible(self._encoding)
+        if not self._sliceable:
+            return False
+
+        parser = self._parser
+        self._content_start = _START_TAG.match(self._document, parser.CurrentByteIndex).end()
+        self._data = parser.CharacterDataHandler
+        parser.CharacterDataHandler = None
+        return True
+
+    def end(self):
+        """
+        Stop slicing the element whose end tag was just parsed
+
+        :return: its stripped text, as LazyText, as str if short, None if it has none
+        """
+        parser = self._parser
+        parser.CharacterDataHandler = self._data
+        document = self._document
+        start = self._content_start
+        end = parser.CurrentByteIndex
+        if document[start - 2] == ord("/"):
+            # an empty element tag
+            return None
+
+        while start < end and document[start] in _XML_WHITESPACE:
+            start += 1
+        while end > start and document[end - 1] in _XML_WHITESPACE:
+            end -= 1
+        if start == end:
+            return None
+
+        decode = partial(_decode_text, document[start:end], self._encoding)
+        if end - start < LAZY_TEXT_MIN_BYTES:
+            return decode() or None
+        return LazyText(decode)
+
+
+# Kinds of recorded events
+_START = 0
+_DATA = 1
+_END = 2
+_SLICED_TEXT = 3
+
+
+class _Handler(object):
+    """
+    Receives expat events and builds models as elements close
+
+    Elements with a tag in 'emit' are collected in 'emitted', as (tag, model), as soon as they close,
+    and the root is not built. They are not handed to their parent,
+    unless it is within another emitted element, which is built from them.
+    With project, only the emitted elements are built, see _projection.
+
+    With lazy_creatives, the events within Creatives elements are recorded instead,
+    and the Creatives element is built into a LazySequence replaying them.
+
+    With validate False, models are made without being checked, see vast_v2.
+    With an interner, every text and attribute value of a built element is interned.
+    With a slicer, the texts of _SLICED_ELEMENTS are sliced out of the document, and not interned.
+    """
+
+    def __init__(self, emit=(), lazy_creatives=False, project=False, validate=True, interner=None):
+        self.result = None
+        self.version = None
+        self.emitted = deque()
+        self._emit = frozenset(emit)
+        self._lazy_creatives = lazy_creatives
+        self._project = project
+        self._validate = validate
+        self._interner = interner
+        self._elements = None
+        self._stack = []
+        self._skip_depth = 0
+        self._emit_depth = 0
+        self._recorded = None
+        self._record_depth = 0
+        self._has_creative = False
+        self.slicer = None
+        self._slice_depth = 0
+        # tag -> tuple of functions called once an element with this tag is started
+        self._on_start = {}
+        for tag in self._emit:
+            self._add_on_start(tag, self._start_emitted)
+        if lazy_creatives:
+            self._add_on_start("Creatives", self._start_recording)
+        for tag in _SLICED_ELEMENTS:
+            self._add_on_start(tag, self._start_slicing)
+
+    def _add_on_start(self, tag, on_start):
+        self._on_start[tag] = self._on_start.get(tag, ()) + (on_start, )
+
+    def start(self, tag, attrs):
+        if self._slice_depth:
+            self._slice_depth += 1
+            return
+
+        if self._recorded is not None:
+            self._record_start(tag, attrs)
+            return
+
+        if self._skip_depth:
+            self._skip_depth += 1
+            return
+
+        if not self._stack:
+            self._start_root(tag, attrs)
+        elif tag not in self._elements[self._stack[-1].tag][1]:
+            self._skip_depth = 1
+            return
+
+        if self._interner is not None:
+            intern = self._interner
+            attrs = {name: intern(value) for name, value in attrs.items()}
+        self._stack.append(_Frame(tag, attrs, self._interner))
+        for on_start in self._on_start.get(tag, ()):
+            on_start(tag)
+
+    def _start_root(self, tag, attrs):
+        self._elements = _elements_for_root(tag, attrs)
+        self.version = attrs["version"]
+        if self._project:
+            self._elements = _projection(self.version, self._emit)
+
+    def _start_emitted(self, tag):
+        self._emit_depth += 1
+
+    def _start_recording(self, tag):
+        self._recorded = []
+        self._has_creative = False
+
+    def _record_start(self, tag, attrs):
+        if not self._record_depth and tag == "Creative":
+            self._has_creative = True
+        self._record_depth += 1
+        self._recorded.append((_START, tag, attrs))
+        if tag in _SLICED_ELEMENTS:
+            self._start_slicing(tag)
+
+    def close(self):
+        """
+        Called once the document is parsed
+        """
+        if self.slicer is not None:
+            self.slicer.close()
+            self.slicer = None
+
+    def _start_slicing(self, tag):
+        if self.slicer is not None and self.slicer.start():
+            self._slice_depth = 1
+
+    def data(self, text):
+        if self._recorded is not None:
+            self._recorded.append((_DATA, text))
+        elif not self._skip_depth:
+            self._stack[-1].text.append(text)
+
+    def sliced(self, text):
+        """
+        :param text: sliced text of the innermost open element
+        """
+        if self._recorded is not None:
+            self._recorded.append((_SLICED_TEXT, text))
+        elif not self._skip_depth:
+            self._stack[-1].set_sliced_text(text)
+
+    def end(self, tag):
+        if self._slice_depth:
+            self._slice_depth -= 1
+            if self._slice_depth:
+                return
+            self.sliced(self.slicer.end())
+
+        if self._recorded is not None:
+            if self._record_depth:
+                self._record_depth -= 1
+                self._recorded.append((_END, tag))
+                return
+            self._stack.pop()
+            self._stack[-1].add_child(tag, self._lazy_creatives_value())
+            self._recorded = None
+            return
+
+        if self._skip_depth:
+            self._skip_depth -= 1
+            return
+
+        frame = self._stack.pop()
+        if tag in self._emit:
+            value = self._elements[tag][0](frame, self._validate)
+            self.emitted.append((tag, value))
+            self._emit_depth -= 1
+            if self._emit_depth:
+                self._stack[-1].add_child(tag, value)
+        elif self._stack:
+            self._stack[-1].add_child(tag, self._elements[tag][0](frame, self._validate))
+        elif not self._emit:
+            self.result = self._elements[tag][0](frame, self._validate)
+
+    def _lazy_creatives_value(self):
+        """
+        :return: LazySequence of the recorded creatives, None if there are none, as eagerly built
+        """
+        if not self._has_creative:
+            return None
+        return LazySequence(_replay_creatives(self._elements, self._recorded, self._validate, self._interner))
+
+
+def _replay_creatives(elements, events, validate, interner):
+    """
+    :param elements: element table of the document
+    :param events: recorded within a Creatives element
+    :param validate: if False, models are not checked
+    :param interner: optional vast.cache.Interner of values
+    :return: generator of Creative objects, built as the events are replayed
+    """
+    handler = _Handler(emit=("Creative", ), validate=validate, interner=interner)
+    handler._elements = elements
+    handler._stack.append(_Frame("Creatives", {}))
+    emitted = handler.emitted
+    for event in events:
+        kind = event[0]
+        if kind == _START:
+            handler.start(event[1], event[2])
+        elif kind == _DATA:
+            handler.data(event[1])
+        elif kind == _SLICED_TEXT:
+            handler.sliced(event[1])
+        else:
+            handler.end(event[1])
+            while emitted:
+                yield emitted.popleft()[1]
+
+
+def _elements_for_root(tag, attrs):
+    if tag != "VAST":
+        raise ParseError("root must have VAST element")
+
+    version = attrs.get("version")
+    if not version:
+        raise ParseError("missing version attribute in vast element '%s'" % attrs)
+
+    elements = _ELEMENTS.get(version)
+    if elements is None:
+        raise ParseError("Cannot parse vast version %s" % version)
+
+    return elements
+
+
+def _forbid_entities(*args):
+    raise ParseError("entity declarations are not allowed")
+
+
+def _make_parser(handler, encoding=None, sliced_document=None):
+    """
+    :param sliced_document: the document as bytes like object, to slice texts out of, see _TextSlicer
+    """
+    parser = expat.ParserCreate(encoding)
+    parser.buffer_text = True
+    parser.StartElementHandler = handler.start
+    parser.EndElementHandler = handler.end
+    parser.CharacterDataHandler = handler.data
+    parser.EntityDeclHandler = _forbid_entities
+    if sliced_document is not None:
+        # the slicer and the parser refer to each other, until the handler is closed
+        handler.slicer = _TextSlicer(parser, sliced_document, encoding)
+    return parser
+
+
+def _sliceable(xml_input, lazy_text):
+    """
+    :return: xml_input if its texts are to be sliced out of it, None otherwise
+    """
+    if lazy_text and not hasattr(xml_input, "read"):
+        return xml_input
+    return None
+
+
+def _iter_chunks(xml_input, chunk_size):
+    if hasattr(xml_input, "read"):
+        while True:
+            chunk = xml_input.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+    else:
+        view = memoryview(xml_input)
+        for start in range(0, len(view), chunk_size):
+            yield view[start:start + chunk_size]
+
+
+def _to_bytes(xml_input, encoding):
+    """
+    :return: xml_input encoded, unless it is already a bytes like or file like object, and the encoding to parse with
+    """
+    if isinstance(xml_input, (bytes, bytearray, memoryview)) or hasattr(xml_input, "read"):
+        return xml_input, encoding
+    encoding = encoding or "utf-8"
+    return xml_input.encode(encoding), encoding
+
+
+@instrumentation.timed(instrumentation.STREAMING_PARSE)
+def parse(
+        xml_input, encoding=None, lazy_ads=False, lazy_creatives=False,
+        chunk_size=DEFAULT_CHUNK_SIZE, validate=True, interner=None, lazy_text=False,
+):
+    """
+    Parse a VAST document without building an intermediate dict tree
+
+    :param xml_input: as str, bytes like (bytes, bytearray or memoryview) or file like object.
+    A bytes like object is parsed in place, without being copied
+    :param encoding: overrides the encoding declared by the document
+    :param lazy_ads: if True, the ads of the returned Vast are parsed only when consumed.
+    See parse_lazily
+    :param lazy_creatives: if True, the creatives of every ad are a LazySequence,
+    each Creative is built, and validated, only when it is first accessed
+    :param chunk_size: bytes fed to the parser at a time when lazy_ads is True
+    :param validate: if False, values are only converted to their types, models are not checked
+    :param interner: optional vast.cache.Interner, de-duplicating values across documents
+    :param lazy_text: if True, and xml_input is not a file like object,
+    the texts of AdParameters and HTMLResource elements are kept as LazyText slices of xml_input,
+    decoded only when first read. xml_input must not be modified until they are read
+    :return: parsed Vast object
+    """
+    if lazy_ads:
+        return parse_lazily(xml_input, encoding, chunk_size, lazy_creatives, validate, interner, lazy_text)
+
+    xml_input, encoding = _to_bytes(xml_input, encoding)
+    handler = _Handler(lazy_creatives=lazy_creatives, validate=validate, interner=interner)
+    parser = _make_parser(handler, encoding, _sliceable(xml_input, lazy_text))
+    if hasattr(xml_input, "read"):
+        parser.ParseFile(xml_input)
+    else:
+        try:
+            parser.Parse(xml_input, True)
+        finally:
+            handler.close()
+
+    return handler.result
+
+
+def iter_ads(xml_input, encoding=None, chunk_size=DEFAULT_CHUNK_SIZE, validate=True, interner=None):
+    """
+    Parse the ads of a VAST document one at a time.
+    Each Ad is yielded as soon as its closing tag has been parsed,
+    so the first ads of a large pod can be used before the rest is parsed.
+
+    :param xml_input: as str, bytes like or file like object
+    :param encoding: overrides the encoding declared by the document
+    :param chunk_size: bytes fed to the parser at a time
+    :param validate: if False, values are only converted to their types, models are not checked
+    :param interner: optional vast.cache.Interner, de-duplicating values across documents
+    :return: generator of Ad objects, in document order
+    """
+    return _iter_ads(xml_input, encoding, chunk_size, False, validate, interner, False)[1]
+
+
+def _iter_ads(xml_input, encoding, chunk_size, lazy_creatives, validate, interner, lazy_text):
+    """
+    :return: the handler, and a generator of the ads it parses
+    """
+    xml_input, encoding = _to_bytes(xml_input, encoding)
+    handler = _Handler(emit=("Ad", ), lazy_creatives=lazy_creatives, validate=validate, interner=interner)
+    parser = _make_parser(handler, encoding, _sliceable(xml_input, lazy_text))
+
+    def generate():
+        emitted = handler.emitted
+        try:
+            for chunk in _iter_chunks(xml_input, chunk_size):
+                with instrumentation.stage(instrumentation.STREAMING_ITER_ADS):
+                    parser.Parse(chunk, False)
+                while emitted:
+                    yield emitted.popleft()[1]
+            with instrumentation.stage(instrumentation.STREAMING_ITER_ADS):
+                parser.Parse(b"", True)
+        finally:
+            handler.close()
+        while emitted:
+            yield emitted.popleft()[1]
+
+    return handler, generate()
+
+
+def parse_lazily(
+        xml_input, encoding=None, chunk_size=DEFAULT_CHUNK_SIZE, lazy_creatives=False, validate=True,
+        interner=None, lazy_text=False,
+):
+    """
+    Parse a VAST document up to its first ad.
+    The remaining ads are parsed as they are consumed from the 'ads' of the returned Vast.
+    A file like xml_input must be kept open until all needed ads are consumed.
+
+    :param xml_input: as str, bytes like or file like object
+    :param encoding: overrides the encoding declared by the document
+    :param chunk_size: bytes fed to the parser at a time
+    :param lazy_creatives: if True, the creatives of every ad are a LazySequence too
+    :param validate: if False, values are only converted to their types, models are not checked
+    :param interner: optional vast.cache.Interner, de-duplicating values across documents
+    :param lazy_text: if True, large texts are kept as LazyText, see parse
+    :return: Vast object, whose ads are a LazySequence
+    """
+    handler, ads = _iter_ads(xml_input, encoding, chunk_size, lazy_creatives, validate, interner, lazy_text)
+    ads = LazySequence(ads)
+    # pulling the first ad parses the root element, and with it the version
+    ad = ads[0] if ads else None
+    return v2_models.Vast.make(version=handler.version, ad=ad, ads=ads, validate=validate)
+
+
+class _PushHandler(_Handler):
+    """
+    Emits ads, and remembers what was seen so far of the ad being parsed, see PushParser
+    """
+
+    def __init__(self, lazy_creatives, validate, interner):
+        super(_PushHandler, self).__init__(
+            emit=("Ad", ), lazy_creatives=lazy_creatives, validate=validate, interner=interner,
+        )
+        self.ad_id = None
+        self.ad_type = None
+        self.vast_ad_tag_uri = None
+        self.ads = []
+
+    def start(self, tag, attrs):
+        super(_PushHandler, self).start(tag, attrs)
+        if self._skip_depth:
+            return
+        depth = len(self._stack)
+        if depth == 2 and tag == "Ad":
+            self.ad_id = self._stack[-1].attrs.get("id")
+            self.ad_type = None
+            self.vast_ad_tag_uri = None
+        elif depth == 3 and tag in ("Wrapper", "InLine"):
+            self.ad_type = tag
+
+    def end(self, tag):
+        stack = self._stack
+        if tag == "VASTAdTagURI" and len(stack) == 4 and not self._skip_depth and stack[-1].tag == tag:
+            self.vast_ad_tag_uri = stack[-1].get_text()
+        super(_PushHandler, self).end(tag)
+        emitted = self.emitted
+        while emitted:
+            self.ads.append(emitted.popleft()[1])
+
+
+class PushParser(object):
+    """
+    Parse a VAST document fed in chunks, as they arrive e.g. from the network,
+    instead of only once the whole document was received.
+
+    The version of the document, and the id and type ("Wrapper" or "InLine") of the ad being parsed,
+    are set as soon as they were fed, and so is the VASTAdTagURI of a wrapper,
+    so the wrapped document can be fetched before the rest of this one arrives.
+    Each Ad is appended to 'ads' as soon as its closing tag was fed.
+    """
+
+    def __init__(self, encoding=None, lazy_creatives=False, validate=True, interner=None):
+        """
+        :param encoding: overrides the encoding declared by the document
+        :param lazy_creatives: if True, the creatives of every ad are a LazySequence, see parse
+        :param validate: if False, values are only converted to their types, models are not checked
+        :param interner: optional vast.cache.Interner, de-duplicating values across documents
+        """
+        self._validate = validate
+        self._handler = _PushHandler(lazy_creatives, validate, interner)
+        self._parser = _make_parser(self._handler, encoding)
+
+    @property
+    def version(self):
+        """
+        :return: version attribute of the VAST element, None until it was fed
+        """
+        return self._handler.version
+
+    @property
+    def ad_id(self):
+        """
+        :return: id of the ad being parsed, or last parsed, None until an Ad element was fed
+        """
+        return self._handler.ad_id
+
+    @property
+    def ad_type(self):
+        """
+        :return: "Wrapper" or "InLine" for the ad being parsed, None until its element was fed
+        """
+        return self._handler.ad_type
+
+    @property
+    def vast_ad_tag_uri(self):
+        """
+        :return: VASTAdTagURI of the ad being parsed, None until its closing tag was fed
+        """
+        return self._handler.vast_ad_tag_uri
+
+    @property
+    def ads(self):
+        """
+        :return: list of the Ad objects parsed so far, in document order
+        """
+        return self._handler.ads
+
+    def feed(self, data):
+        """
+        :param data: next chunk of the document, as bytes like object or str
+        :raises: ParseError or IllegalModelStateError if the chunk completes an illegal element,
+        ExpatError if it is not well formed
+        """
+        with instrumentation.stage(instrumentation.STREAMING_PUSH):
+            self._parser.Parse(data, False)
+
+    def close(self):
+        """
+        Parse the end of the document, once every chunk was fed
+
+        :return: parsed Vast object
+        :raises: ExpatError if the document is incomplete
+        """
+        with instrumentation.stage(instrumentation.STREAMING_PUSH):
+            self._parser.Parse(b"", True)
+            return v2_models.Vast.make(version=self.version, ads=self.ads or None, validate=self._validate)
+
+
+@instrumentation.timed(instrumentation.STREAMING_EXTRACT)
+def extract(xml_input, fields, encoding=None, interner=None):
+    """
+    Parse only the requested elements of a VAST document.
+    Subtrees which cannot contain a requested element are skipped unparsed,
+    and the elements leading to the requested ones are walked but not built, nor validated.
+    Each requested element is built, and validated, by its model as usual.
+
+    :param xml_input: as str, bytes like or file like object
+    :param fields: iterable of keys of FIELDS, e.g. ["media_files", "tracking_events"]
+    :param encoding: overrides the encoding declared by the document
+    :param interner: optional vast.cache.Interner, de-duplicating values across documents
+    :return: dict from each requested field to the list of its models, in document order
+    :raises: ValueError for unknown fields
+    """
+    fields = tuple(fields)
+    unknown = [field for field in fields if field not in FIELDS]
+    if unknown:
+        raise ValueError("unknown fields %s, known are %s" % (unknown, sorted(FIELDS)))
+
+    xml_input, encoding = _to_bytes(xml_input, encoding)
+    handler = _Handler(emit=[FIELDS[field] for field in fields], project=True, interner=interner)
+    parser = _make_parser(handler, encoding)
+    if hasattr(xml_input, "read"):
+        parser.ParseFile(xml_input)
+    else:
+        parser.Parse(xml_input, True)
+
+    by_tag = {FIELDS[field]: [] for field in fields}
+    for tag, value in handler.emitted:
+        by_tag[tag].append(value)
+    return {field: by_tag[FIELDS[field]] for field in fields}
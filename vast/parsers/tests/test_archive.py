@@ -0,0 +1,187 @@
+import gzip
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+from xml.parsers.expat import ExpatError
+
+from vast import resources
+from vast.errors import IllegalModelStateError, ParseError
+from vast.parsers import archive, xml_parser
+
+
+_RESOURCES = (
+    resources.SIMPLE_WRAPPER_XML,
+    resources.AD_POD_XML,
+    resources.INLINE_WITH_AD_PARAMETERS,
+)
+
+_INVALID = b'<VAST version="2.0"><Ad id="1"><InLine></InLine></Ad></VAST>'
+_MALFORMED = b'<VAST version="2.0"><Ad></VAST>'
+
+
+class TestArchive(TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.documents = []
+        for path in _RESOURCES:
+            with open(path, "rb") as fp:
+                self.documents.append(fp.read())
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def _write(self, documents, name="archive.xml"):
+        """
+        :return: path of the archive, and the offset of each document
+        """
+        path = os.path.join(self.directory, name)
+        offsets = []
+        with open(path, "wb") as fp:
+            for document in documents:
+                fp.write(b"\n")
+                offsets.append(fp.tell())
+                fp.write(document)
+        return path, offsets
+
+    def test_documents_and_offsets(self):
+        path, offsets = self._write(self.documents)
+        read = list(archive.iter_documents(path, backend=xml_parser.STREAMING))
+
+        self.assertEqual([offset for offset, _ in read], offsets)
+        for (_, vast), document in zip(read, self.documents):
+            self.assertEqual(vast, xml_parser.from_xml_string(document, backend=xml_parser.STREAMING))
+
+    def test_errors_do_not_stop_the_archive(self):
+        path, offsets = self._write([self.documents[0], _INVALID, _MALFORMED, self.documents[1]])
+        results = [result for _, result in archive.iter_documents(path)]
+
+        self.assertEqual(results[0], xml_parser.from_xml_string(self.documents[0]))
+        self.assertIsInstance(results[1], IllegalModelStateError)
+        self.assertIsInstance(results[2], ExpatError)
+        self.assertEqual(results[3], xml_parser.from_xml_string(self.documents[1]))
+
+    def test_malformed_duration_does_not_stop_the_archive(self):
+        malformed = self.documents[2].replace(b"<Duration>", b"<Duration>abc")
+        path, offsets = self._write([self.documents[0], malformed, self.documents[1]])
+        results = [result for _, result in archive.iter_documents(path)]
+
+        self.assertEqual(results[0], xml_parser.from_xml_string(self.documents[0]))
+        self.assertIsInstance(results[1], ParseError)
+        self.assertEqual(results[2], xml_parser.from_xml_string(self.documents[1]))
+
+    def test_embedded_xml_is_not_a_document_boundary(self):
+        embedded = self.documents[2].replace(
+            b"{data : funky data goes here}",
+            b'<?xml version="1.0"?><vast version="2.0"><VAST version="2.0"></VAST></vast>',
+        ).replace(b"</AdParameters>", b"</AdParameters><!-- <?xml version='1.0'?><VAST> -->")
+        path, offsets = self._write([self.documents[0], embedded, self.documents[1]])
+        read = list(archive.iter_documents(path))
+
+        self.assertEqual([offset for offset, _ in read], offsets)
+        self.assertEqual(read[1][1], xml_parser.from_xml_string(embedded))
+        self.assertIn(b"<vast version", read[1][1].ad.inline.creatives[0].linear.ad_parameters.data.encode())
+
+        buffer = b"\n".join([embedded.strip(), self.documents[1].strip()])
+        second = len(embedded.strip()) + 1
+        self.assertEqual(
+            list(archive.find_documents(buffer)),
+            [(0, second - 1, archive.DOCUMENT), (second, len(buffer), archive.DOCUMENT)],
+        )
+        for size in (1, 13, len(buffer)):
+            chunks = (buffer[i:i + size] for i in range(0, len(buffer), size))
+            spans = [(start, kind) for start, kind, _ in archive.split_documents(chunks)]
+            self.assertEqual(spans, [(0, archive.DOCUMENT), (second, archive.DOCUMENT)], size)
+
+    def test_unclosed_cdata_is_only_skipped(self):
+        buffer = b'<VAST version="2.0"><![CDATA[ <VAST version="2.0"></VAST>'
+        self.assertEqual(
+            list(archive.find_documents(buffer)),
+            [(0, 30, archive.UNTERMINATED), (30, 57, archive.DOCUMENT)],
+        )
+
+        truncated = self.documents[2][:self.documents[2].index(b"funky")]
+        buffer = truncated + self.documents[2]
+        self.assertEqual(
+            list(archive.find_documents(buffer)),
+            [(0, len(truncated), archive.UNTERMINATED), (len(truncated), len(buffer), archive.DOCUMENT)],
+        )
+        chunks = (buffer[i:i + 13] for i in range(0, len(buffer), 13))
+        self.assertEqual(
+            [(start, kind) for start, kind, _ in archive.split_documents(chunks)],
+            [(0, archive.UNTERMINATED), (len(truncated), archive.DOCUMENT)],
+        )
+
+    def test_resume_from_offset(self):
+        path, offsets = self._write(self.documents)
+        read = list(archive.iter_documents(path, offset=offsets[1]))
+        self.assertEqual([offset for offset, _ in read], offsets[1:])
+
+    def test_unterminated_last_document(self):
+        path, offsets = self._write([self.documents[0], self.documents[1][:200]])
+        read = list(archive.iter_documents(path))
+        self.assertEqual([offset for offset, _ in read], offsets)
+        self.assertIsInstance(read[1][1], ParseError)
+
+    def test_unterminated_document_ends_at_the_next_one(self):
+        documents = [self.documents[0], self.documents[1][:200], self.documents[2], self.documents[1][:100]]
+        path, offsets = self._write(documents)
+        read = list(archive.iter_documents(path))
+
+        self.assertEqual([offset for offset, _ in read], offsets)
+        self.assertEqual(read[0][1], xml_parser.from_xml_string(self.documents[0]))
+        self.assertIsInstance(read[1][1], ParseError)
+        self.assertEqual(read[2][1], xml_parser.from_xml_string(self.documents[2]))
+        self.assertIsInstance(read[3][1], ParseError)
+
+    def test_not_vast_between_documents(self):
+        not_vast = b'<Vast version="2.0"></Vast>'
+        documents = [self.documents[0], not_vast, not_vast, self.documents[1][:200], not_vast, self.documents[2]]
+        path, offsets = self._write(documents)
+        read = list(archive.iter_documents(path))
+
+        self.assertEqual([offset for offset, _ in read], offsets)
+        for _, result in read[1:5]:
+            self.assertIsInstance(result, ParseError)
+        self.assertEqual(read[5][1], xml_parser.from_xml_string(self.documents[2]))
+
+    def test_find_documents(self):
+        buffer = b'junk<VAST version="2.0"/>\n<?xml version="1.0"?><VAST version="2.0"></VAST ><VASTAGE/> \n'
+        self.assertEqual(
+            list(archive.find_documents(buffer)),
+            [(0, 4, archive.NOT_VAST), (4, 25, archive.DOCUMENT), (26, 75, archive.DOCUMENT), (75, 87, archive.NOT_VAST)],
+        )
+        self.assertEqual(
+            list(archive.find_documents(b'<VAST version="2.0"><Ad> <VAST version="2.0"></VAST>')),
+            [(0, 25, archive.UNTERMINATED), (25, 52, archive.DOCUMENT)],
+        )
+
+    def test_split_documents_as_read(self):
+        buffer = b"\n".join([self.documents[0], b"<Vast></Vast>", self.documents[1][:300], self.documents[2]])
+        expected = [
+            (start, kind, buffer[start:end]) for start, end, kind in archive.find_documents(buffer)
+        ]
+        for size in (1, 7, 100, len(buffer)):
+            chunks = (buffer[i:i + size] for i in range(0, len(buffer), size))
+            self.assertEqual(list(archive.split_documents(chunks)), expected, size)
+
+    def test_iter_spans(self):
+        path, offsets = self._write(self.documents)
+        spans = list(archive.iter_spans(path))
+        self.assertEqual(spans, [(offset, archive.DOCUMENT, d.strip()) for offset, d in zip(offsets, self.documents)])
+
+    def test_empty_archive(self):
+        path, _ = self._write([])
+        self.assertEqual(list(archive.iter_documents(path)), [])
+
+    def test_lazy_models_are_not_allowed(self):
+        path, _ = self._write(self.documents)
+        with self.assertRaises(ValueError):
+            next(archive.iter_documents(path, backend=xml_parser.STREAMING, lazy_ads=True))
+
+    def test_compressed_archive(self):
+        path = os.path.join(self.directory, "archive.xml.gz")
+        with open(path, "wb") as fp:
+            fp.write(gzip.compress(self.documents[0]))
+        with self.assertRaises(ValueError):
+            next(archive.iter_documents(path))
@@ -0,0 +1,73 @@
+import bz2
+import gzip
+import io
+import lzma
+import os
+import shutil
+import tempfile
+from unittest import TestCase, skipIf
+
+from vast import resources
+from vast.parsers import compressed, xml_parser
+
+
+_COMPRESS = {
+    "gzip": gzip.compress,
+    "bz2": bz2.compress,
+    "xz": lzma.compress,
+}
+
+
+class TestCompressedFiles(TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        with open(resources.AD_POD_XML, "rb") as fp:
+            self.xml_bytes = fp.read()
+        self.expected = xml_parser.from_xml_file(resources.AD_POD_XML, backend=xml_parser.STREAMING)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def _write(self, name, content):
+        path = os.path.join(self.directory, name)
+        with open(path, "wb") as fp:
+            fp.write(content)
+        return path
+
+    def test_by_extension(self):
+        for name, extension in (("gzip", ".gz"), ("bz2", ".bz2"), ("xz", ".xz")):
+            path = self._write("ad_pod.xml" + extension, _COMPRESS[name](self.xml_bytes))
+            self.assertEqual(compressed.format_of(path).name, name)
+            for backend in (xml_parser.XMLTODICT, xml_parser.STREAMING):
+                self.assertEqual(xml_parser.from_xml_file(path, backend=backend), self.expected, path)
+
+    def test_by_magic_bytes(self):
+        for name, compress in _COMPRESS.items():
+            path = self._write("ad_pod_%s.xml" % name, compress(self.xml_bytes))
+            self.assertEqual(compressed.format_of(path).name, name)
+            self.assertEqual(xml_parser.from_xml_file(path, backend=xml_parser.STREAMING), self.expected, path)
+
+    def test_uncompressed(self):
+        self.assertIsNone(compressed.format_of(resources.AD_POD_XML))
+
+    def test_lazy_ads_from_compressed_file(self):
+        path = self._write("ad_pod.xml.gz", gzip.compress(self.xml_bytes))
+        vast = xml_parser.from_xml_file(path, backend=xml_parser.STREAMING, lazy_ads=True)
+        self.assertEqual(vast, self.expected)
+
+    def test_registered_format(self):
+        def open_reversed(path):
+            with open(path, "rb") as fp:
+                return io.BytesIO(fp.read()[len(b"REV!"):][::-1])
+
+        compressed.register("reversed", [".rev"], b"REV!", open_reversed)
+        self.addCleanup(compressed._FORMATS.pop, "reversed")
+
+        path = self._write("ad_pod.rev", b"REV!" + self.xml_bytes[::-1])
+        self.assertEqual(xml_parser.from_xml_file(path, backend=xml_parser.STREAMING), self.expected)
+
+    @skipIf(compressed.zstandard is not None, "zstandard is installed")
+    def test_zstd_requires_zstandard(self):
+        path = self._write("ad_pod.xml.zst", b"\x28\xb5\x2f\xfd")
+        with self.assertRaises(ImportError):
+            xml_parser.from_xml_file(path)
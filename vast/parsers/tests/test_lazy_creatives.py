@@ -0,0 +1,94 @@
+from unittest import TestCase
+
+from vast import resources
+from vast.errors import IllegalModelStateError
+from vast.models.shared import LazySequence
+from vast.parsers import xml_parser
+from vast.parsers.tests.test_streaming import _RESOURCES
+
+_BACKENDS = (xml_parser.XMLTODICT, xml_parser.STREAMING)
+
+_INVALID_CREATIVE_XML = """
+<VAST version="2.0">
+    <Ad id="1">
+        <InLine>
+            <AdSystem>MagU</AdSystem>
+            <AdTitle>Bad creative</AdTitle>
+            <Impression>https://mag.dom.com/imp</Impression>
+            <Creatives>
+                <Creative id="good_before">
+                    <Linear>
+                        <Duration>00:00:15</Duration>
+                        <MediaFiles>
+                            <MediaFile delivery="progressive" type="video/mp4" width="720" height="420">https://mag.dom.com/a.mp4</MediaFile>
+                        </MediaFiles>
+                    </Linear>
+                </Creative>
+                <Creative id="bad">
+                    <Linear>
+                        <MediaFiles>
+                            <MediaFile delivery="progressive" type="video/mp4" width="720" height="420">https://mag.dom.com/a.mp4</MediaFile>
+                        </MediaFiles>
+                    </Linear>
+                </Creative>
+                <Creative id="good_after">
+                    <Linear>
+                        <Duration>00:00:15</Duration>
+                        <MediaFiles>
+                            <MediaFile delivery="progressive" type="video/mp4" width="720" height="420">https://mag.dom.com/a.mp4</MediaFile>
+                        </MediaFiles>
+                    </Linear>
+                </Creative>
+            </Creatives>
+        </InLine>
+    </Ad>
+</VAST>
+"""
+
+
+class TestLazyCreatives(TestCase):
+    def test_same_models_as_eager(self):
+        for path in _RESOURCES:
+            with open(path, "rb") as fp:
+                xml_bytes = fp.read()
+            expected = xml_parser.from_xml_string(xml_bytes)
+            for backend in _BACKENDS:
+                actual = xml_parser.from_xml_string(xml_bytes, backend=backend, lazy_creatives=True)
+                self.assertEqual(actual, expected, (path, backend))
+
+    def test_creatives_are_parsed_on_access(self):
+        for backend in _BACKENDS:
+            vast = xml_parser.from_xml_file(
+                resources.INLINE_MULTI_FILES_XML, backend=backend, lazy_creatives=True,
+            )
+            creatives = vast.ad.inline.creatives
+            self.assertIsInstance(creatives, LazySequence)
+            self.assertEqual(creatives.pulled, 0)
+            self.assertEqual(len(creatives[0].linear.media_files), 7)
+            self.assertEqual(creatives.pulled, 1)
+
+    def test_invalid_creative_raises_on_access(self):
+        for backend in _BACKENDS:
+            vast = xml_parser.from_xml_string(_INVALID_CREATIVE_XML, backend=backend, lazy_creatives=True)
+            self.assertEqual(vast.ad.inline.ad_title, "Bad creative")
+            creatives = vast.ad.inline.creatives
+            self.assertEqual(creatives[0].id, "good_before")
+            # the bad creative keeps raising and never hides the creatives after it
+            for index in (1, 1, 2):
+                with self.assertRaises(IllegalModelStateError):
+                    creatives[index]
+            with self.assertRaises(IllegalModelStateError):
+                len(creatives)
+            self.assertEqual(creatives.pulled, 1)
+
+    def test_with_lazy_ads(self):
+        expected = xml_parser.from_xml_file(resources.AD_POD_XML)
+        actual = xml_parser.from_xml_file(
+            resources.AD_POD_XML, backend=xml_parser.STREAMING, lazy_ads=True, lazy_creatives=True,
+        )
+        self.assertEqual(actual, expected)
+
+    def test_cannot_be_cached(self):
+        from vast.parsers.cache import ParseCache
+        with self.assertRaises(ValueError):
+            xml_parser.from_xml_string(_INVALID_CREATIVE_XML, cache=ParseCache(), lazy_creatives=True)
@@ -0,0 +1,160 @@
+import json
+import pickle
+from unittest import TestCase
+
+from vast.models.shared import LazyText, stored_value
+from vast.parsers import streaming, xml_parser
+from vast.parsers.tests.test_streaming import _RESOURCES
+from vast.serializers import binary, xml_serializer
+
+_PAYLOAD = '{"clickUrl": "https://mag.dom.com/click?a=1&b=2", "items": [%s]}' % ", ".join(
+    '"https://mag.dom.com/item/%d.js"' % i for i in range(100)
+)
+
+_VPAID_XML = """<?xml version="1.0" encoding="{encoding}"?>
+<VAST version="2.0">
+    <Ad id="1">
+        <InLine>
+            <AdSystem>MagU</AdSystem>
+            <AdTitle>Interactive é</AdTitle>
+            <Impression>https://mag.dom.com/imp</Impression>
+            <Creatives>
+                <Creative>
+                    <Linear>
+                        <Duration>00:00:30</Duration>
+                        <AdParameters xmlEncoded="false">
+                            {ad_parameters}
+                        </AdParameters>
+                        <MediaFiles>
+                            <MediaFile delivery="progressive" type="application/javascript"
+                                       width="640" height="360" apiFramework="VPAID">https://mag.dom.com/vpaid.js</MediaFile>
+                        </MediaFiles>
+                    </Linear>
+                </Creative>
+            </Creatives>
+        </InLine>
+    </Ad>
+</VAST>
+"""
+
+_AD_PARAMETERS = {
+    "cdata": "<![CDATA[%s]]>" % _PAYLOAD,
+    "escaped": _PAYLOAD.replace("&", "&amp;").replace('"', "&quot;"),
+    "several sections": "<![CDATA[%s]]> &amp; <![CDATA[]]]]><![CDATA[>]]>" % _PAYLOAD,
+    "line ends": "<![CDATA[%s\r\n%s]]>" % (_PAYLOAD, _PAYLOAD),
+    "short": "<![CDATA[{}]]>",
+}
+
+
+def _vpaid(ad_parameters, encoding="UTF-8"):
+    xml_string = _VPAID_XML.format(encoding=encoding, ad_parameters=ad_parameters)
+    return xml_string.encode(encoding)
+
+
+def _parse_lazily(xml_input, **kwargs):
+    return xml_parser.from_xml_string(xml_input, backend=xml_parser.STREAMING, lazy_text=True, **kwargs)
+
+
+def _ad_parameters(vast):
+    return vast.ad.inline.creatives[0].linear.ad_parameters
+
+
+class TestLazyText(TestCase):
+    def test_same_models_as_eager(self):
+        for path in _RESOURCES:
+            with open(path, "rb") as fp:
+                xml_bytes = fp.read()
+            expected = xml_parser.from_xml_string(xml_bytes)
+            actual = xml_parser.from_xml_string(xml_bytes, backend=xml_parser.STREAMING, lazy_text=True)
+            self.assertEqual(actual, expected, path)
+
+    def test_same_text_as_eager(self):
+        for name, ad_parameters in _AD_PARAMETERS.items():
+            for encoding in ("UTF-8", "ISO-8859-1"):
+                xml_bytes = _vpaid(ad_parameters, encoding)
+                expected = xml_parser.from_xml_string(xml_bytes)
+                for lazy_ads in (False, True):
+                    actual = _parse_lazily(xml_bytes, lazy_ads=lazy_ads, chunk_size=512)
+                    self.assertEqual(actual, expected, (name, encoding, lazy_ads))
+                    self.assertEqual(_ad_parameters(actual).data, _ad_parameters(expected).data)
+
+    def test_decoded_when_read(self):
+        vast = _parse_lazily(_vpaid(_AD_PARAMETERS["cdata"]))
+        ad_parameters = _ad_parameters(vast)
+        stored = stored_value(ad_parameters, "data")
+        self.assertGreater(len(_PAYLOAD), streaming.LAZY_TEXT_MIN_BYTES)
+        self.assertIsInstance(stored, LazyText)
+        self.assertFalse(stored.decoded)
+
+        self.assertEqual(ad_parameters.data, _PAYLOAD)
+        self.assertTrue(stored.decoded)
+
+    def test_read_as_str(self):
+        data = _ad_parameters(_parse_lazily(_vpaid(_AD_PARAMETERS["cdata"]))).data
+        self.assertIs(type(data), str)
+        self.assertTrue(data.startswith('{"clickUrl"'))
+        self.assertEqual(json.loads(data)["clickUrl"], "https://mag.dom.com/click?a=1&b=2")
+        self.assertEqual(json.loads(json.dumps(data)), _PAYLOAD)
+        self.assertEqual(data + "", _PAYLOAD)
+
+    def test_short_text_decoded_right_away(self):
+        vast = _parse_lazily(_vpaid(_AD_PARAMETERS["short"]))
+        self.assertEqual(_ad_parameters(vast).data, "{}")
+        self.assertIs(type(_ad_parameters(vast).data), str)
+
+    def test_bytes_like_inputs(self):
+        xml_bytes = _vpaid(_AD_PARAMETERS["escaped"])
+        expected = xml_parser.from_xml_string(xml_bytes)
+        for xml_input in (bytearray(xml_bytes), memoryview(xml_bytes)):
+            for backend in (xml_parser.XMLTODICT, xml_parser.STREAMING):
+                self.assertEqual(xml_parser.from_xml_string(xml_input, backend=backend), expected)
+            actual = xml_parser.from_xml_string(xml_input, backend=xml_parser.STREAMING, lazy_text=True)
+            self.assertEqual(actual, expected)
+
+    def test_with_lazy_creatives(self):
+        xml_bytes = _vpaid(_AD_PARAMETERS["cdata"])
+        vast = xml_parser.from_xml_string(
+            xml_bytes, backend=xml_parser.STREAMING, lazy_text=True, lazy_creatives=True,
+        )
+        self.assertIsInstance(stored_value(_ad_parameters(vast), "data"), LazyText)
+        self.assertEqual(vast, xml_parser.from_xml_string(xml_bytes))
+
+    def test_not_sliced_from_utf_16(self):
+        xml_bytes = _vpaid(_AD_PARAMETERS["cdata"], "UTF-16")
+        vast = xml_parser.from_xml_string(xml_bytes, backend=xml_parser.STREAMING, lazy_text=True)
+        self.assertEqual(_ad_parameters(vast).data, _PAYLOAD)
+        self.assertIs(type(_ad_parameters(vast).data), str)
+
+    def test_serialized(self):
+        vast = _parse_lazily(_vpaid(_AD_PARAMETERS["cdata"]))
+        expected = xml_parser.from_xml_string(_vpaid(_AD_PARAMETERS["cdata"]))
+
+        self.assertEqual(xml_parser.from_xml_string(xml_serializer.to_xml_string(vast)), expected)
+        self.assertEqual(binary.decode(binary.encode(vast)), expected)
+        self.assertEqual(pickle.loads(pickle.dumps(vast)), expected)
+
+    def test_cannot_be_cached(self):
+        with self.assertRaises(ValueError):
+            xml_parser.from_xml_string(
+                _vpaid(_AD_PARAMETERS["cdata"]), backend=xml_parser.STREAMING, lazy_text=True, cache=object(),
+            )
+
+
+class TestLazyTextValue(TestCase):
+    def test_decoded_once(self):
+        calls = []
+
+        def decode():
+            calls.append(None)
+            return "text"
+
+        text = LazyText(decode)
+        self.assertEqual(text, "text")
+        self.assertEqual(hash(text), hash("text"))
+        self.assertEqual(len(text), 4)
+        self.assertEqual(len(calls), 1)
+
+    def test_compared_with_lazy_text(self):
+        self.assertEqual(LazyText(lambda: "a"), LazyText(lambda: "a"))
+        self.assertNotEqual(LazyText(lambda: "a"), LazyText(lambda: "b"))
+        self.assertNotEqual(LazyText(lambda: "1"), 1)
@@ -0,0 +1,41 @@
+from unittest import TestCase
+
+from vast import resources
+from vast.cache import FIFO
+from vast.parsers import xml_parser
+from vast.parsers.cache import ParseCache
+
+
+class TestParseCache(TestCase):
+    def setUp(self):
+        with open(resources.SIMPLE_INLINE_XML, "rb") as fp:
+            self.xml_bytes = fp.read()
+
+    def test_identical_documents_share_the_model(self):
+        cache = ParseCache()
+        first = xml_parser.from_xml_string(self.xml_bytes, cache=cache)
+        second = xml_parser.from_xml_string(self.xml_bytes.decode("utf-8"), cache=cache)
+
+        self.assertIs(first, second)
+        self.assertEqual(first, xml_parser.from_xml_string(self.xml_bytes))
+        self.assertEqual((cache.stats.hits, cache.stats.misses), (1, 1))
+
+    def test_options_are_part_of_the_key(self):
+        cache = ParseCache()
+        xml_parser.from_xml_string(self.xml_bytes, cache=cache)
+        xml_parser.from_xml_string(self.xml_bytes, backend=xml_parser.STREAMING, cache=cache)
+        self.assertEqual(len(cache.models), 2)
+
+    def test_bounded_by_size(self):
+        cache = ParseCache(max_bytes=len(self.xml_bytes) + 1, eviction=FIFO)
+        xml_parser.from_xml_string(self.xml_bytes, cache=cache)
+        xml_parser.from_xml_file(resources.SIMPLE_WRAPPER_XML, cache=cache)
+
+        self.assertEqual(len(cache.models), 1)
+        self.assertEqual(cache.stats.evictions, 1)
+
+    def test_lazy_ads_are_not_cached(self):
+        with self.assertRaises(ValueError):
+            xml_parser.from_xml_string(
+                self.xml_bytes, backend=xml_parser.STREAMING, lazy_ads=True, cache=ParseCache(),
+            )
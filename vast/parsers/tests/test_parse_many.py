@@ -0,0 +1,46 @@
+from unittest import TestCase
+
+from vast import resources
+from vast.errors import ParseError
+from vast.parsers import xml_parser
+
+
+class TestParseMany(TestCase):
+    def setUp(self):
+        self.xml_inputs = []
+        for path in (resources.SIMPLE_WRAPPER_XML, resources.SIMPLE_INLINE_XML, resources.AD_POD_XML):
+            with open(path, "rb") as fp:
+                self.xml_inputs.append(fp.read())
+        self.xml_inputs.insert(1, b"<NotVast/>")
+
+    def test_results_in_order(self):
+        results = list(xml_parser.parse_many(self.xml_inputs, workers=2, chunksize=1))
+
+        self.assertEqual([r.index for r in results], [0, 1, 2, 3])
+        for result, xml_input in zip(results, self.xml_inputs):
+            if result.index == 1:
+                self.assertIsNone(result.vast)
+                self.assertIsInstance(result.error, ParseError)
+            else:
+                self.assertIsNone(result.error)
+                self.assertEqual(result.vast, xml_parser.from_xml_string(xml_input))
+            self.assertGreater(result.seconds, 0)
+
+    def test_results_as_they_finish(self):
+        results = xml_parser.parse_many(
+            self.xml_inputs, workers=2, ordered=False, backend=xml_parser.STREAMING,
+        )
+        self.assertEqual(sorted(r.index for r in results), [0, 1, 2, 3])
+
+    def test_malformed_duration_does_not_abort_the_batch(self):
+        malformed = self.xml_inputs[2].replace(b"<Duration>00:00:15</Duration>", b"<Duration>abc</Duration>")
+        xml_inputs = [self.xml_inputs[0], malformed, self.xml_inputs[3]]
+
+        for backend in (xml_parser.XMLTODICT, xml_parser.STREAMING):
+            results = list(xml_parser.parse_many(xml_inputs, workers=2, chunksize=1, backend=backend))
+
+            self.assertEqual([r.index for r in results], [0, 1, 2])
+            self.assertIsInstance(results[1].error, ParseError)
+            self.assertIsNone(results[1].vast)
+            self.assertIsNone(results[0].error)
+            self.assertIsNone(results[2].error)
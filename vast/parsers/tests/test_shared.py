@@ -0,0 +1,22 @@
+from unittest import TestCase
+
+from vast.errors import ParseError
+from vast.parsers.shared import parse_duration, unparse_duration
+
+
+class TestDuration(TestCase):
+    def test_parse(self):
+        self.assertEqual(parse_duration("00:00:30"), 30)
+        self.assertEqual(parse_duration("00:02:30"), 150)
+        self.assertEqual(parse_duration("01:02:03"), 3723)
+        self.assertIsNone(parse_duration(None))
+
+    def test_unparse(self):
+        self.assertEqual(unparse_duration(150), "00:02:30")
+        self.assertEqual(unparse_duration(3723), "01:02:03")
+        self.assertIsNone(unparse_duration(None))
+
+    def test_parse_malformed(self):
+        for duration in ("abc", "00:30", "00:00:30:00"):
+            with self.assertRaises(ParseError):
+                parse_duration(duration)
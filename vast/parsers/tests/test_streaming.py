@@ -0,0 +1,236 @@
+from unittest import TestCase
+from xml.parsers.expat import ExpatError
+
+from vast import resources
+from vast.errors import IllegalModelStateError, ParseError
+from vast.parsers import xml_parser
+
+
+_RESOURCES = (
+    resources.SIMPLE_WRAPPER_XML,
+    resources.SIMPLE_INLINE_XML,
+    resources.INLINE_MULTI_FILES_XML,
+    resources.INLINE_WITH_TRACKING_EVENTS_XML,
+    resources.INLINE_WITH_CREATIVE_ATTRIBUTES,
+    resources.INLINE_WITH_VIDEO_CLICKS,
+    resources.INLINE_WITH_AD_PARAMETERS,
+    resources.INLINE_WITH_NON_LINEAR_ADS,
+)
+
+
+class TestStreamingBackend(TestCase):
+    def test_same_models_as_xmltodict_backend(self):
+        for path in _RESOURCES:
+            with open(path, "r") as fp:
+                xml_string = fp.read()
+
+            expected = xml_parser.from_xml_string(xml_string, backend=xml_parser.XMLTODICT)
+            actual = xml_parser.from_xml_string(xml_string, backend=xml_parser.STREAMING)
+            self.assertEqual(actual, expected, path)
+
+    def test_from_xml_file(self):
+        actual = xml_parser.from_xml_file(resources.SIMPLE_WRAPPER_XML, backend=xml_parser.STREAMING)
+        self.assertEqual(actual.ad.wrapper.vast_ad_tag_uri, "//vast.dv.com/v3/vast?_vast")
+
+    def test_unknown_elements_are_skipped(self):
+        xml_string = """
+        <VAST version="2.0">
+            <Ad id="1">
+                <Wrapper>
+                    <AdSystem>MagU</AdSystem>
+                    <VASTAdTagURI>https://mag.dom.com/vast</VASTAdTagURI>
+                    <Extensions>
+                        <Extension><Tracking event="bogus">not a tracking event</Tracking></Extension>
+                    </Extensions>
+                </Wrapper>
+            </Ad>
+        </VAST>
+        """
+        actual = xml_parser.from_xml_string(xml_string, backend=xml_parser.STREAMING)
+        self.assertEqual(actual.ad.wrapper.ad_system, "MagU")
+
+    def test_root_must_be_vast(self):
+        with self.assertRaises(ParseError):
+            xml_parser.from_xml_string("<NotVast/>", backend=xml_parser.STREAMING)
+
+    def test_unsupported_version(self):
+        with self.assertRaises(ParseError):
+            xml_parser.from_xml_string('<VAST version="9.0"><Ad/></VAST>', backend=xml_parser.STREAMING)
+
+    def test_model_errors_are_raised(self):
+        xml_string = (
+            '<VAST version="2.0"><Ad><Wrapper>'
+            '<AdSystem>MagU</AdSystem><VASTAdTagURI>https://mag.dom.com/vast</VASTAdTagURI>'
+            '</Wrapper></Ad></VAST>'
+        )
+        with self.assertRaises(IllegalModelStateError):
+            xml_parser.from_xml_string(xml_string, backend=xml_parser.STREAMING)
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            xml_parser.from_xml_string("<VAST/>", backend="nope")
+
+
+class TestAdPods(TestCase):
+    def setUp(self):
+        with open(resources.AD_POD_XML, "rb") as fp:
+            self.xml_bytes = fp.read()
+
+    def test_backends_parse_all_ads(self):
+        expected_ids = ["pod_ad_2", "pod_ad_1", "fallback_ad"]
+        for backend in (xml_parser.XMLTODICT, xml_parser.STREAMING):
+            vast = xml_parser.from_xml_string(self.xml_bytes, backend=backend)
+            self.assertEqual([ad.id for ad in vast.ads], expected_ids)
+            self.assertEqual(vast.ad, vast.ads[0])
+
+    def test_ads_by_sequence(self):
+        vast = xml_parser.from_xml_string(self.xml_bytes, backend=xml_parser.STREAMING)
+        self.assertEqual([ad.id for ad in vast.ads_by_sequence()], ["pod_ad_1", "pod_ad_2"])
+
+    def test_iter_ads_yields_each_ad_once_parsed(self):
+        ads = xml_parser.iter_ads(self.xml_bytes, chunk_size=64)
+        first = next(ads)
+        self.assertEqual((first.id, first.sequence), ("pod_ad_2", 2))
+        self.assertEqual([ad.id for ad in ads], ["pod_ad_1", "fallback_ad"])
+
+    def test_lazy_ads_are_parsed_when_consumed(self):
+        vast = xml_parser.from_xml_string(
+            self.xml_bytes, backend=xml_parser.STREAMING, lazy_ads=True, chunk_size=64,
+        )
+        self.assertEqual(vast.ad.id, "pod_ad_2")
+        self.assertEqual(vast.ads.pulled, 1)
+
+        self.assertEqual(vast.ads[1].id, "pod_ad_1")
+        self.assertEqual(vast.ads.pulled, 2)
+
+        eager = xml_parser.from_xml_string(self.xml_bytes, backend=xml_parser.STREAMING)
+        self.assertEqual(vast, eager)
+
+    def test_lazy_ads_from_file(self):
+        vast = xml_parser.from_xml_file(resources.AD_POD_XML, backend=xml_parser.STREAMING, lazy_ads=True)
+        self.assertEqual(len(vast.ads), 3)
+
+
+class TestPushParser(TestCase):
+    def setUp(self):
+        with open(resources.AD_POD_XML, "rb") as fp:
+            self.xml_bytes = fp.read()
+
+    def _feed_until(self, parser, chunks, predicate):
+        for chunk in chunks:
+            parser.feed(chunk)
+            if predicate():
+                return
+
+    def test_same_models_as_parse(self):
+        for path in _RESOURCES + (resources.AD_POD_XML, ):
+            with open(path, "rb") as fp:
+                xml_bytes = fp.read()
+
+            parser = xml_parser.push_parser()
+            for start in range(0, len(xml_bytes), 7):
+                parser.feed(xml_bytes[start:start + 7])
+            expected = xml_parser.from_xml_string(xml_bytes, backend=xml_parser.STREAMING)
+            self.assertEqual(parser.close(), expected, path)
+
+    def test_ad_head_is_known_before_the_ad_closes(self):
+        xml_string = (
+            '<VAST version="2.0"><Ad id="wrapped">'
+            "<Wrapper><AdSystem>MagU</AdSystem><VASTAdTagURI> https://mag.dom.com/vast </VASTAdTagURI>"
+            "<Impression>https://mag.dom.com/impression</Impression>"
+        )
+        parser = xml_parser.push_parser()
+        chunks = iter([xml_string[i:i + 5] for i in range(0, len(xml_string), 5)])
+
+        self._feed_until(parser, chunks, lambda: parser.version is not None)
+        self.assertEqual(parser.version, "2.0")
+        self.assertIsNone(parser.ad_id)
+
+        self._feed_until(parser, chunks, lambda: parser.ad_type is not None)
+        self.assertEqual((parser.ad_id, parser.ad_type), ("wrapped", "Wrapper"))
+        self.assertIsNone(parser.vast_ad_tag_uri)
+
+        self._feed_until(parser, chunks, lambda: parser.vast_ad_tag_uri is not None)
+        self.assertEqual(parser.vast_ad_tag_uri, "https://mag.dom.com/vast")
+        self.assertEqual(parser.ads, [])
+
+    def test_ads_are_appended_as_they_close(self):
+        parser = xml_parser.push_parser()
+        chunks = iter([self.xml_bytes[i:i + 64] for i in range(0, len(self.xml_bytes), 64)])
+        self._feed_until(parser, chunks, lambda: parser.ads)
+        self.assertEqual([ad.id for ad in parser.ads], ["pod_ad_2"])
+
+        for chunk in chunks:
+            parser.feed(chunk)
+        vast = parser.close()
+        self.assertEqual([ad.id for ad in vast.ads], ["pod_ad_2", "pod_ad_1", "fallback_ad"])
+        self.assertEqual(vast.ad, vast.ads[0])
+
+    def test_incomplete_document(self):
+        parser = xml_parser.push_parser()
+        parser.feed(self.xml_bytes[:100])
+        with self.assertRaises(ExpatError):
+            parser.close()
+
+    def test_root_must_be_vast(self):
+        parser = xml_parser.push_parser()
+        with self.assertRaises(ParseError):
+            parser.feed(b"<NotVast>")
+
+
+class TestExtract(TestCase):
+    def test_same_models_as_full_parse(self):
+        with open(resources.INLINE_WITH_TRACKING_EVENTS_XML, "rb") as fp:
+            xml_bytes = fp.read()
+        linear = xml_parser.from_xml_string(xml_bytes).ad.inline.creatives[0].linear
+
+        extracted = xml_parser.extract(xml_bytes, ["media_files", "tracking_events"])
+
+        self.assertEqual(extracted["media_files"], linear.media_files)
+        self.assertEqual(extracted["tracking_events"], linear.tracking_events)
+
+    def test_nested_fields(self):
+        with open(resources.INLINE_WITH_TRACKING_EVENTS_XML, "rb") as fp:
+            xml_bytes = fp.read()
+        vast = xml_parser.from_xml_string(xml_bytes)
+
+        extracted = xml_parser.extract(xml_bytes, ["creatives", "media_files", "impressions"])
+
+        self.assertEqual(extracted["creatives"], vast.ad.inline.creatives)
+        self.assertEqual(extracted["media_files"], vast.ad.inline.creatives[0].linear.media_files)
+        self.assertEqual(extracted["impressions"], [vast.ad.inline.impression])
+
+    def test_skips_invalid_elements_not_asked_for(self):
+        xml_string = """
+        <VAST version="2.0">
+            <Ad id="1">
+                <InLine>
+                    <Creatives>
+                        <Creative>
+                            <Linear>
+                                <MediaFiles>
+                                    <MediaFile delivery="progressive" type="video/mp4" width="720" height="420">https://mag.dom.com/a.mp4</MediaFile>
+                                </MediaFiles>
+                            </Linear>
+                        </Creative>
+                    </Creatives>
+                </InLine>
+            </Ad>
+        </VAST>
+        """
+        extracted = xml_parser.extract(xml_string, ["media_files", "vast_ad_tag_uris"])
+        self.assertEqual([m.asset for m in extracted["media_files"]], ["https://mag.dom.com/a.mp4"])
+        self.assertEqual(extracted["vast_ad_tag_uris"], [])
+
+    def test_requested_elements_are_validated(self):
+        xml_string = (
+            '<VAST version="2.0"><Ad id="1"><InLine><Creatives><Creative><Linear><MediaFiles>'
+            '<MediaFile delivery="progressive" width="720" height="420">https://mag.dom.com/a.mp4</MediaFile>'
+            '</MediaFiles></Linear></Creative></Creatives></InLine></Ad></VAST>'
+        )
+        with self.assertRaises(IllegalModelStateError):
+            xml_parser.extract(xml_string, ["media_files"])
+
+    def test_unknown_field(self):
+        with self.assertRaises(ValueError):
+            xml_parser.extract('<VAST version="2.0"/>', ["nope"])
@@ -4,6 +4,8 @@ from unittest import TestCase
 from vast.parsers import xml_parser
 from vast.models import vast_v2 as v2_models
 from vast import resources
+from vast.cache import Interner
+from vast.errors import ParseError
 
 
 class TestWrapperParser(TestCase):
@@ -492,3 +494,48 @@ def _parse_xml_from_file(path_to_file):
     return xml_parser.from_xml_string(xml_string)
 
 
+class TestWithoutValidation(TestCase):
+    def test_same_models_as_validated(self):
+        for backend in (xml_parser.XMLTODICT, xml_parser.STREAMING):
+            for path in (resources.SIMPLE_INLINE_XML, resources.INLINE_WITH_NON_LINEAR_ADS):
+                expected = xml_parser.from_xml_file(path, backend=backend)
+                actual = xml_parser.from_xml_file(path, backend=backend, validate=False)
+                self.assertEqual(actual, expected)
+
+    def test_invalid_models_are_made(self):
+        for backend in (xml_parser.XMLTODICT, xml_parser.STREAMING):
+            vast = xml_parser.from_xml_file(resources.INLINE_WITH_COMPANION_ADS, backend=backend, validate=False)
+            creative = vast.ad.inline.creatives[0]
+            self.assertIsNotNone(creative.linear)
+            self.assertIsNotNone(creative.companion)
+
+
+class TestInterning(TestCase):
+    def test_values_are_shared_across_documents(self):
+        with open(resources.INLINE_WITH_TRACKING_EVENTS_XML, "rb") as fp:
+            xml_bytes = fp.read()
+
+        for backend in (xml_parser.XMLTODICT, xml_parser.STREAMING):
+            interner = Interner()
+            first = xml_parser.from_xml_string(xml_bytes, backend=backend, interner=interner)
+            second = xml_parser.from_xml_string(xml_bytes, backend=backend, interner=interner)
+
+            self.assertEqual(second, first)
+            self.assertIs(second.ad.inline.ad_system, first.ad.inline.ad_system)
+            first_event = first.ad.inline.creatives[0].linear.tracking_events[0]
+            second_event = second.ad.inline.creatives[0].linear.tracking_events[0]
+            self.assertIs(second_event.tracking_event_uri, first_event.tracking_event_uri)
+            self.assertGreater(interner.stats.hit_rate, 0.4)
+
+
+class TestDocumentErrors(TestCase):
+    def test_unexpected_content_raises_parse_error(self):
+        xml_strings = (
+            '<VAST version="2.0"><Ad id="1"><InLine><AdSystem>s</AdSystem><AdTitle>t</AdTitle>'
+            '<Impression>i</Impression><Creatives/></InLine></Ad></VAST>',
+            '<VAST version="2.0"><Ad id="1"><InLine>text</InLine></Ad></VAST>',
+            '<!DOCTYPE VAST [<!ENTITY e "x">]><VAST version="2.0"><Ad id="&e;"><InLine></InLine></Ad></VAST>',
+        )
+        for xml_string in xml_strings:
+            with self.assertRaises(ParseError):
+                xml_parser.from_xml_string(xml_string, backend=xml_parser.XMLTODICT)
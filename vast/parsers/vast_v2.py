@@ -1,99 +1,124 @@
 from vast.models import vast_v2 as v2_models
+from vast.models.shared import LazySequence
 from vast.parsers.shared import (
     accept_none,
     accept_falsy,
     parse_duration,
+    structure_errors_as_parse_error,
     unicode_to_dict,
+    ParseOptions,
 )
 
 
-def parse_xml(xml_dict):
+@structure_errors_as_parse_error
+def parse_xml(xml_dict, lazy_creatives=False, validate=True):
     """
 
     :param xml_dict: as provided by xml to dict parser
+    :param lazy_creatives: if True, creatives are LazySequences, each Creative is parsed on first access
+    :param validate: if False, values are only converted to their types, models are not checked
     :return: Vast object if parsing was successful
+    :raises: ParseError if an element does not hold what its model expects
     """
-    return _parse_vast(xml_dict.get("VAST"))
+    options = ParseOptions(lazy_creatives=lazy_creatives, validate=validate)
+    return _parse_vast(xml_dict.get("VAST"), options)
 
 
-def _parse_vast(xml_dict):
+def _parse_vast(xml_dict, options):
     return v2_models.Vast.make(
         version=xml_dict.get("@version"),
-        ad=_parse_ad(xml_dict.get("Ad")),
+        ads=_parse_ads(xml_dict.get("Ad"), options),
+        validate=options.validate,
     )
 
 
+@accept_falsy
+def _parse_ads(ads, options):
+    return [_parse_ad(a, options) for a in ads]
+
+
 @accept_none
-def _parse_ad(xml_dict):
+def _parse_ad(xml_dict, options):
     return v2_models.Ad.make(
         id=xml_dict.get("@id"),
-        inline=_parse_inline(xml_dict.get("InLine")),
-        wrapper=_parse_wrapper(xml_dict.get("Wrapper")),
+        inline=_parse_inline(xml_dict.get("InLine"), options),
+        wrapper=_parse_wrapper(xml_dict.get("Wrapper"), options),
+        sequence=xml_dict.get("@sequence"),
+        validate=options.validate,
     )
 
 
 @accept_none
-def _parse_wrapper(xml_dict):
+def _parse_wrapper(xml_dict, options):
     return v2_models.Wrapper.make(
         ad_system=xml_dict.get("AdSystem"),
         vast_ad_tag_uri=xml_dict.get("VASTAdTagURI"),
         ad_title=xml_dict.get("AdTitle"),
         impression=xml_dict.get("Impression"),
         error=xml_dict.get("Error"),
-        creatives=_parse_creatives(xml_dict.get("Creatives")),
+        creatives=_parse_creatives(xml_dict.get("Creatives"), options),
+        validate=options.validate,
     )
 
 
 @accept_none
-def _parse_inline(xml_dict):
+def _parse_inline(xml_dict, options):
     return v2_models.Inline.make(
         ad_system=xml_dict.get("AdSystem"),
         ad_title=xml_dict.get("AdTitle"),
         impression=xml_dict.get("Impression"),
-        creatives=_parse_creatives(xml_dict.get("Creatives")),
+        creatives=_parse_creatives(xml_dict.get("Creatives"), options),
+        validate=options.validate,
     )
 
 
 @accept_falsy
-def _parse_creatives(creatives):
-    return [_parse_creative(c) for c in creatives[0]["Creative"]]
+def _parse_creatives(creatives, options):
+    creatives = (_parse_creative(c, options) for c in creatives[0]["Creative"])
+    if options.lazy_creatives:
+        return LazySequence(creatives)
+    return list(creatives)
 
 
-def _parse_creative(xml_dict):
+@structure_errors_as_parse_error
+def _parse_creative(xml_dict, options):
     return v2_models.Creative.make(
-        linear=_parse_linear_creative(xml_dict.get("Linear")),
-        non_linear=_parse_non_linear_creative(xml_dict.get("NonLinearAds")),
-        companion=_parse_companion_ads_creative(xml_dict.get("CompanionAds")),
+        linear=_parse_linear_creative(xml_dict.get("Linear"), options),
+        non_linear=_parse_non_linear_creative(xml_dict.get("NonLinearAds"), options),
+        companion=_parse_companion_ads_creative(xml_dict.get("CompanionAds"), options),
         id=xml_dict.get("@id"),
         sequence=xml_dict.get("@sequence"),
         ad_id=xml_dict.get("@adId"),
         api_framework=xml_dict.get("@apiFramework"),
+        validate=options.validate,
     )
 
 
 @accept_none
-def _parse_linear_creative(xml_dict):
+def _parse_linear_creative(xml_dict, options):
     return v2_models.Linear.make(
         duration=parse_duration(xml_dict.get("Duration")),
-        media_files=_parse_media_files(xml_dict.get("MediaFiles")),
-        video_clicks=_parse_video_clicks(xml_dict.get("VideoClicks")),
-        ad_parameters=_parse_ad_parameters(xml_dict.get("AdParameters")),
-        tracking_events=_parse_tracking_events(xml_dict.get("TrackingEvents")),
+        media_files=_parse_media_files(xml_dict.get("MediaFiles"), options),
+        video_clicks=_parse_video_clicks(xml_dict.get("VideoClicks"), options),
+        ad_parameters=_parse_ad_parameters(xml_dict.get("AdParameters"), options),
+        tracking_events=_parse_tracking_events(xml_dict.get("TrackingEvents"), options),
+        validate=options.validate,
     )
 
 
 @accept_none
-def _parse_non_linear_creative(xml_dict):
+def _parse_non_linear_creative(xml_dict, options):
     return v2_models.NonLinear.make(
-        non_linear_ads=_parse_non_linear_ads(xml_dict.get("NonLinear")),
-        tracking_events=_parse_tracking_events(xml_dict.get("TrackingEvents")),
+        non_linear_ads=_parse_non_linear_ads(xml_dict.get("NonLinear"), options),
+        tracking_events=_parse_tracking_events(xml_dict.get("TrackingEvents"), options),
+        validate=options.validate,
     )
 
-def _parse_non_linear_ads(non_linear_ads):
-    return [_parse_non_linear_ad(a) for a in non_linear_ads]
+def _parse_non_linear_ads(non_linear_ads, options):
+    return [_parse_non_linear_ad(a, options) for a in non_linear_ads]
 
 
-def _parse_non_linear_ad(xml_dict):
+def _parse_non_linear_ad(xml_dict, options):
     return v2_models.NonLinearAd.make(
         width=xml_dict.get("@width"),
         height=xml_dict.get("@height"),
@@ -104,39 +129,43 @@ def _parse_non_linear_ad(xml_dict):
         min_suggested_duration=parse_duration(xml_dict.get("@minSuggestedDuration")),
         api_framework=xml_dict.get("@apiFramework"),
         id=xml_dict.get("@id"),
-        static_resource=_parse_static_resource(xml_dict.get("StaticResource")),
+        static_resource=_parse_static_resource(xml_dict.get("StaticResource"), options),
         iframe_resource=xml_dict.get("IFrameResource"),
         html_resource=xml_dict.get("HTMLResource"),
-        non_linear_click_through=_parse_uri_with_id(xml_dict.get("NonLinearClickThrough")),
-        ad_parameters=_parse_ad_parameters(xml_dict.get("AdParameters")),
+        non_linear_click_through=_parse_uri_with_id(xml_dict.get("NonLinearClickThrough"), options),
+        ad_parameters=_parse_ad_parameters(xml_dict.get("AdParameters"), options),
+        validate=options.validate,
     )
 
 
 @accept_none
-def _parse_static_resource(xml_dict):
+def _parse_static_resource(xml_dict, options):
     return v2_models.StaticResource.make(
         resource=xml_dict.get("#text"),
         mime_type=xml_dict.get("@creativeType"),
+        validate=options.validate,
     )
 
 
 @unicode_to_dict
 @accept_none
-def _parse_uri_with_id(xml_dict):
+def _parse_uri_with_id(xml_dict, options):
     return v2_models.UriWithId.make(
         resource=xml_dict.get("#text"),
         id=xml_dict.get("@id"),
+        validate=options.validate,
     )
 
 
 @accept_none
-def _parse_companion_ads_creative(xml_dict):
+def _parse_companion_ads_creative(xml_dict, options):
     return v2_models.Companion.make(
-        [_parse_companion_ads(a) for a in xml_dict.get("Companion")]
+        [_parse_companion_ads(a, options) for a in xml_dict.get("Companion")],
+        validate=options.validate,
     )
 
 
-def _parse_companion_ads(xml_dict):
+def _parse_companion_ads(xml_dict, options):
     return v2_models.CompanionAd.make(
         width=xml_dict.get("@width"),
         height=xml_dict.get("@height"),
@@ -144,62 +173,69 @@ def _parse_companion_ads(xml_dict):
         expanded_height=xml_dict.get("@expandedHeight"),
         api_framework=xml_dict.get("@apiFramework"),
         id=xml_dict.get("@id"),
-        static_resource=_parse_static_resource(xml_dict.get("StaticResource")),
+        static_resource=_parse_static_resource(xml_dict.get("StaticResource"), options),
         iframe_resource=xml_dict.get("IFrameResource"),
         html_resource=xml_dict.get("HTMLResource"),
         companion_click_through=xml_dict.get("CompanionClickThrough"),
-        ad_parameters=_parse_ad_parameters(xml_dict.get("AdParameters")),
+        ad_parameters=_parse_ad_parameters(xml_dict.get("AdParameters"), options),
         alt_text=xml_dict.get("AltText"),
-        tracking_events=_parse_tracking_events(xml_dict.get("TrackingEvents")),
+        tracking_events=_parse_tracking_events(xml_dict.get("TrackingEvents"), options),
+        validate=options.validate,
     )
 
 
 @accept_none
-def _parse_video_clicks(xml_dict):
+def _parse_video_clicks(xml_dict, options):
     return v2_models.VideoClicks.make(
         click_through=xml_dict.get("ClickThrough"),
         click_tracking=xml_dict.get("ClickTracking"),
         custom_click=xml_dict.get("CustomClick"),
+        validate=options.validate,
     )
 
 
 @unicode_to_dict
 @accept_none
-def _parse_ad_parameters(xml_dict):
+def _parse_ad_parameters(xml_dict, options):
     return v2_models.AdParameters.make(
         data=xml_dict.get("#text"),
         xml_encoded=xml_dict.get("@xmlEncoded"),
+        validate=options.validate,
     )
 
 
 @accept_falsy
-def _parse_media_files(media_files):
-    return [_parse_media_file(mf) for mf in media_files[0]["MediaFile"]]
+def _parse_media_files(media_files, options):
+    return [_parse_media_file(mf, options) for mf in media_files[0]["MediaFile"]]
 
 
-def _parse_media_file(xml_dict):
+def _parse_media_file(xml_dict, options):
     return v2_models.MediaFile.make(
         asset=xml_dict.get("#text"),
         delivery=xml_dict.get("@delivery"),
         type=xml_dict.get("@type"),
         width=xml_dict.get("@width"),
         height=xml_dict.get("@height"),
+        codec=xml_dict.get("@codec"),
+        id=xml_dict.get("@id"),
         bitrate=xml_dict.get("@bitrate"),
         min_bitrate=xml_dict.get("@minBitrate"),
         max_bitrate=xml_dict.get("@maxBitrate"),
         scalable=xml_dict.get("@scalable"),
         maintain_aspect_ratio=xml_dict.get("@maintainAspectRatio"),
         api_framework=xml_dict.get("@apiFramework"),
+        validate=options.validate,
     )
 
 
 @accept_falsy
-def _parse_tracking_events(tracking_events):
-    return [_parse_tracking_event(t) for t in tracking_events[0]["Tracking"]]
+def _parse_tracking_events(tracking_events, options):
+    return [_parse_tracking_event(t, options) for t in tracking_events[0]["Tracking"]]
 
 
-def _parse_tracking_event(xml_dict):
+def _parse_tracking_event(xml_dict, options):
     return v2_models.TrackingEvent.make(
         tracking_event_uri=xml_dict.get("#text"),
         tracking_event_type=xml_dict.get("@event"),
+        validate=options.validate,
     )
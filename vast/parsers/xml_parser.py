@@ -1,39 +1,197 @@
+import importlib
+import multiprocessing
+import time
+from xml.parsers.expat import ExpatError
+
+import attr
 import xmltodict
 
-from vast.errors import ParseError
-from vast.parsers import vast_v2
+from vast import instrumentation
+from vast.errors import IllegalModelStateError, ParseError
+from vast.parsers import compressed, streaming, vast_v2
+
+XMLTODICT = "xmltodict"
+STREAMING = "streaming"
 
 _PARSERS = {
     "2.0": vast_v2.parse_xml
 }
 
 _FORCE_LIST_ELEMENTS = (
+    "Ad",
     "Creatives", "Creative",
     "TrackingEvents", "Tracking",
     "MediaFiles", "MediaFile",
+    "NonLinear",
     "Companion",
 )
 
 
-def from_xml_file(xml_file, **kwargs):
-    with open(xml_file, "r") as xml_file_like_object:
-        return _parse(xml_file_like_object, **kwargs)
+def from_xml_file(xml_file, backend=XMLTODICT, cache=None, **kwargs):
+    """
+    :param xml_file: path of a VAST XML file, which may be compressed, see compressed.open_xml.
+    A compressed file is decompressed as it is parsed
+    :param backend: see from_xml_string
+    :param cache: see from_xml_string
+    :param kwargs: see from_xml_string
+    :return: parsed Vast object
+    """
+    with compressed.open_xml(xml_file) as xml_file_like_object:
+        if kwargs.get("lazy_ads") or kwargs.get("lazy_text") or cache is not None:
+            # lazy ads are parsed, and lazy texts decoded, after the file is closed,
+            # and the cache hashes the whole content
+            xml_file_like_object = xml_file_like_object.read()
+        return from_xml_string(xml_file_like_object, backend=backend, cache=cache, **kwargs)
 
 
-def from_xml_string(xml_input, **kwargs):
+def from_xml_string(xml_input, backend=XMLTODICT, cache=None, **kwargs):
     """
     Entry point for parsing a VAST XML into a VAST model
-    
-    :param xml_input: as str or file like object
-    :param kwargs: pass on to xmltodict
+
+    :param xml_input: as str, bytes like (bytes, bytearray or memoryview) or file like object.
+    Bytes are parsed as they are, without being decoded or copied first,
+    in the encoding declared by the document
+    :param backend: XMLTODICT to walk a dict tree built by xmltodict,
+    or STREAMING to build models directly from parser events
+    :param cache: optional cache.ParseCache, returning the model already parsed from an identical document
+    :param kwargs: pass on to xmltodict, besides options which both backends accept:
+    'lazy_creatives' to parse each Creative only when it is first accessed,
+    'validate', which if False only converts values to their types, for documents known to be valid,
+    and 'interner', a vast.cache.Interner de-duplicating text and attribute values across documents.
+    The streaming backend accepts 'encoding', 'lazy_ads' to parse ads only when consumed,
+    and 'lazy_text' to keep large texts, e.g. of AdParameters, as LazyText slices of xml_input until read
     :return: parsed Vast object
     """
-    return _parse(xml_input, **kwargs)
+    parse = _BACKENDS.get(backend)
+    if parse is None:
+        raise ValueError("Unknown parser backend '%s'" % backend)
+
+    if cache is None or hasattr(xml_input, "read"):
+        return parse(xml_input, **kwargs)
+
+    if _is_lazy(kwargs):
+        raise ValueError("lazy models cannot be cached, they hold the state of their parser")
+    return cache.get_or_parse(
+        xml_input,
+        lambda xml: parse(xml, **kwargs),
+        options=(backend, tuple(sorted(kwargs.items()))),
+    )
+
+
+def _is_lazy(kwargs):
+    return kwargs.get("lazy_ads") or kwargs.get("lazy_creatives") or kwargs.get("lazy_text")
+
+
+def iter_ads(xml_input, **kwargs):
+    """
+    Parse the ads of a VAST XML one at a time, e.g. the ads of an ad pod
+
+    :param xml_input: as str, bytes like or file like object
+    :param kwargs: 'encoding' and 'chunk_size', see streaming.iter_ads
+    :return: generator of Ad objects, each yielded as soon as it was parsed
+    """
+    return streaming.iter_ads(xml_input, **kwargs)
+
+
+def push_parser(**kwargs):
+    """
+    Parse a VAST XML fed in chunks, e.g. as they are received from the network,
+    instead of buffering the whole document first
+
+    :param kwargs: 'encoding', 'lazy_creatives', 'validate' and 'interner', see streaming.PushParser
+    :return: streaming.PushParser, fed each chunk with feed, and returning the Vast object on close
+    """
+    return streaming.PushParser(**kwargs)
+
+
+def extract(xml_input, fields, **kwargs):
+    """
+    Parse only some elements of a VAST XML, e.g. its media files and tracking events,
+    skipping everything else
+
+    :param xml_input: as str, bytes like or file like object
+    :param fields: names of the elements to parse, see streaming.FIELDS
+    :param kwargs: 'encoding', see streaming.extract
+    :return: dict from each field to the list of its models, in document order
+    """
+    return streaming.extract(xml_input, fields, **kwargs)
 
 
-def _parse(xml_string_or_file_like_object, **kwargs):
+@attr.s(frozen=True)
+class ParseResult(object):
+    """
+    Outcome of parsing one document of a batch
+    Exactly one of vast and error is set, seconds is the time the document took to parse
+    """
+    index = attr.ib()
+    vast = attr.ib()
+    error = attr.ib()
+    seconds = attr.ib(default=None)
+
+
+# Errors caused by the document itself, returned as values by parse_many
+_DOCUMENT_ERRORS = (ParseError, IllegalModelStateError, ExpatError)
+
+_worker_kwargs = {}
+
+
+def parse_many(xml_inputs, workers=None, chunksize=64, ordered=True, **kwargs):
+    """
+    Parse many VAST XMLs, spread across a pool of worker processes.
+    A document which fails to parse does not abort the batch,
+    its error is returned in its ParseResult instead.
+
+    :param xml_inputs: iterable of str or bytes documents
+    :param workers: number of worker processes, defaults to the number of CPUs
+    :param chunksize: documents sent to a worker at a time
+    :param ordered: if True results are yielded in input order, otherwise as soon as they are done
+    :param kwargs: pass on to from_xml_string
+    :return: generator of ParseResult, one per document
+    """
+    if _is_lazy(kwargs):
+        raise ValueError("lazy models cannot be used with parse_many, they must be parsed by the workers")
+    if kwargs.get("cache") is not None:
+        raise ValueError("a cache cannot be shared with worker processes")
+    if kwargs.get("interner") is not None:
+        raise ValueError("an interner cannot be shared with worker processes")
+
+    pool = multiprocessing.Pool(workers, initializer=_init_worker, initargs=(kwargs, ))
+    try:
+        imap = pool.imap if ordered else pool.imap_unordered
+        for result in imap(_parse_one, enumerate(xml_inputs), chunksize):
+            yield result
+        pool.close()
+    finally:
+        pool.terminate()
+        pool.join()
+
+
+def _init_worker(kwargs):
+    # import the models once per worker, instead of on its first task
+    importlib.import_module("vast.models.vast_v2")
+    _worker_kwargs.update(kwargs)
+
+
+def _parse_one(indexed_xml_input):
+    index, xml_input = indexed_xml_input
+    started = time.perf_counter()
+    try:
+        vast = from_xml_string(xml_input, **_worker_kwargs)
+    except _DOCUMENT_ERRORS as e:
+        return ParseResult(index=index, vast=None, error=e, seconds=time.perf_counter() - started)
+    return ParseResult(index=index, vast=vast, error=None, seconds=time.perf_counter() - started)
+
+
+def _parse(xml_string_or_file_like_object, lazy_creatives=False, validate=True, interner=None, **kwargs):
     kwargs.update({"force_list": _FORCE_LIST_ELEMENTS})
-    root = xmltodict.parse(xml_string_or_file_like_object, **kwargs)
+    if interner is not None:
+        kwargs["postprocessor"] = _interning_postprocessor(interner, kwargs.get("postprocessor"))
+    with instrumentation.stage(instrumentation.XMLTODICT_PARSE):
+        try:
+            root = xmltodict.parse(xml_string_or_file_like_object, **kwargs)
+        except ValueError as e:
+            # e.g. entities, which are disabled
+            raise ParseError(str(e))
     if "VAST" not in root:
         raise ParseError("root must have VAST element")
     vast = root["VAST"]
@@ -48,4 +206,30 @@ def _parse(xml_string_or_file_like_object, **kwargs):
     if parser is None:
         raise ParseError("Cannot parse vast version %s" % version)
 
-    return parser(root)
+    with instrumentation.stage(instrumentation.WALK):
+        return parser(root, lazy_creatives=lazy_creatives, validate=validate)
+
+
+def _interning_postprocessor(interner, postprocessor=None):
+    """
+    :param interner: vast.cache.Interner
+    :param postprocessor: optional xmltodict postprocessor, applied before interning
+    :return: xmltodict postprocessor interning every text and attribute value
+    """
+    def intern(path, key, value):
+        if postprocessor is not None:
+            entry = postprocessor(path, key, value)
+            if entry is None:
+                return None
+            key, value = entry
+        if isinstance(value, str):
+            value = interner(value)
+        return key, value
+
+    return intern
+
+
+_BACKENDS = {
+    XMLTODICT: _parse,
+    STREAMING: streaming.parse,
+}
@@ -0,0 +1,84 @@
+"""
+Cache of fetched and parsed VAST documents for the wrapper resolver
+"""
+import asyncio
+import time
+
+from vast.cache import BoundedCache
+
+
+class _Load(object):
+    """
+    A load in flight, and the number of callers waiting for it
+    """
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task):
+        self.task = task
+        self.waiters = 0
+
+
+class DocumentCache(object):
+    """
+    Caches parsed Vast documents by their normalized VASTAdTagURI, with TTL and LRU eviction.
+
+    Concurrent misses for the same uri share a single load (singleflight).
+    A shared load is cancelled only once every caller waiting for it was cancelled,
+    e.g. because all their deadlines ran out.
+    """
+
+    def __init__(self, max_entries=1024, ttl=60, clock=time.monotonic):
+        """
+        :param max_entries: documents kept at most
+        :param ttl: seconds a document stays valid
+        :param clock: function returning the current time in seconds
+        """
+        self.documents = BoundedCache(max_entries, ttl=ttl, clock=clock)
+        self.coalesced = 0
+        self._loads = {}
+
+    @property
+    def stats(self):
+        """
+        :return: CacheStats with hits, misses, evictions and expirations
+        """
+        return self.documents.stats
+
+    async def get_or_load(self, uri, load):
+        """
+        :param uri: normalized uri of the document
+        :param load: coroutine function from uri to a Vast object, called on a miss
+        :return: the Vast object, and True if it came from the cache
+        """
+        vast = self.documents.get(uri)
+        if vast is not None:
+            return vast, True
+
+        flight = self._loads.get(uri)
+        if flight is None:
+            flight = _Load(asyncio.ensure_future(self._load(uri, load)))
+            self._loads[uri] = flight
+        else:
+            self.coalesced += 1
+
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task), False
+        finally:
+            flight.waiters -= 1
+            if not flight.waiters and not flight.task.done():
+                flight.task.cancel()
+                self._forget(uri, flight)
+
+    async def _load(self, uri, load):
+        flight = self._loads.get(uri)
+        try:
+            vast = await load(uri)
+            self.documents.put(uri, vast)
+            return vast
+        finally:
+            self._forget(uri, flight)
+
+    def _forget(self, uri, flight):
+        if self._loads.get(uri) is flight:
+            del self._loads[uri]
@@ -0,0 +1,65 @@
+import asyncio
+from unittest import TestCase
+
+from vast.errors import DeadlineExceededError
+from vast.resolvers.cache import DocumentCache
+from vast.resolvers.tests.test_wrapper_resolver import (
+    INLINE_XML, WRAPPER_XML, SlowTransport, make_wrapper,
+)
+from vast.resolvers.wrapper_resolver import WrapperResolver
+
+
+class TestDocumentCache(TestCase):
+    def setUp(self):
+        self.documents = {
+            "https://b.com/vast": WRAPPER_XML.format(ad_id="b", uri="https://c.com/vast"),
+            "https://c.com/vast": INLINE_XML.format(ad_id="c"),
+        }
+
+    def test_concurrent_misses_share_one_fetch(self):
+        transport = SlowTransport(self.documents, {"https://b.com/vast": 0.01})
+        cache = DocumentCache(max_entries=10, ttl=60)
+        resolver = WrapperResolver(transport=transport, cache=cache)
+
+        results = asyncio.run(resolver.resolve_all([
+            make_wrapper("a1", "https://b.com/vast"),
+            make_wrapper("a2", "//b.com/vast"),
+        ]))
+
+        self.assertEqual([r.inline.ad_title for r in results], ["Inline", "Inline"])
+        self.assertEqual(transport.fetched, ["https://b.com/vast", "https://c.com/vast"])
+        self.assertEqual(cache.coalesced, 2)
+        self.assertEqual(cache.stats.misses, 4)
+
+    def test_hits(self):
+        transport = SlowTransport(self.documents, {})
+        cache = DocumentCache()
+        resolver = WrapperResolver(transport=transport, cache=cache)
+
+        asyncio.run(resolver.resolve(make_wrapper("a1", "https://b.com/vast")))
+        resolution = asyncio.run(resolver.resolve(make_wrapper("a2", "https://b.com/vast")))
+
+        self.assertEqual(len(transport.fetched), 2)
+        self.assertEqual(cache.stats.hits, 2)
+        self.assertTrue(all(hop.cached for hop in resolution.hops))
+
+    def test_shared_load_is_cancelled_when_all_waiters_are(self):
+        transport = SlowTransport(self.documents, {"https://b.com/vast": 5})
+        cache = DocumentCache()
+        resolver = WrapperResolver(transport=transport, cache=cache)
+
+        async def scenario():
+            resolutions = await asyncio.gather(
+                resolver.resolve_with_deadline(make_wrapper("a1", "https://b.com/vast"), 0.02),
+                resolver.resolve_with_deadline(make_wrapper("a2", "https://b.com/vast"), 0.05),
+            )
+            # let the cancelled load run its cleanup
+            await asyncio.sleep(0)
+            return resolutions
+
+        resolutions = asyncio.run(scenario())
+
+        for resolution in resolutions:
+            self.assertIsInstance(resolution.error, DeadlineExceededError)
+        self.assertEqual(transport.cancelled, ["https://b.com/vast"])
+        self.assertEqual(len(cache.documents), 0)
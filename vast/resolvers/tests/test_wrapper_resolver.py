@@ -0,0 +1,249 @@
+import asyncio
+from unittest import TestCase
+
+from vast.errors import DeadlineExceededError, FetchError, ParseError, ResolveError
+from vast.parsers import xml_parser
+from vast.resolvers.transports import HttpTransport, Transport, normalize_uri
+from vast.resolvers.wrapper_resolver import WrapperResolver
+
+
+WRAPPER_XML = """
+<VAST version="2.0">
+    <Ad id="{ad_id}">
+        <Wrapper>
+            <AdSystem>MagU</AdSystem>
+            <VASTAdTagURI><![CDATA[{uri}]]></VASTAdTagURI>
+        </Wrapper>
+    </Ad>
+</VAST>
+"""
+
+INLINE_XML = """
+<VAST version="2.0">
+    <Ad id="{ad_id}">
+        <InLine>
+            <AdSystem>MagU</AdSystem>
+            <AdTitle>Inline</AdTitle>
+            <Impression>https://mag.dom.com/imp</Impression>
+            <Creatives>
+                <Creative>
+                    <Linear>
+                        <Duration>00:00:15</Duration>
+                        <MediaFiles>
+                            <MediaFile delivery="progressive" type="video/mp4" width="720" height="420">https://mag.dom.com/a.mp4</MediaFile>
+                        </MediaFiles>
+                    </Linear>
+                </Creative>
+            </Creatives>
+        </InLine>
+    </Ad>
+</VAST>
+"""
+
+
+def make_wrapper(ad_id, uri):
+    return xml_parser.from_xml_string(WRAPPER_XML.format(ad_id=ad_id, uri=uri))
+
+
+class StubTransport(Transport):
+    def __init__(self, documents):
+        self.documents = documents
+        self.fetched = []
+
+    async def fetch(self, uri):
+        self.fetched.append(uri)
+        if uri not in self.documents:
+            raise FetchError("no document at %s" % uri)
+        return self.documents[uri].encode("utf-8")
+
+
+class SlowTransport(StubTransport):
+    def __init__(self, documents, delays):
+        super(SlowTransport, self).__init__(documents)
+        self.delays = delays
+        self.cancelled = []
+
+    async def fetch(self, uri):
+        try:
+            await asyncio.sleep(self.delays.get(uri, 0))
+        except asyncio.CancelledError:
+            self.cancelled.append(uri)
+            raise
+        return await super(SlowTransport, self).fetch(uri)
+
+
+def _run(coroutine):
+    return asyncio.run(coroutine)
+
+
+class TestNormalizeUri(TestCase):
+    def test_normalize(self):
+        self.assertEqual(normalize_uri("//Vast.DV.com/v3/vast?_vast#x"), "https://vast.dv.com/v3/vast?_vast")
+        self.assertEqual(normalize_uri("HTTP://a.com:80"), "http://a.com/")
+        self.assertEqual(normalize_uri("http://a.com:8080/x"), "http://a.com:8080/x")
+
+
+class TestWrapperResolver(TestCase):
+    def test_follows_chain_to_inline(self):
+        transport = StubTransport({
+            "https://b.com/vast": WRAPPER_XML.format(ad_id="b", uri="https://c.com/vast"),
+            "https://c.com/vast": INLINE_XML.format(ad_id="c"),
+        })
+        resolver = WrapperResolver(transport=transport)
+
+        resolution = _run(resolver.resolve(make_wrapper("a", "//b.com/vast")))
+
+        self.assertEqual([v.ad.id for v in resolution.vasts], ["a", "b", "c"])
+        self.assertEqual(resolution.inline.ad_title, "Inline")
+        self.assertEqual(len(resolution.wrappers), 2)
+        self.assertEqual(transport.fetched, ["https://b.com/vast", "https://c.com/vast"])
+
+    def test_inline_needs_no_fetch(self):
+        transport = StubTransport({})
+        vast = xml_parser.from_xml_string(INLINE_XML.format(ad_id="a"))
+        resolution = _run(WrapperResolver(transport=transport).resolve(vast))
+        self.assertEqual(resolution.vasts, [vast])
+        self.assertEqual(transport.fetched, [])
+
+    def test_max_depth(self):
+        transport = StubTransport({
+            "https://b.com/vast": WRAPPER_XML.format(ad_id="b", uri="https://c.com/vast"),
+            "https://c.com/vast": INLINE_XML.format(ad_id="c"),
+        })
+        resolver = WrapperResolver(transport=transport, max_depth=1)
+        with self.assertRaises(ResolveError):
+            _run(resolver.resolve(make_wrapper("a", "https://b.com/vast")))
+
+    def test_loop(self):
+        transport = StubTransport({
+            "https://b.com/vast": WRAPPER_XML.format(ad_id="b", uri="https://c.com/vast"),
+            "https://c.com/vast": WRAPPER_XML.format(ad_id="c", uri="HTTPS://B.com/vast"),
+        })
+        resolver = WrapperResolver(transport=transport)
+        with self.assertRaises(ResolveError):
+            _run(resolver.resolve(make_wrapper("a", "https://b.com/vast")))
+        self.assertEqual(len(transport.fetched), 2)
+
+    def test_resolve_all(self):
+        transport = StubTransport({
+            "https://b.com/vast": INLINE_XML.format(ad_id="b"),
+        })
+        resolver = WrapperResolver(transport=transport)
+        results = _run(resolver.resolve_all([
+            make_wrapper("a1", "https://b.com/vast"),
+            make_wrapper("a2", "https://missing.com/vast"),
+        ]))
+        self.assertEqual(results[0].inline.ad_title, "Inline")
+        self.assertIsInstance(results[1], FetchError)
+
+
+class TestDeadline(TestCase):
+    def setUp(self):
+        self.documents = {
+            "https://b.com/vast": WRAPPER_XML.format(ad_id="b", uri="https://c.com/vast"),
+            "https://c.com/vast": INLINE_XML.format(ad_id="c"),
+        }
+
+    def test_within_deadline(self):
+        transport = SlowTransport(self.documents, {"https://b.com/vast": 0.01})
+        resolver = WrapperResolver(transport=transport)
+
+        resolution = _run(resolver.resolve_with_deadline(make_wrapper("a", "https://b.com/vast"), 1.0))
+
+        self.assertTrue(resolution.complete)
+        self.assertEqual([h.uri for h in resolution.hops], ["https://b.com/vast", "https://c.com/vast"])
+        self.assertGreaterEqual(resolution.hops[0].fetch_time, 0.01)
+        self.assertLess(resolution.hops[1].timeout, 1.0)
+        self.assertIsNotNone(resolution.hops[1].parse_time)
+
+    def test_deadline_cancels_fetch_and_keeps_partial_chain(self):
+        transport = SlowTransport(self.documents, {"https://c.com/vast": 5})
+        resolver = WrapperResolver(transport=transport)
+
+        resolution = _run(resolver.resolve_with_deadline(make_wrapper("a", "https://b.com/vast"), 0.05))
+
+        self.assertFalse(resolution.complete)
+        self.assertIsInstance(resolution.error, DeadlineExceededError)
+        self.assertEqual([v.ad.id for v in resolution.vasts], ["a", "b"])
+        self.assertEqual(transport.cancelled, ["https://c.com/vast"])
+        self.assertIsNone(resolution.hops[-1].parse_time)
+        self.assertLess(resolution.elapsed, 1)
+
+    def test_max_hop_timeout(self):
+        transport = SlowTransport(self.documents, {"https://b.com/vast": 5})
+        resolver = WrapperResolver(transport=transport)
+
+        resolution = _run(resolver.resolve_with_deadline(
+            make_wrapper("a", "https://b.com/vast"), 10, max_hop_timeout=0.01,
+        ))
+
+        self.assertIsInstance(resolution.error, DeadlineExceededError)
+        self.assertEqual(resolution.hops[0].timeout, 0.01)
+
+    def test_malformed_document_ends_the_chain(self):
+        self.documents["https://c.com/vast"] = self.documents["https://c.com/vast"].replace("00:00:15", "abc")
+        for backend in (xml_parser.XMLTODICT, xml_parser.STREAMING):
+            resolver = WrapperResolver(
+                transport=StubTransport(self.documents),
+                parse=lambda body: xml_parser.from_xml_string(body, backend=backend),
+            )
+
+            resolution = _run(resolver.resolve_with_deadline(make_wrapper("a", "https://b.com/vast"), 1.0))
+
+            self.assertIsInstance(resolution.error, ParseError)
+            self.assertEqual([v.ad.id for v in resolution.vasts], ["a", "b"])
+            self.assertEqual(len(resolution.hops), 2)
+
+
+class TestHttpTransport(TestCase):
+    def test_connections_are_reused(self):
+        body = INLINE_XML.format(ad_id="c").encode("utf-8")
+        handlers = []
+
+        async def serve(reader, writer):
+            handlers.append(asyncio.current_task())
+            while True:
+                try:
+                    await reader.readuntil(b"\r\n\r\n")
+                except asyncio.IncompleteReadError:
+                    break
+                writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: %d\r\n\r\n" % len(body) + body)
+                await writer.drain()
+            writer.close()
+
+        async def scenario():
+            server = await asyncio.start_server(serve, "127.0.0.1", 0)
+            port = server.sockets[0].getsockname()[1]
+            uri = "http://127.0.0.1:%d/vast" % port
+            transport = HttpTransport()
+            async with WrapperResolver(transport=transport) as resolver:
+                for ad_id in ("a1", "a2", "a3"):
+                    resolution = await resolver.resolve(make_wrapper(ad_id, uri))
+                    self.assertEqual(resolution.vasts[-1].ad.id, "c")
+            # closing the transport ends the connections, let the server see it before it closes
+            await asyncio.gather(*handlers)
+            server.close()
+            await server.wait_closed()
+            return transport.connections_opened
+
+        self.assertEqual(_run(scenario()), 1)
+
+    def test_error_status(self):
+        async def serve(reader, writer):
+            await reader.readuntil(b"\r\n\r\n")
+            writer.write(b"HTTP/1.1 404 Not Found\r\nContent-Length: 0\r\n\r\n")
+            await writer.drain()
+            writer.close()
+
+        async def scenario():
+            server = await asyncio.start_server(serve, "127.0.0.1", 0)
+            port = server.sockets[0].getsockname()[1]
+            try:
+                async with HttpTransport() as transport:
+                    await transport.fetch("http://127.0.0.1:%d/vast" % port)
+            finally:
+                server.close()
+                await server.wait_closed()
+
+        with self.assertRaises(FetchError):
+            _run(scenario())
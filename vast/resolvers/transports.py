@@ -0,0 +1,254 @@
+"""
+Transports fetch VAST documents for the wrapper resolver
+
+A transport is any object with a coroutine 'fetch(uri)' returning the document bytes,
+and a coroutine 'close()' releasing whatever it holds.
+Tests, or services with their own HTTP stack, can plug in their own.
+"""
+import asyncio
+import ssl
+import zlib
+from urllib.parse import urljoin, urlsplit, urlunsplit
+
+from vast.errors import FetchError
+
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+_REDIRECT_STATUSES = frozenset((301, 302, 303, 307, 308))
+# Errors of a single request/response exchange, turned into FetchError
+_EXCHANGE_ERRORS = (
+    OSError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, ValueError, zlib.error,
+)
+
+
+def normalize_uri(uri, default_scheme="https"):
+    """
+    Normalize a VAST tag uri so that equal locations compare equal
+
+    :param uri: as found in a VASTAdTagURI, may be protocol relative ('//host/path')
+    :param default_scheme: scheme of protocol relative uris
+    :return: absolute uri, with lower case scheme and host, default port and fragment removed
+    """
+    uri = uri.strip()
+    if uri.startswith("//"):
+        uri = "%s:%s" % (default_scheme, uri)
+
+    parts = urlsplit(uri)
+    scheme = parts.scheme.lower()
+    netloc = parts.netloc.lower()
+    if parts.port is not None and parts.port == _DEFAULT_PORTS.get(scheme):
+        netloc = netloc.rsplit(":", 1)[0]
+
+    return urlunsplit((scheme, netloc, parts.path or "/", parts.query, ""))
+
+
+class Transport(object):
+    """
+    Interface of transports
+    """
+
+    async def fetch(self, uri):
+        """
+        :param uri: normalized absolute uri of a VAST document
+        :return: the document as bytes
+        :raises: FetchError if the document could not be fetched
+        """
+        raise NotImplementedError
+
+    async def close(self):
+        pass
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+
+class _Connection(object):
+    __slots__ = ("reader", "writer")
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+
+    def close(self):
+        self.writer.close()
+
+
+class HttpTransport(Transport):
+    """
+    HTTP/1.1 transport on asyncio streams.
+    Keeps idle connections per host alive and reuses them for later fetches,
+    so resolving many chains against the same ad servers skips most connection setups.
+    """
+
+    def __init__(
+            self, max_idle_per_host=8, max_redirects=5,
+            ssl_context=None, headers=None, max_body_size=8 * 1024 * 1024,
+    ):
+        """
+        :param max_idle_per_host: idle connections kept open per host
+        :param max_redirects: redirects followed before giving up
+        :param ssl_context: for https connections, defaults to the system's default context
+        :param headers: dict of extra request headers, e.g. User-Agent
+        :param max_body_size: bytes, larger responses fail the fetch
+        """
+        self.max_idle_per_host = max_idle_per_host
+        self.max_redirects = max_redirects
+        self.ssl_context = ssl_context
+        self.headers = headers or {}
+        self.max_body_size = max_body_size
+        self.connections_opened = 0
+        self._idle = {}
+
+    async def fetch(self, uri):
+        for _ in range(self.max_redirects + 1):
+            status, headers, body = await self._request(uri)
+            if status in _REDIRECT_STATUSES and "location" in headers:
+                uri = urljoin(uri, headers["location"])
+                continue
+            if status != 200:
+                raise FetchError("fetching '%s' failed with status %s" % (uri, status))
+            return body
+
+        raise FetchError("too many redirects fetching '%s'" % uri)
+
+    async def close(self):
+        idle, self._idle = self._idle, {}
+        for connections in idle.values():
+            for connection in connections:
+                connection.close()
+
+    async def _request(self, uri):
+        parts = urlsplit(uri)
+        if parts.scheme not in _DEFAULT_PORTS:
+            raise FetchError("cannot fetch '%s', only http and https are supported" % uri)
+
+        key = (parts.scheme, parts.hostname, parts.port or _DEFAULT_PORTS[parts.scheme])
+        request = self._build_request(parts)
+
+        try:
+            connection = self._acquire(key)
+            if connection is not None:
+                try:
+                    return await self._exchange(key, connection, request)
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    # the server closed the idle connection meanwhile, retry on a new one
+                    pass
+
+            connection = await self._connect(key)
+            return await self._exchange(key, connection, request)
+        except _EXCHANGE_ERRORS as e:
+            raise FetchError("fetching '%s' failed: %r" % (uri, e))
+
+    def _build_request(self, parts):
+        target = parts.path or "/"
+        if parts.query:
+            target = "%s?%s" % (target, parts.query)
+
+        lines = [
+            "GET %s HTTP/1.1" % target,
+            "Host: %s" % parts.netloc.rsplit("@", 1)[-1],
+            "Accept-Encoding: gzip, deflate",
+            "Connection: keep-alive",
+        ]
+        lines.extend("%s: %s" % item for item in self.headers.items())
+        return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+    def _acquire(self, key):
+        connections = self._idle.get(key)
+        while connections:
+            connection = connections.pop()
+            if not connection.reader.at_eof():
+                return connection
+            connection.close()
+        return None
+
+    def _release(self, key, connection):
+        connections = self._idle.setdefault(key, [])
+        if len(connections) < self.max_idle_per_host:
+            connections.append(connection)
+        else:
+            connection.close()
+
+    async def _connect(self, key):
+        scheme, host, port = key
+        ssl_context = None
+        if scheme == "https":
+            ssl_context = self.ssl_context or ssl.create_default_context()
+        reader, writer = await asyncio.open_connection(host, port, ssl=ssl_context)
+        self.connections_opened += 1
+        return _Connection(reader, writer)
+
+    async def _exchange(self, key, connection, request):
+        try:
+            connection.writer.write(request)
+            await connection.writer.drain()
+            status, headers, body, keep_alive = await self._read_response(connection.reader)
+        except BaseException:
+            connection.close()
+            raise
+
+        if keep_alive:
+            self._release(key, connection)
+        else:
+            connection.close()
+
+        return status, headers, _decode_body(headers, body)
+
+    async def _read_response(self, reader):
+        status_line = await reader.readuntil(b"\r\n")
+        version, status = status_line.split(None, 2)[:2]
+        status = int(status)
+
+        headers = {}
+        while True:
+            line = await reader.readuntil(b"\r\n")
+            if line == b"\r\n":
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        keep_alive = version == b"HTTP/1.1" and headers.get("connection", "").lower() != "close"
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            body = await self._read_chunked(reader)
+        elif "content-length" in headers:
+            length = int(headers["content-length"])
+            self._check_size(length)
+            body = await reader.readexactly(length)
+        else:
+            body = await reader.read(self.max_body_size + 1)
+            self._check_size(len(body))
+            keep_alive = False
+
+        return status, headers, body, keep_alive
+
+    async def _read_chunked(self, reader):
+        chunks = []
+        size = 0
+        while True:
+            line = await reader.readuntil(b"\r\n")
+            chunk_size = int(line.split(b";", 1)[0], 16)
+            if chunk_size == 0:
+                # skip trailers
+                while await reader.readuntil(b"\r\n") != b"\r\n":
+                    pass
+                return b"".join(chunks)
+
+            size += chunk_size
+            self._check_size(size)
+            chunks.append(await reader.readexactly(chunk_size))
+            await reader.readexactly(2)
+
+    def _check_size(self, size):
+        if size > self.max_body_size:
+            raise ValueError("response body larger than %s bytes" % self.max_body_size)
+
+
+def _decode_body(headers, body):
+    encoding = headers.get("content-encoding", "").lower()
+    if encoding == "gzip":
+        return zlib.decompress(body, 16 + zlib.MAX_WBITS)
+    if encoding == "deflate":
+        return zlib.decompress(body)
+    return body
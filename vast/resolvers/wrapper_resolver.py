@@ -0,0 +1,232 @@
+"""
+Resolve wrapper ads by following their VASTAdTagURI until an inline ad is reached
+
+Fetching is done by a pluggable transport on asyncio,
+so many chains can be resolved concurrently on one event loop.
+"""
+import asyncio
+
+import attr
+
+from vast.errors import DeadlineExceededError, ResolveError
+from vast.parsers import xml_parser
+from vast.resolvers.transports import HttpTransport, normalize_uri
+
+# Errors which end a chain, kept in a partial Resolution, those of resolving, and those caused by a fetched document
+_CHAIN_ERRORS = (ResolveError, ) + xml_parser._DOCUMENT_ERRORS
+
+
+@attr.s(frozen=True)
+class Hop(object):
+    """
+    Timing of a single fetch in a wrapper chain, all times in seconds
+
+    started is relative to the start of the resolution.
+    parse_time is None if the hop failed before its document was parsed.
+    When a cache is used, fetch_time is the time waited for the parsed document
+    and parse_time is spent by the resolver after it, since parsing is part of the cached load.
+    cached is True if the document came from the cache.
+    """
+    uri = attr.ib()
+    started = attr.ib()
+    timeout = attr.ib()
+    fetch_time = attr.ib()
+    parse_time = attr.ib(default=None)
+    cached = attr.ib(default=False)
+
+
+@attr.s(frozen=True)
+class Resolution(object):
+    """
+    A resolved, or partially resolved, wrapper chain
+
+    vasts holds the documents from the one resolution started with to the deepest one reached,
+    in the order they were fetched. hops holds the timing of each fetch.
+    error is set if the chain was not resolved to an inline ad.
+    """
+    vasts = attr.ib()
+    hops = attr.ib(default=())
+    error = attr.ib(default=None)
+
+    @property
+    def complete(self):
+        return self.error is None
+
+    @property
+    def elapsed(self):
+        if not self.hops:
+            return 0.0
+        last = self.hops[-1]
+        return last.started + last.fetch_time + (last.parse_time or 0.0)
+
+    @property
+    def inline(self):
+        return self.vasts[-1].ad.inline
+
+    @property
+    def wrappers(self):
+        return [vast.ad.wrapper for vast in self.vasts[:-1]]
+
+
+class WrapperResolver(object):
+    """
+    Follows wrapper chains, using a transport for fetching and the xml parser for parsing
+    """
+
+    def __init__(self, transport=None, max_depth=5, default_scheme="https", parse=None, cache=None):
+        """
+        :param transport: see transports.Transport, defaults to a HttpTransport
+        :param max_depth: maximal number of wrappers followed in a single chain
+        :param default_scheme: of protocol relative VASTAdTagURIs
+        :param parse: function from fetched bytes to a Vast object, defaults to xml_parser.from_xml_string
+        :param cache: optional cache.DocumentCache of parsed documents, may be shared between resolvers
+        """
+        self.transport = transport or HttpTransport()
+        self.max_depth = max_depth
+        self.default_scheme = default_scheme
+        self.parse = parse or xml_parser.from_xml_string
+        self.cache = cache
+
+    async def resolve(self, vast):
+        """
+        :param vast: Vast object, whose first ad is a wrapper or inline ad
+        :return: Resolution of the chain starting at vast
+        :raises: ResolveError if the chain is too deep or loops,
+        FetchError if a document could not be fetched,
+        ParseError or IllegalModelStateError if a fetched document is not valid VAST
+        """
+        resolution = await self._resolve(vast, None, None)
+        if resolution.error is not None:
+            raise resolution.error
+        return resolution
+
+    async def resolve_with_deadline(self, vast, deadline, max_hop_timeout=None):
+        """
+        Resolve a chain within an overall time budget.
+        Each hop may use whatever is left of the budget, up to max_hop_timeout,
+        so time a fast hop did not use is left for the following ones.
+        A fetch still in flight when its hop runs out of time is cancelled.
+
+        Errors are not raised, the returned Resolution holds the deepest chain reached,
+        the timing of every hop, and the error that ended the chain, if any.
+        A DeadlineExceededError if the budget ran out.
+
+        :param vast: Vast object, whose first ad is a wrapper or inline ad
+        :param deadline: seconds for resolving the whole chain
+        :param max_hop_timeout: seconds, caps the time of a single hop
+        :return: Resolution, possibly partial
+        """
+        return await self._resolve(vast, deadline, max_hop_timeout)
+
+    async def resolve_all(self, vasts):
+        """
+        Resolve many chains concurrently
+
+        :param vasts: iterable of Vast objects
+        :return: list with a Resolution, or the error that failed the chain, per given vast
+        """
+        return await asyncio.gather(
+            *(self.resolve(vast) for vast in vasts),
+            return_exceptions=True
+        )
+
+    async def close(self):
+        await self.transport.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def _resolve(self, vast, deadline, max_hop_timeout):
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        vasts = [vast]
+        hops = []
+        seen = set()
+        try:
+            while vast.ad.inline is None:
+                uri = self._next_uri(vast, seen)
+                timeout = _hop_timeout(started, loop.time(), deadline, max_hop_timeout)
+                hop_started = loop.time()
+                fetched = None
+                cached = False
+                try:
+                    if self.cache is None:
+                        body = await self._within(timeout, uri, self.transport.fetch)
+                        fetched = loop.time()
+                        vast = self.parse(body)
+                    else:
+                        vast, cached = await self._within(timeout, uri, self._load_cached)
+                        fetched = loop.time()
+                finally:
+                    if fetched is None:
+                        hop = Hop(uri, hop_started - started, timeout, loop.time() - hop_started)
+                    else:
+                        hop = Hop(
+                            uri, hop_started - started, timeout,
+                            fetched - hop_started, loop.time() - fetched, cached,
+                        )
+                    hops.append(hop)
+                vasts.append(vast)
+
+        except _CHAIN_ERRORS as e:
+            return Resolution(vasts=vasts, hops=hops, error=e)
+
+        return Resolution(vasts=vasts, hops=hops)
+
+    async def _within(self, timeout, uri, fetch):
+        """
+        :return: result of awaiting fetch(uri), cancelled after timeout seconds unless it is None
+        """
+        if timeout is None:
+            return await fetch(uri)
+        if timeout <= 0:
+            raise DeadlineExceededError("no time left to fetch '%s'" % uri)
+
+        try:
+            return await asyncio.wait_for(fetch(uri), timeout)
+        except asyncio.TimeoutError:
+            msg = "fetching '{uri}' was cancelled after {timeout:.3f} seconds"
+            raise DeadlineExceededError(msg.format(uri=uri, timeout=timeout))
+
+    async def _load_cached(self, uri):
+        return await self.cache.get_or_load(uri, self._load)
+
+    async def _load(self, uri):
+        return self.parse(await self.transport.fetch(uri))
+
+    def _next_uri(self, vast, seen):
+        """
+        :param vast: whose first ad is a wrapper
+        :param seen: normalized uris already followed in this chain, updated with the next one
+        :return: normalized uri of the next document in the chain
+        """
+        if len(seen) >= self.max_depth:
+            msg = "wrapper chain is deeper than the maximum of {max_depth}"
+            raise ResolveError(msg.format(max_depth=self.max_depth))
+
+        uri = vast.ad.wrapper.vast_ad_tag_uri
+        if not uri:
+            raise ResolveError("wrapper ad '%s' has no VASTAdTagURI" % vast.ad.id)
+
+        uri = normalize_uri(uri, self.default_scheme)
+        if uri in seen:
+            raise ResolveError("wrapper chain loops back to '%s'" % uri)
+        seen.add(uri)
+
+        return uri
+
+
+def _hop_timeout(started, now, deadline, max_hop_timeout):
+    """
+    :return: seconds the next hop may take, None if unlimited
+    """
+    if deadline is None:
+        return max_hop_timeout
+
+    remaining = started + deadline - now
+    if max_hop_timeout is None:
+        return remaining
+    return min(remaining, max_hop_timeout)
@@ -0,0 +1,272 @@
+"""
+Compact binary encoding of VAST 2.0 models, for caches and for moving models between processes
+
+An encoded document is MAGIC, a format version byte, the marshal version and the major and minor
+Python version which wrote it, one byte each, and the marshalled model tree, compressed by zlib.
+The marshal format is only guaranteed within one Python version,
+so a document written by another version is rejected rather than misread.
+Each model is a tuple of its attribute values followed by the code of its class,
+where enum members are their codes, and nested models are tuples themselves.
+Equal strings are written once: the encoder shares one object per distinct string,
+which marshal writes on first use and refers back to afterwards, its reference table being the string table.
+What is left is mostly distinct URIs, sharing long prefixes, which zlib then shrinks several times.
+Decoding builds models straight from these values, without checking nor converting them again,
+setting the slots of each new instance rather than running its __init__,
+and only visits the enum and model attributes, every other value is passed on as decoded by marshal.
+
+Class and enum codes are positions in _MODELS and in the definition order of each enum,
+new ones must be appended, and FORMAT_VERSION bumped whenever existing codes change.
+"""
+import marshal
+import struct
+import sys
+import zlib
+from enum import Enum
+from operator import attrgetter
+
+import attr
+
+from vast.errors import DecodeError, SerializeError
+from vast.models import vast_v2 as v2_models
+from vast.models.shared import LazySequence
+
+MAGIC = b"VSTB"
+FORMAT_VERSION = 3
+
+# marshal writes references to repeated objects since version 3
+_MARSHAL_VERSION = 4
+# the fastest zlib level, higher ones barely shrink documents more
+_ZLIB_LEVEL = 1
+
+# MAGIC, format version, marshal version, Python major and minor version
+_HEADER = struct.Struct("<%dsBBBB" % len(MAGIC))
+_WRITER = (_MARSHAL_VERSION, sys.version_info[0], sys.version_info[1])
+
+_MODELS = (
+    v2_models.Vast,
+    v2_models.Ad,
+    v2_models.Wrapper,
+    v2_models.Inline,
+    v2_models.Creative,
+    v2_models.Linear,
+    v2_models.MediaFile,
+    v2_models.TrackingEvent,
+    v2_models.VideoClicks,
+    v2_models.AdParameters,
+    v2_models.NonLinear,
+    v2_models.NonLinearAd,
+    v2_models.StaticResource,
+    v2_models.UriWithId,
+    v2_models.Companion,
+    v2_models.CompanionAd,
+)
+
+# Kind of attributes holding a string, a model or a list of models, told apart by their encoded type.
+# The kind of an enum attribute is the _EnumCodes of its enum, other attributes are passed on as they are
+_VALUE = "value"
+
+
+class _EnumCodes(object):
+    """
+    Codes of the members of an enum, their positions in its definition order
+    """
+    __slots__ = ("name", "members", "codes")
+
+    def __init__(self, enum):
+        self.name = enum.__name__
+        self.members = dict(enumerate(enum))
+        # by member name, hashing a member itself runs Enum.__hash__, in Python
+        self.codes = {member.name: code for code, member in self.members.items()}
+
+    def encode(self, member):
+        code = self.codes.get(getattr(member, "name", None))
+        if code is None or self.members[code] is not member:
+            raise SerializeError("'%s' is not a member of %s" % (member, self.name))
+        return code
+
+
+_ENUM_CODES = {}
+
+
+def _enum_codes(enum):
+    codes = _ENUM_CODES.get(enum)
+    if codes is None:
+        codes = _ENUM_CODES[enum] = _EnumCodes(enum)
+    return codes
+
+
+def _kinds(cls):
+    """
+    :return: tuple of (position, kind) of the init attributes of cls which are not passed on as they are
+    """
+    converted = {}
+    for converter in getattr(cls, "CONVERTERS", ()):
+        kind = _enum_codes(converter.type) if issubclass(converter.type, Enum) else None
+        converted.update(dict.fromkeys(converter.attr_names, kind))
+
+    names = [a.name for a in attr.fields(cls) if a.init]
+    kinds = [(i, converted.get(name, _VALUE)) for i, name in enumerate(names)]
+    return tuple((i, kind) for i, kind in kinds if kind is not None)
+
+
+def _slot_setter(cls, name):
+    """
+    :return: function setting the slot, or lazy text attribute, name of an instance of cls
+    """
+    for klass in cls.__mro__:
+        if name in vars(klass):
+            return vars(klass)[name].__set__
+    raise AttributeError("%s has no slot %s" % (cls.__name__, name))
+
+
+class _Schema(object):
+    """
+    How the attributes of a model class are encoded, and how instances are built back from them
+    """
+    __slots__ = ("cls", "code", "names", "kinds", "values", "setters", "defaults")
+
+    def __init__(self, cls, code):
+        self.cls = cls
+        self.code = code
+        self.names = tuple(a.name for a in attr.fields(cls) if a.init)
+        self.kinds = _kinds(cls)
+        get = attrgetter(*self.names)
+        if len(self.names) == 1:
+            self.values = lambda instance: [get(instance)]
+        else:
+            self.values = lambda instance: list(get(instance))
+        self.setters = tuple(_slot_setter(cls, name) for name in self.names)
+        # attributes which are not init arguments are set to their default, as __init__ does
+        self.defaults = tuple(
+            (_slot_setter(cls, a.name), a.default) for a in attr.fields(cls) if not a.init
+        )
+
+    def build(self, args):
+        """
+        :param args: decoded values of the init attributes, in their order
+        :return: instance of cls holding them, made without running __init__, which would set them one by one
+        by looking each attribute up by name
+        """
+        if len(args) != len(self.setters):
+            raise DecodeError("%s has %d attributes, not %d" % (self.cls.__name__, len(self.setters), len(args)))
+        instance = _new(self.cls)
+        for set_value, value in zip(self.setters, args):
+            set_value(instance, value)
+        for set_value, value in self.defaults:
+            set_value(instance, value)
+        return instance
+
+
+_new = object.__new__
+
+
+_SCHEMAS_BY_CODE = {code: _Schema(cls, code) for code, cls in enumerate(_MODELS)}
+_SCHEMAS_BY_CLASS = {schema.cls: schema for schema in _SCHEMAS_BY_CODE.values()}
+
+
+def _shared_strings(values, strings):
+    """
+    Replace the strings of values by the one shared object of each distinct string
+    """
+    for i, value in enumerate(values):
+        if type(value) is str:
+            values[i] = strings.setdefault(value, value)
+
+
+def _encode_value(schema, i, kind, value, strings):
+    """
+    :return: encoding of value, which is neither None nor a string, of the i-th attribute of a schema.cls
+    """
+    if kind is not _VALUE:
+        return kind.encode(value)
+    if attr.has(type(value)):
+        return _encode_model(value, strings)
+    if isinstance(value, (list, tuple, LazySequence)):
+        return [_encode_model(v, strings) for v in value]
+    msg = "Cannot encode '%s=%r' of %s"
+    raise SerializeError(msg % (schema.names[i], value, schema.cls.__name__))
+
+
+def _encode_model(instance, strings):
+    """
+    :param strings: dict of every string encoded so far to itself
+    :return: tuple of the encoded attribute values of instance, and the code of its class
+    """
+    schema = _SCHEMAS_BY_CLASS.get(type(instance))
+    if schema is None:
+        raise SerializeError("Cannot encode '%r'" % (instance, ))
+
+    values = schema.values(instance)
+    _shared_strings(values, strings)
+    for i, kind in schema.kinds:
+        value = values[i]
+        if value is not None and type(value) is not str:
+            values[i] = _encode_value(schema, i, kind, value, strings)
+    values.append(schema.code)
+    return tuple(values)
+
+
+def encode(vast):
+    """
+    :param vast: Vast object, lazy sequences in it are pulled
+    :return: bytes, decoded by decode under the same Python version
+    :raises SerializeError: if vast holds values which are not models of vast_v2
+    """
+    if vast.ads and vast.ad is vast.ads[0]:
+        # the first ad is decoded from ads, as Vast.make does
+        vast = v2_models.Vast(version=vast.version, ad=None, ads=vast.ads)
+
+    tree = _encode_model(vast, {})
+    payload = zlib.compress(marshal.dumps(tree, _MARSHAL_VERSION), _ZLIB_LEVEL)
+    return _HEADER.pack(MAGIC, FORMAT_VERSION, *_WRITER) + payload
+
+
+def _decode_model(encoded):
+    schema = _SCHEMAS_BY_CODE[encoded[-1]]
+    if not schema.kinds:
+        return schema.build(encoded[:-1])
+    args = list(encoded)
+    del args[-1]
+    for i, kind in schema.kinds:
+        value = args[i]
+        if value is None:
+            continue
+        if kind is not _VALUE:
+            args[i] = kind.members[value]
+        elif type(value) is tuple:
+            args[i] = _decode_model(value)
+        elif type(value) is list:
+            args[i] = [_decode_model(v) for v in value]
+    return schema.build(args)
+
+
+def decode(data):
+    """
+    :param data: bytes like object, as returned by encode
+    :return: Vast object equal to the encoded one
+    :raises DecodeError: if data is not a document encoded by this format version under this Python version
+    """
+    data = memoryview(data)
+    if data[:len(MAGIC)] != MAGIC or len(data) < _HEADER.size:
+        raise DecodeError("data is not a binary encoded VAST document")
+    _, format_version, marshal_version, major, minor = _HEADER.unpack_from(data)
+    if format_version != FORMAT_VERSION:
+        raise DecodeError("Cannot decode format version %s" % format_version)
+    if (marshal_version, major, minor) != _WRITER:
+        msg = "Cannot decode a document encoded by Python %d.%d with marshal version %d"
+        raise DecodeError(msg % (major, minor, marshal_version))
+    try:
+        tree = marshal.loads(zlib.decompress(data[_HEADER.size:]))
+    except (zlib.error, EOFError, ValueError, TypeError) as e:
+        raise DecodeError("corrupt binary encoded VAST document: %s" % e)
+
+    try:
+        vast = _decode_model(tree)
+    except (LookupError, TypeError) as e:
+        # unknown class or enum codes, or values not shaped as the models they were encoded from
+        raise DecodeError("corrupt binary encoded VAST document: %r" % e)
+    if type(vast) is not v2_models.Vast:
+        raise DecodeError("corrupt binary encoded VAST document: its root is not a Vast")
+    if vast.ad is None and vast.ads:
+        vast = v2_models.Vast(version=vast.version, ad=vast.ads[0], ads=vast.ads)
+    return vast
@@ -0,0 +1,59 @@
+"""
+Serializer of VAST models to JSON, e.g. for exporting parsed documents as JSON lines
+
+A model is an object of its attribute values, leaving out the ones which are None,
+enum members are their XML value, and durations their number of seconds.
+Vast.ad is left out, being the first of its ads.
+Keys are sorted, so equal models are written as equal JSON.
+"""
+import json
+from enum import Enum
+
+import attr
+
+from vast.models import vast_v2 as v2_models
+from vast.models.shared import LazySequence
+
+# class -> names of its init attributes which are written
+_NAMES = {}
+
+
+def _names(cls):
+    names = _NAMES.get(cls)
+    if names is None:
+        names = tuple(a.name for a in attr.fields(cls) if a.init and not (cls is v2_models.Vast and a.name == "ad"))
+        _NAMES[cls] = names
+    return names
+
+
+def _to_value(value):
+    if isinstance(value, (str, bool, int, float)):
+        return value
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (list, tuple, LazySequence)):
+        return [_to_value(v) for v in value]
+    if attr.has(type(value)):
+        return to_dict(value)
+    raise TypeError("Cannot serialize '%r' to JSON" % (value, ))
+
+
+def to_dict(model):
+    """
+    :param model: Vast object, or any model within one, lazy sequences in it are pulled
+    :return: dict of JSON values
+    """
+    result = {}
+    for name in _names(type(model)):
+        value = getattr(model, name)
+        if value is not None:
+            result[name] = _to_value(value)
+    return result
+
+
+def to_json_string(model):
+    """
+    :param model: Vast object, or any model within one
+    :return: compact JSON, on a single line
+    """
+    return json.dumps(to_dict(model), sort_keys=True, separators=(",", ":"))
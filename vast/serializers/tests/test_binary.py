@@ -0,0 +1,160 @@
+import marshal
+import zlib
+from unittest import TestCase
+
+from vast import resources
+from vast.errors import DecodeError, SerializeError
+from vast.models import vast_v2 as v2_models
+from vast.parsers import xml_parser
+from vast.serializers import binary
+
+
+_RESOURCES = (
+    resources.SIMPLE_WRAPPER_XML,
+    resources.SIMPLE_INLINE_XML,
+    resources.INLINE_MULTI_FILES_XML,
+    resources.INLINE_WITH_TRACKING_EVENTS_XML,
+    resources.INLINE_WITH_CREATIVE_ATTRIBUTES,
+    resources.INLINE_WITH_VIDEO_CLICKS,
+    resources.INLINE_WITH_AD_PARAMETERS,
+    resources.INLINE_WITH_NON_LINEAR_ADS,
+    resources.AD_POD_XML,
+)
+# MAGIC, then the format, marshal and Python versions
+_HEADER_SIZE = len(binary.MAGIC) + 4
+
+
+def _payload(data):
+    return zlib.decompress(data[_HEADER_SIZE:])
+
+
+def _with_tree(data, change):
+    """
+    :return: data with its model tree replaced by change(tree)
+    """
+    tree = change(marshal.loads(_payload(data)))
+    return data[:_HEADER_SIZE] + zlib.compress(marshal.dumps(tree))
+
+
+def _tracked_inline(tracking_uri, events):
+    return v2_models.Vast.make(
+        version="2.0",
+        ad=v2_models.Ad.make_inline(
+            id="1",
+            inline=v2_models.Inline.make(
+                ad_system="MagU",
+                ad_title="title",
+                impression="https://mag.dom.com/imp",
+                creatives=[
+                    v2_models.Creative.make(
+                        linear=v2_models.Linear.make(
+                            duration=15,
+                            media_files=[
+                                v2_models.MediaFile.make(
+                                    asset="https://mag.dom.com/video.mp4",
+                                    delivery="progressive",
+                                    type="video/mp4",
+                                    width=640,
+                                    height=360,
+                                ),
+                            ],
+                            tracking_events=[
+                                v2_models.TrackingEvent.make(
+                                    tracking_event_uri=tracking_uri,
+                                    tracking_event_type=event,
+                                ) for event in events
+                            ],
+                        ),
+                    ),
+                ],
+            ),
+        ),
+    )
+
+
+class TestBinaryEncoding(TestCase):
+    def test_resources_round_trip(self):
+        for path in _RESOURCES:
+            expected = xml_parser.from_xml_file(path)
+            actual = binary.decode(binary.encode(expected))
+            self.assertEqual(actual, expected, path)
+            self.assertIs(actual.ad, actual.ads[0])
+
+    def test_companion_ads_round_trip(self):
+        # the model of this resource does not pass validation, see Creative.SOME_OFS
+        expected = xml_parser.from_xml_file(resources.INLINE_WITH_COMPANION_ADS, validate=False)
+        self.assertEqual(binary.decode(binary.encode(expected)), expected)
+
+    def test_enum_members_decoded(self):
+        vast = binary.decode(binary.encode(xml_parser.from_xml_file(resources.SIMPLE_INLINE_XML)))
+        media_file = vast.ad.inline.creatives[0].linear.media_files[0]
+        self.assertIs(media_file.type, v2_models.MimeType.MP4)
+        self.assertIs(media_file.delivery, v2_models.Delivery.PROGRESSIVE)
+
+    def test_lazy_sequences_encoded(self):
+        with open(resources.AD_POD_XML, "rb") as fp:
+            xml_string = fp.read()
+        expected = xml_parser.from_xml_string(xml_string)
+        lazy = xml_parser.from_xml_string(xml_string, backend=xml_parser.STREAMING, lazy_ads=True)
+        self.assertEqual(binary.decode(binary.encode(lazy)), expected)
+
+    def test_repeated_strings_written_once(self):
+        uri = "https://mag.dom.com/vidtrk?ad=[AD_ID]&cb=[CACHEBUSTING]"
+        vast = _tracked_inline(uri, ["start", "midpoint", "complete"])
+
+        data = binary.encode(vast)
+        self.assertEqual(_payload(data).count(uri.encode("utf-8")), 1)
+        self.assertEqual(binary.decode(data), vast)
+
+    def test_memoryview_decoded(self):
+        vast = xml_parser.from_xml_file(resources.SIMPLE_WRAPPER_XML)
+        self.assertEqual(binary.decode(memoryview(binary.encode(vast))), vast)
+
+    def test_not_encoded(self):
+        with self.assertRaises(DecodeError):
+            binary.decode(b'<VAST version="2.0"></VAST>')
+
+    def test_other_format_version(self):
+        data = bytearray(binary.encode(xml_parser.from_xml_file(resources.SIMPLE_WRAPPER_XML)))
+        data[len(binary.MAGIC)] = binary.FORMAT_VERSION + 1
+        with self.assertRaises(DecodeError):
+            binary.decode(data)
+
+    def test_other_python_version(self):
+        data = bytearray(binary.encode(xml_parser.from_xml_file(resources.SIMPLE_WRAPPER_XML)))
+        # the minor Python version byte, the last of the header
+        data[len(binary.MAGIC) + 3] += 1
+        with self.assertRaises(DecodeError):
+            binary.decode(data)
+
+    def test_truncated(self):
+        data = binary.encode(xml_parser.from_xml_file(resources.SIMPLE_INLINE_XML))
+        with self.assertRaises(DecodeError):
+            binary.decode(data[:len(data) // 2])
+
+    def test_not_compressed(self):
+        data = binary.encode(xml_parser.from_xml_file(resources.SIMPLE_INLINE_XML))
+        with self.assertRaises(DecodeError):
+            binary.decode(data[:_HEADER_SIZE] + _payload(data))
+
+    def test_unknown_class_code(self):
+        data = binary.encode(xml_parser.from_xml_file(resources.SIMPLE_INLINE_XML))
+        with self.assertRaises(DecodeError):
+            binary.decode(_with_tree(data, lambda tree: tree[:-1] + (255, )))
+
+    def test_wrong_class_code(self):
+        data = binary.encode(xml_parser.from_xml_file(resources.SIMPLE_INLINE_XML))
+        with self.assertRaises(DecodeError):
+            binary.decode(_with_tree(data, lambda tree: tree[:-1] + (tree[-1] + 1, )))
+
+    def test_not_a_model_tree(self):
+        data = binary.encode(xml_parser.from_xml_file(resources.SIMPLE_INLINE_XML))
+        for tree in (None, 1, (), ("2.0", )):
+            with self.assertRaises(DecodeError):
+                binary.decode(_with_tree(data, lambda _: tree))
+
+    def test_unknown_value(self):
+        vast = xml_parser.from_xml_file(resources.SIMPLE_WRAPPER_XML)
+        ad = v2_models.Ad(id="1", wrapper=object(), inline=None, sequence=None)
+        with self.assertRaises(SerializeError):
+            binary.encode(v2_models.Vast(version=vast.version, ad=ad, ads=[ad]))
@@ -0,0 +1,34 @@
+import json
+from unittest import TestCase
+
+from vast import resources
+from vast.parsers import xml_parser
+from vast.serializers import json_serializer
+
+
+class TestJsonSerializer(TestCase):
+    def test_ad_pod(self):
+        vast = xml_parser.from_xml_file(resources.AD_POD_XML, backend=xml_parser.STREAMING)
+        as_dict = json.loads(json_serializer.to_json_string(vast))
+
+        self.assertEqual(as_dict, json_serializer.to_dict(vast))
+        self.assertNotIn("ad", as_dict)
+        self.assertEqual([ad["id"] for ad in as_dict["ads"]], ["pod_ad_2", "pod_ad_1", "fallback_ad"])
+        self.assertEqual(as_dict["ads"][0]["sequence"], 2)
+
+    def test_values(self):
+        vast = xml_parser.from_xml_file(resources.INLINE_WITH_TRACKING_EVENTS_XML, backend=xml_parser.STREAMING)
+        linear = json_serializer.to_dict(vast)["ads"][0]["inline"]["creatives"][0]["linear"]
+
+        self.assertIsInstance(linear["duration"], int)
+        media_file = linear["media_files"][0]
+        self.assertEqual((media_file["delivery"], media_file["type"]), ("progressive", "video/mp4"))
+        self.assertNotIn("codec", media_file)
+        self.assertEqual(linear["tracking_events"][0]["tracking_event_type"], "creativeView")
+
+    def test_lazy_models_are_pulled(self):
+        lazy = xml_parser.from_xml_file(
+            resources.AD_POD_XML, backend=xml_parser.STREAMING, lazy_ads=True, lazy_creatives=True,
+        )
+        eager = xml_parser.from_xml_file(resources.AD_POD_XML, backend=xml_parser.STREAMING)
+        self.assertEqual(json_serializer.to_json_string(lazy), json_serializer.to_json_string(eager))
@@ -0,0 +1,233 @@
+"""
+Serializer of VAST 2.0 models to XML
+
+Every model is written as XML fragments, passed one at a time to 'out',
+mirroring the elements and attributes read by parsers.vast_v2.
+"""
+from enum import Enum
+from xml.sax.saxutils import escape
+
+from vast.parsers.shared import unparse_duration
+
+# Characters escaped in attribute values, besides &, < and >
+_ATTRIBUTE_ENTITIES = {'"': "&quot;", "\n": "&#10;", "\r": "&#13;", "\t": "&#9;"}
+
+
+def _to_text(value):
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, Enum):
+        return value.value
+    return str(value)
+
+
+def _attributes(pairs):
+    """
+    :param pairs: iterable of (name, value), values which are None are left out
+    :return: attributes as written within a start tag
+    """
+    return "".join(
+        ' %s="%s"' % (name, escape(_to_text(value), _ATTRIBUTE_ENTITIES))
+        for name, value in pairs
+        if value is not None
+    )
+
+
+def _text_element(out, tag, value, attributes=""):
+    if value is not None:
+        out("<%s%s>%s</%s>" % (tag, attributes, escape(_to_text(value)), tag))
+
+
+def write_vast(vast, out, flush):
+    """
+    :param vast: Vast object
+    :param out: function receiving each XML fragment, in document order
+    :param flush: function called after each ad was written
+    """
+    out('<VAST%s>' % _attributes((("version", vast.version), )))
+    for ad in vast.ads or ():
+        _write_ad(ad, out)
+        flush()
+    out("</VAST>")
+
+
+def _write_ad(ad, out):
+    out("<Ad%s>" % _attributes((("id", ad.id), ("sequence", ad.sequence))))
+    if ad.inline is not None:
+        _write_inline(ad.inline, out)
+    if ad.wrapper is not None:
+        _write_wrapper(ad.wrapper, out)
+    out("</Ad>")
+
+
+def _write_wrapper(wrapper, out):
+    out("<Wrapper>")
+    _text_element(out, "AdSystem", wrapper.ad_system)
+    _text_element(out, "VASTAdTagURI", wrapper.vast_ad_tag_uri)
+    _text_element(out, "AdTitle", wrapper.ad_title)
+    _text_element(out, "Error", wrapper.error)
+    _text_element(out, "Impression", wrapper.impression)
+    _write_creatives(wrapper.creatives, out)
+    out("</Wrapper>")
+
+
+def _write_inline(inline, out):
+    out("<InLine>")
+    _text_element(out, "AdSystem", inline.ad_system)
+    _text_element(out, "AdTitle", inline.ad_title)
+    _text_element(out, "Impression", inline.impression)
+    _write_creatives(inline.creatives, out)
+    out("</InLine>")
+
+
+def _write_creatives(creatives, out):
+    if not creatives:
+        return
+    out("<Creatives>")
+    for creative in creatives:
+        _write_creative(creative, out)
+    out("</Creatives>")
+
+
+def _write_creative(creative, out):
+    out("<Creative%s>" % _attributes((
+        ("id", creative.id),
+        ("sequence", creative.sequence),
+        ("adId", creative.ad_id),
+        ("apiFramework", creative.api_framework),
+    )))
+    if creative.linear is not None:
+        _write_linear(creative.linear, out)
+    if creative.non_linear is not None:
+        _write_non_linear(creative.non_linear, out)
+    if creative.companion is not None:
+        _write_companion(creative.companion, out)
+    out("</Creative>")
+
+
+def _write_linear(linear, out):
+    out("<Linear>")
+    _text_element(out, "Duration", unparse_duration(linear.duration))
+    _write_tracking_events(linear.tracking_events, out)
+    _write_ad_parameters(linear.ad_parameters, out)
+    _write_video_clicks(linear.video_clicks, out)
+    if linear.media_files:
+        out("<MediaFiles>")
+        for media_file in linear.media_files:
+            _write_media_file(media_file, out)
+        out("</MediaFiles>")
+    out("</Linear>")
+
+
+def _write_media_file(media_file, out):
+    _text_element(out, "MediaFile", media_file.asset, _attributes((
+        ("id", media_file.id),
+        ("delivery", media_file.delivery),
+        ("type", media_file.type),
+        ("width", media_file.width),
+        ("height", media_file.height),
+        ("codec", media_file.codec),
+        ("bitrate", media_file.bitrate),
+        ("minBitrate", media_file.min_bitrate),
+        ("maxBitrate", media_file.max_bitrate),
+        ("scalable", media_file.scalable),
+        ("maintainAspectRatio", media_file.maintain_aspect_ratio),
+        ("apiFramework", media_file.api_framework),
+    )))
+
+
+def _write_tracking_events(tracking_events, out):
+    if not tracking_events:
+        return
+    out("<TrackingEvents>")
+    for tracking_event in tracking_events:
+        _text_element(
+            out, "Tracking", tracking_event.tracking_event_uri,
+            _attributes((("event", tracking_event.tracking_event_type), )),
+        )
+    out("</TrackingEvents>")
+
+
+def _write_video_clicks(video_clicks, out):
+    if video_clicks is None:
+        return
+    out("<VideoClicks>")
+    _text_element(out, "ClickThrough", video_clicks.click_through)
+    _text_element(out, "ClickTracking", video_clicks.click_tracking)
+    _text_element(out, "CustomClick", video_clicks.custom_click)
+    out("</VideoClicks>")
+
+
+def _write_ad_parameters(ad_parameters, out):
+    if ad_parameters is not None:
+        _text_element(
+            out, "AdParameters", ad_parameters.data,
+            _attributes((("xmlEncoded", ad_parameters.xml_encoded), )),
+        )
+
+
+def _write_static_resource(static_resource, out):
+    if static_resource is not None:
+        _text_element(
+            out, "StaticResource", static_resource.resource,
+            _attributes((("creativeType", static_resource.mime_type), )),
+        )
+
+
+def _write_non_linear(non_linear, out):
+    out("<NonLinearAds>")
+    _write_tracking_events(non_linear.tracking_events, out)
+    for non_linear_ad in non_linear.non_linear_ads:
+        _write_non_linear_ad(non_linear_ad, out)
+    out("</NonLinearAds>")
+
+
+def _write_non_linear_ad(non_linear_ad, out):
+    out("<NonLinear%s>" % _attributes((
+        ("id", non_linear_ad.id),
+        ("width", non_linear_ad.width),
+        ("height", non_linear_ad.height),
+        ("expandedWidth", non_linear_ad.expanded_width),
+        ("expandedHeight", non_linear_ad.expanded_height),
+        ("scalable", non_linear_ad.scalable),
+        ("maintainAspectRatio", non_linear_ad.maintain_aspect_ratio),
+        ("minSuggestedDuration", unparse_duration(non_linear_ad.min_suggested_duration)),
+        ("apiFramework", non_linear_ad.api_framework),
+    )))
+    _write_static_resource(non_linear_ad.static_resource, out)
+    _text_element(out, "IFrameResource", non_linear_ad.iframe_resource)
+    _text_element(out, "HTMLResource", non_linear_ad.html_resource)
+    click_through = non_linear_ad.non_linear_click_through
+    if click_through is not None:
+        _text_element(
+            out, "NonLinearClickThrough", click_through.resource,
+            _attributes((("id", click_through.id), )),
+        )
+    _write_ad_parameters(non_linear_ad.ad_parameters, out)
+    out("</NonLinear>")
+
+
+def _write_companion(companion, out):
+    out("<CompanionAds>")
+    for companion_ad in companion.companion_ads:
+        _write_companion_ad(companion_ad, out)
+    out("</CompanionAds>")
+
+
+def _write_companion_ad(companion_ad, out):
+    out("<Companion%s>" % _attributes((
+        ("id", companion_ad.id),
+        ("width", companion_ad.width),
+        ("height", companion_ad.height),
+        ("expandedWidth", companion_ad.expanded_width),
+        ("expandedHeight", companion_ad.expanded_height),
+        ("apiFramework", companion_ad.api_framework),
+    )))
+    _write_static_resource(companion_ad.static_resource, out)
+    _text_element(out, "IFrameResource", companion_ad.iframe_resource)
+    _text_element(out, "HTMLResource", companion_ad.html_resource)
+    _write_tracking_events(companion_ad.tracking_events, out)
+    _text_element(out, "CompanionClickThrough", companion_ad.companion_click_through)
+    _text_element(out, "AltText", companion_ad.alt_text)
+    _write_ad_parameters(companion_ad.ad_parameters, out)
+    out("</Companion>")
@@ -0,0 +1,73 @@
+"""
+Entry point for serializing a VAST model into a VAST XML
+
+Models are written straight to the output as XML text, without building an intermediate dict,
+so the output of from_xml_string(to_xml_string(vast)) equals vast.
+"""
+import io
+
+from vast.errors import SerializeError
+from vast.serializers import vast_v2
+
+_SERIALIZERS = {
+    "2.0": vast_v2.write_vast
+}
+
+XML_DECLARATION = '<?xml version="1.0" encoding="%s"?>'
+
+
+def _serializer(vast):
+    write_vast = _SERIALIZERS.get(vast.version)
+    if write_vast is None:
+        raise SerializeError("Cannot serialize VAST version '%s'" % vast.version)
+    return write_vast
+
+
+def to_xml_string(vast):
+    """
+    :param vast: Vast object
+    :return: the VAST XML as str
+    :raises SerializeError: if the version of vast is not supported
+    """
+    write_vast = _serializer(vast)
+    parts = [XML_DECLARATION % "UTF-8"]
+    write_vast(vast, parts.append, lambda: None)
+    return "".join(parts)
+
+
+def write(vast, sink, encoding="utf-8"):
+    """
+    Write the VAST XML to a sink, flushing the text written so far after each ad,
+    so large ad pods are never held in memory as a whole.
+
+    :param vast: Vast object
+    :param sink: text file like object, or binary file like object to receive encoded bytes
+    :param encoding: of the bytes written to a binary sink
+    :raises SerializeError: if the version of vast is not supported
+    """
+    write_vast = _serializer(vast)
+    if isinstance(sink, io.TextIOBase):
+        encode = str
+    else:
+        def encode(text):
+            return text.encode(encoding, "xmlcharrefreplace")
+
+    parts = [XML_DECLARATION % encoding.upper()]
+
+    def flush():
+        sink.write(encode("".join(parts)))
+        del parts[:]
+
+    write_vast(vast, parts.append, flush)
+    flush()
+
+
+def to_xml_file(vast, xml_file, encoding="utf-8"):
+    """
+    :param vast: Vast object
+    :param xml_file: path of the file to write
+    :param encoding: of the file
+    :raises SerializeError: if the version of vast is not supported
+    """
+    with open(xml_file, "wb") as xml_file_like_object:
+        write(vast, xml_file_like_object, encoding=encoding)
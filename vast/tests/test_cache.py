@@ -0,0 +1,95 @@
+from unittest import TestCase
+
+from vast.cache import FIFO, BoundedCache, Interner
+
+
+class FakeClock(object):
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestBoundedCache(TestCase):
+    def test_least_recently_used_is_evicted(self):
+        cache = BoundedCache(2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        self.assertEqual(cache.get("a"), 1)
+
+        cache.put("c", 3)
+
+        self.assertNotIn("b", cache)
+        self.assertEqual((cache.get("a"), cache.get("c")), (1, 3))
+        self.assertEqual(cache.stats.evictions, 1)
+
+    def test_ttl(self):
+        clock = FakeClock()
+        cache = BoundedCache(10, ttl=5, clock=clock)
+        cache.put("a", 1)
+
+        clock.now = 4.9
+        self.assertEqual(cache.get("a"), 1)
+        clock.now = 5
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.stats.expirations, 1)
+        self.assertEqual(len(cache), 0)
+
+    def test_stats(self):
+        cache = BoundedCache(10)
+        cache.put("a", 1)
+        cache.get("a")
+        cache.get("b")
+        self.assertEqual((cache.stats.hits, cache.stats.misses), (1, 1))
+        self.assertEqual(cache.stats.hit_rate, 0.5)
+
+    def test_fifo_evicts_oldest(self):
+        cache = BoundedCache(2, eviction=FIFO)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+
+        cache.put("c", 3)
+
+        self.assertNotIn("a", cache)
+        self.assertIn("b", cache)
+
+    def test_max_bytes(self):
+        cache = BoundedCache(10, max_bytes=100)
+        cache.put("a", 1, size=60)
+        cache.put("b", 2, size=30)
+        cache.put("c", 3, size=30)
+
+        self.assertNotIn("a", cache)
+        self.assertEqual(cache.size, 60)
+
+        cache.put("d", 4, size=101)
+        self.assertNotIn("d", cache)
+        self.assertEqual(len(cache), 2)
+
+    def test_max_entries_must_be_positive(self):
+        with self.assertRaises(ValueError):
+            BoundedCache(0)
+
+
+class TestInterner(TestCase):
+    def test_equal_strings_are_deduplicated(self):
+        interner = Interner()
+        first = interner("".join(["Mag", "U"]))
+        second = interner("".join(["Ma", "gU"]))
+        self.assertIs(second, first)
+        self.assertEqual(interner.stats.hits, 1)
+        self.assertEqual(interner.stats.hit_rate, 0.5)
+
+    def test_bounded(self):
+        interner = Interner(max_entries=2)
+        for value in ("a", "b", "c"):
+            interner(value)
+        self.assertEqual(len(interner.strings), 2)
+        self.assertEqual(interner.stats.evictions, 1)
+
+    def test_long_strings_are_not_kept(self):
+        interner = Interner(max_length=3)
+        interner("abcd")
+        self.assertEqual(len(interner.strings), 0)
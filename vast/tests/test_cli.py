@@ -0,0 +1,150 @@
+import gzip
+import io
+import json
+import os
+import re
+import shutil
+import tempfile
+from unittest import TestCase, mock
+
+from vast import cli, corpus, resources
+from vast.errors import ParseError
+from vast.parsers import xml_parser
+from vast.serializers import json_serializer
+
+
+_INVALID = '<VAST version="2.0"><Ad id="1"><InLine></InLine></Ad></VAST>'
+
+
+class TestCli(TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        with open(resources.AD_POD_XML, "r") as fp:
+            self.ad_pod = fp.read()
+        with open(resources.SIMPLE_WRAPPER_XML, "r") as fp:
+            self.wrapper = fp.read()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def _write(self, name, content):
+        path = os.path.join(self.directory, name)
+        with open(path, "wb") as fp:
+            fp.write(content.encode("utf-8"))
+        return path
+
+    def _run(self, inputs, validate_only=False):
+        out = io.StringIO()
+        report = cli.run(inputs, out, validate_only=validate_only, workers=2, chunksize=1)
+        return [json.loads(line) for line in out.getvalue().splitlines()], report
+
+    def test_parse_concatenated_documents(self):
+        path = self._write("archive.xml", self.ad_pod + "\n" + _INVALID + self.wrapper)
+        lines, report = self._run([path])
+
+        self.assertEqual([line["source"] for line in lines], [
+            "%s@0" % path,
+            "%s@%s" % (path, len(self.ad_pod) + 1),
+            "%s@%s" % (path, len(self.ad_pod) + 1 + len(_INVALID)),
+        ])
+        expected = xml_parser.from_xml_string(self.ad_pod, backend=xml_parser.STREAMING)
+        self.assertEqual(lines[0]["vast"], json_serializer.to_dict(expected))
+        self.assertEqual(lines[1]["error"]["type"], "IllegalModelStateError")
+        self.assertIn("vast", lines[2])
+
+        self.assertEqual(len(report.seconds), 3)
+        self.assertEqual(sum(report.errors.values()), 1)
+
+    def test_document_failures_are_reported(self):
+        malformed = re.sub(r"<Duration>[^<]*</Duration>", "<Duration>abc</Duration>", self.ad_pod, count=1)
+        truncated = self.ad_pod[:200]
+        path = self._write("archive.xml", "\n".join((self.wrapper, malformed, "junk", truncated, self.wrapper, "junk")))
+        offsets = [0]
+        for document in (self.wrapper, malformed, "junk", truncated, self.wrapper):
+            offsets.append(offsets[-1] + len(document) + 1)
+
+        for backend in (xml_parser.STREAMING, xml_parser.XMLTODICT):
+            out = io.StringIO()
+            report = cli.run([path], out, validate_only=True, workers=2, chunksize=1, backend=backend)
+            lines = [json.loads(line) for line in out.getvalue().splitlines()]
+
+            self.assertEqual([line["source"] for line in lines], ["%s@%s" % (path, offsets[i]) for i in (1, 2, 3, 5)])
+            self.assertEqual([line["error"]["type"] for line in lines], ["ParseError"] * 4)
+            self.assertIn("not terminated", lines[2]["error"]["message"])
+            self.assertEqual(report.documents, 6)
+            self.assertEqual(len(report.seconds), 3)
+            self.assertEqual(sum(report.errors.values()), 4)
+
+    def test_validate_json_lines(self):
+        path = self._write("documents.jsonl", "\n".join((
+            json.dumps(self.wrapper),
+            json.dumps({"xml": "<NotVast/>"}),
+            "",
+            json.dumps({"xml": '<VAST version="9.0"></VAST>'}),
+        )))
+        lines, report = self._run([path], validate_only=True)
+
+        self.assertEqual([line["source"] for line in lines], ["%s:2" % path, "%s:4" % path])
+        self.assertEqual(report.errors, {
+            "ParseError: root must have VAST element": 1,
+            "ParseError: Cannot parse vast version N.N": 1,
+        })
+
+    def test_directories_and_globs(self):
+        os.mkdir(os.path.join(self.directory, "nested"))
+        with gzip.open(os.path.join(self.directory, "nested", "wrapper.xml.gz"), "wt") as fp:
+            fp.write(self.wrapper)
+        self._write("pod.xml", self.ad_pod)
+        self._write("notes.txt", "not a document")
+
+        self.assertEqual(list(cli.iter_paths([self.directory])), [
+            os.path.join(self.directory, "pod.xml"),
+            os.path.join(self.directory, "nested", "wrapper.xml.gz"),
+        ])
+        self.assertEqual(
+            list(cli.iter_paths([os.path.join(self.directory, "**", "*.gz")])),
+            [os.path.join(self.directory, "nested", "wrapper.xml.gz")],
+        )
+        lines, _ = self._run([self.directory])
+        self.assertEqual(len(lines), 2)
+
+        with self.assertRaises(ValueError):
+            list(cli.iter_paths([os.path.join(self.directory, "*.missing")]))
+
+    def test_generated_archive_is_read_as_it_is_parsed(self):
+        documents = list(corpus.Corpus(seed=1, invalid_fraction=0.3).documents(200))
+        path = os.path.join(self.directory, "corpus.xml")
+        with open(path, "wb") as out:
+            corpus.write(documents, out)
+        with open(path, "rb") as fp, gzip.open(path + ".gz", "wb") as out:
+            shutil.copyfileobj(fp, out)
+
+        for name in (path, path + ".gz"):
+            with mock.patch.object(cli, "_CHUNK_SIZE", 4096):
+                read = list(cli.iter_documents(name))
+            self.assertEqual(len(read), len(documents), name)
+            for (_, document), (defect, expected) in zip(read, documents):
+                if defect in ("truncated", "wrong_root"):
+                    self.assertIsInstance(document, ParseError)
+                else:
+                    self.assertEqual(document.strip(), expected.encode("utf-8"))
+
+    def test_main_exit_status(self):
+        valid = self._write("valid.xml", self.wrapper)
+        invalid = self._write("invalid.xml", _INVALID)
+        output = os.path.join(self.directory, "out.jsonl")
+        patcher = mock.patch("sys.stderr", new_callable=io.StringIO)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.assertEqual(cli.main(["validate", valid, "--workers", "1", "-o", output]), 0)
+        self.assertEqual(cli.main(["validate", valid, invalid, "--workers", "1", "-o", output]), 1)
+        self.assertEqual(cli.main(["parse", valid, invalid, "--workers", "1", "-o", output]), 0)
+        with open(output) as fp:
+            self.assertEqual(len(fp.readlines()), 2)
+
+    def test_percentile(self):
+        values = list(range(1, 101))
+        self.assertEqual(cli.percentile(values, 0.5), 50)
+        self.assertEqual(cli.percentile(values, 0.99), 99)
+        self.assertEqual(cli.percentile([7], 0.99), 7)
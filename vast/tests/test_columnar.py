@@ -0,0 +1,56 @@
+from unittest import TestCase, skipIf
+
+from vast import resources
+from vast.models.vast_v2 import Delivery, MimeType
+from vast.parsers import xml_parser
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+else:
+    from vast.columnar import MISSING, MediaFileTable
+
+
+@skipIf(numpy is None, "numpy is not installed")
+class TestMediaFileTable(TestCase):
+    def setUp(self):
+        self.multi_files = xml_parser.from_xml_file(resources.INLINE_MULTI_FILES_XML)
+        self.pod = xml_parser.from_xml_file(resources.AD_POD_XML)
+
+    def test_columns(self):
+        table = MediaFileTable.from_vast(self.multi_files)
+        media_files = self.multi_files.ad.inline.creatives[0].linear.media_files
+
+        self.assertEqual(len(table), len(media_files))
+        self.assertEqual(table.width.tolist(), [mf.width for mf in media_files])
+        self.assertEqual(
+            table.bitrate.tolist(),
+            [MISSING if mf.bitrate is None else mf.bitrate for mf in media_files],
+        )
+        self.assertEqual(table.ad_index.tolist(), [0] * len(media_files))
+
+    def test_filter(self):
+        table = MediaFileTable.from_vast(self.multi_files)
+        mask = table.is_mime_type(MimeType.MP4) & table.is_delivery(Delivery.PROGRESSIVE) & (table.width >= 640)
+
+        expected = [
+            mf for mf in self.multi_files.ad.inline.creatives[0].linear.media_files
+            if mf.type == MimeType.MP4 and mf.delivery == Delivery.PROGRESSIVE and mf.width >= 640
+        ]
+        self.assertEqual(table.select(mask), expected)
+
+    def test_best_per_ad_across_documents(self):
+        table = MediaFileTable.from_vasts([self.multi_files, self.pod])
+
+        best = table.best_per_ad(column="width")
+
+        self.assertEqual(sorted(best), sorted(set(table.ad_index.tolist())))
+        for ad_index, row in best.items():
+            widths = table.width[table.ad_index == ad_index]
+            self.assertEqual(table.width[row], widths.max())
+            self.assertEqual(table.ad_index[row], ad_index)
+
+    def test_best_per_ad_without_candidates(self):
+        table = MediaFileTable.from_vast(self.multi_files)
+        self.assertEqual(table.best_per_ad(table.width < 0), {})
@@ -0,0 +1,74 @@
+import io
+import json
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+from vast import cli, corpus
+from vast.parsers import xml_parser
+
+
+class TestCorpus(TestCase):
+    def test_same_seed_same_documents(self):
+        first = list(corpus.Corpus(seed=7, invalid_fraction=0.3).documents(50))
+        second = list(corpus.Corpus(seed=7, invalid_fraction=0.3).documents(50))
+        other = list(corpus.Corpus(seed=8, invalid_fraction=0.3).documents(50))
+
+        self.assertEqual(first, second)
+        self.assertNotEqual(first, other)
+
+    def test_valid_documents_parse(self):
+        for defect, document in corpus.Corpus(seed=1).documents(200):
+            self.assertIsNone(defect)
+            for backend in (xml_parser.STREAMING, xml_parser.XMLTODICT):
+                vast = xml_parser.from_xml_string(document, backend=backend)
+                self.assertTrue(vast.ads)
+
+    def test_defects_fail_to_parse(self):
+        seen = set()
+        for defect, document in corpus.Corpus(seed=2, invalid_fraction=1.0).documents(300):
+            self.assertIn(defect, corpus.DEFECTS)
+            seen.add(defect)
+            with self.assertRaises(xml_parser._DOCUMENT_ERRORS, msg=defect):
+                xml_parser.from_xml_string(document, backend=xml_parser.STREAMING)
+        self.assertEqual(seen, set(corpus.DEFECTS))
+
+    def test_invalid_fraction(self):
+        documents = list(corpus.Corpus(seed=3, invalid_fraction=0.2).documents(1000))
+        invalid = sum(1 for defect, _ in documents if defect is not None)
+        self.assertTrue(150 < invalid < 250, invalid)
+
+    def test_write_lines(self):
+        documents = list(corpus.Corpus(seed=4, invalid_fraction=0.5).documents(10))
+
+        out = io.BytesIO()
+        self.assertEqual(corpus.write(documents, out, batch=3), 10)
+        self.assertEqual(out.getvalue().decode("utf-8").splitlines(), [document for _, document in documents])
+
+        out = io.BytesIO()
+        self.assertEqual(corpus.write(documents, out, fmt="jsonl", batch=3), 10)
+        lines = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual([(line["defect"], line["xml"]) for line in lines], documents)
+
+
+class TestGenerate(TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_generate_then_validate(self):
+        path = os.path.join(self.directory, "corpus.jsonl")
+        self.assertEqual(cli.main([
+            "generate", "--count", "40", "--seed", "5", "--invalid-fraction", "0.25", "--format", "jsonl", "-o", path,
+        ]), 0)
+        with open(path) as fp:
+            invalid = sum(1 for line in fp if json.loads(line)["defect"] is not None)
+
+        out = io.StringIO()
+        report = cli.run([path], out, validate_only=True, workers=1)
+        self.assertEqual(len(report.seconds), 40)
+        self.assertEqual(sum(report.errors.values()), invalid)
+        self.assertEqual(len(out.getvalue().splitlines()), invalid)
@@ -0,0 +1,117 @@
+import threading
+from unittest import TestCase
+
+from vast import instrumentation, resources
+from vast.errors import IllegalModelStateError
+from vast.parsers import xml_parser
+
+
+class TestInstrument(TestCase):
+    def setUp(self):
+        with open(resources.AD_POD_XML, "r") as fp:
+            self.ad_pod = fp.read()
+
+    def test_xmltodict_stages(self):
+        with instrumentation.instrument() as timings:
+            vast = xml_parser.from_xml_string(self.ad_pod, backend=xml_parser.XMLTODICT)
+
+        stages = timings.stages
+        self.assertEqual(stages[instrumentation.XMLTODICT_PARSE].calls, 1)
+        self.assertEqual(stages[instrumentation.WALK].calls, 1)
+        self.assertNotIn(instrumentation.STREAMING_PARSE, stages)
+        self.assertEqual(stages["Ad.make"].calls, len(vast.ads))
+        self.assertEqual(stages["Vast.make"].calls, 1)
+        self.assertEqual(
+            stages[instrumentation.CHECK_AND_CONVERT].calls,
+            sum(timings.calls for stage, timings in stages.items() if stage.endswith(".make")),
+        )
+
+        walk = stages[instrumentation.WALK]
+        makes = sum(timings.seconds for stage, timings in stages.items() if stage in ("Vast.make", "Ad.make"))
+        self.assertGreaterEqual(walk.seconds, makes)
+        self.assertLess(walk.self_seconds, walk.seconds)
+        media_file = stages["MediaFile.make"]
+        self.assertLessEqual(media_file.self_seconds, media_file.seconds)
+        self.assertGreater(media_file.self_seconds, 0)
+
+    def test_streaming_stages(self):
+        with instrumentation.instrument() as timings:
+            xml_parser.from_xml_string(self.ad_pod, backend=xml_parser.STREAMING)
+
+        self.assertEqual(timings.stages[instrumentation.STREAMING_PARSE].calls, 1)
+        self.assertNotIn(instrumentation.XMLTODICT_PARSE, timings.stages)
+        self.assertIn("MediaFile.make", timings.stages)
+        self.assertIn(instrumentation.VALIDATE, timings.stages)
+
+    def test_as_dict(self):
+        with instrumentation.instrument() as timings:
+            xml_parser.from_xml_string(self.ad_pod)
+            xml_parser.from_xml_string(self.ad_pod)
+
+        stage = timings.as_dict()[instrumentation.XMLTODICT_PARSE]
+        self.assertEqual(sorted(stage), ["calls", "seconds", "self_seconds"])
+        self.assertEqual(stage["calls"], 2)
+
+    def test_iter_ads_stages(self):
+        with instrumentation.instrument() as timings:
+            ads = list(xml_parser.iter_ads(self.ad_pod, chunk_size=256))
+
+        stages = timings.stages
+        self.assertGreater(stages[instrumentation.STREAMING_ITER_ADS].calls, 1)
+        self.assertEqual(stages["Ad.make"].calls, len(ads))
+        self.assertNotIn(instrumentation.STREAMING_PARSE, stages)
+
+    def test_push_parser_stages(self):
+        with instrumentation.instrument() as timings:
+            parser = xml_parser.push_parser()
+            for start in range(0, len(self.ad_pod), 256):
+                parser.feed(self.ad_pod[start:start + 256])
+            vast = parser.close()
+
+        stages = timings.stages
+        self.assertEqual(stages[instrumentation.STREAMING_PUSH].calls, len(range(0, len(self.ad_pod), 256)) + 1)
+        self.assertEqual(stages["Ad.make"].calls, len(vast.ads))
+        self.assertEqual(stages["Vast.make"].calls, 1)
+
+    def test_extract_stages(self):
+        with instrumentation.instrument() as timings:
+            fields = xml_parser.extract(self.ad_pod, ["media_files"])
+
+        stages = timings.stages
+        self.assertEqual(stages[instrumentation.STREAMING_EXTRACT].calls, 1)
+        self.assertEqual(stages["MediaFile.make"].calls, len(fields["media_files"]))
+        self.assertNotIn("Ad.make", stages)
+
+    def test_records_only_within_the_block(self):
+        with self.assertRaises(IllegalModelStateError):
+            with instrumentation.instrument() as timings:
+                xml_parser.from_xml_string('<VAST version="2.0"><Ad id="1"><InLine></InLine></Ad></VAST>')
+        recorded = timings.as_dict()
+
+        xml_parser.from_xml_string(self.ad_pod)
+        self.assertEqual(timings.as_dict(), recorded)
+        self.assertEqual(instrumentation.stage(instrumentation.WALK), instrumentation._NOT_TIMED)
+
+    def test_records_only_this_thread(self):
+        with instrumentation.instrument() as timings:
+            thread = threading.Thread(target=xml_parser.from_xml_string, args=(self.ad_pod, ))
+            thread.start()
+            thread.join()
+        self.assertEqual(timings.stages, {})
+
+    def test_callback(self):
+        called = []
+        with instrumentation.instrument(callback=called.append) as timings:
+            xml_parser.from_xml_string(self.ad_pod)
+            self.assertEqual(called, [])
+        self.assertEqual(called, [timings])
+
+    def test_nested(self):
+        with instrumentation.instrument() as outer:
+            xml_parser.from_xml_string(self.ad_pod)
+            with instrumentation.instrument() as inner:
+                xml_parser.from_xml_string(self.ad_pod)
+
+        self.assertEqual(outer.stages[instrumentation.WALK].calls, 2)
+        self.assertEqual(inner.stages[instrumentation.WALK].calls, 1)
+        self.assertEqual(outer.stages["Vast.make"].calls, 2)
@@ -6,6 +6,7 @@ A validator function always takes in an instance and returns:
  An str error message if one found
 """
 
+from vast import instrumentation
 from vast.errors import IllegalModelStateError
 
 
@@ -15,6 +16,13 @@ def validate(instance, validators=None):
     :param validators: iterable of validator functions
     :return: None if no errors, raises a validation errors if there are
     """
+    if instrumentation.open_blocks:
+        with instrumentation.stage(instrumentation.VALIDATE):
+            return _validate(instance, validators)
+    return _validate(instance, validators)
+
+
+def _validate(instance, validators):
     validators = validators or getattr(instance, "VALIDATORS", [])
 
     errors = (v(instance) for v in validators)